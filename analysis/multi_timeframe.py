@@ -1,12 +1,14 @@
 """Multi-timeframe analysis for trade confirmation."""
 
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from data.fetcher import NSEDataFetcher
+from indicators.columns import apply_indicators
 from indicators.trend import TrendIndicators
 from indicators.momentum import MomentumIndicators
+from indicators._kernels import DTYPE
 
 
 class MultiTimeframeAnalyzer:
@@ -22,13 +24,16 @@ class MultiTimeframeAnalyzer:
     
     def analyze_timeframes(self, symbol: str, 
                           higher_tf: str = "15m",
-                          lower_tf: str = "5m") -> Dict[str, Any]:
+                          lower_tf: str = "5m",
+                          ltf_data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Analyze multiple timeframes for alignment.
         
         Args:
             symbol: Stock symbol
             higher_tf: Higher timeframe (15m, 1h, 1d)
             lower_tf: Lower timeframe (1m, 5m)
+            ltf_data: Lower-timeframe bars the caller already fetched
+                (fetched here when None)
             
         Returns:
             Dictionary with multi-timeframe analysis
@@ -37,9 +42,10 @@ class MultiTimeframeAnalyzer:
         htf_data = self.data_fetcher.fetch_historical(
             symbol, period="5d", interval=higher_tf
         )
-        ltf_data = self.data_fetcher.fetch_historical(
-            symbol, period="1d", interval=lower_tf
-        )
+        if ltf_data is None:
+            ltf_data = self.data_fetcher.fetch_historical(
+                symbol, period="1d", interval=lower_tf
+            )
         
         if htf_data is None or ltf_data is None:
             return {
@@ -50,14 +56,18 @@ class MultiTimeframeAnalyzer:
             }
         
         # Calculate indicators for higher timeframe
-        htf_data = TrendIndicators.calculate_ema(htf_data, [50, 200])
-        htf_data = TrendIndicators.calculate_vwap(htf_data)
+        htf_columns = TrendIndicators.calculate_ema(htf_data, [50, 200])
+        htf_columns.update(TrendIndicators.calculate_vwap(htf_data))
+        htf_data = apply_indicators(htf_data, htf_columns)
         htf_trend = TrendIndicators.analyze_trend(htf_data)
         
         # Calculate indicators for lower timeframe
-        ltf_data = TrendIndicators.calculate_ema(ltf_data, [9, 21])
-        ltf_data = MomentumIndicators.calculate_rsi(ltf_data)
-        ltf_data = MomentumIndicators.calculate_macd(ltf_data)
+        ltf_columns = TrendIndicators.calculate_ema(ltf_data, [9, 21])
+        ltf_close = ltf_data['close'].to_numpy(dtype=DTYPE)
+        ltf_columns['rsi'] = MomentumIndicators.calculate_rsi(ltf_close)
+        ltf_columns['macd_line'], ltf_columns['macd_signal'], ltf_columns['macd_histogram'] = \
+            MomentumIndicators.calculate_macd(ltf_close)
+        ltf_data = apply_indicators(ltf_data, ltf_columns)
         ltf_momentum = MomentumIndicators.analyze_momentum(ltf_data)
         
         # Check alignment
@@ -6,8 +6,10 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 
 from core.enums import SignalType, MarketRegime
+from indicators.columns import apply_indicators
 from indicators.trend import TrendIndicators
 from indicators.momentum import MomentumIndicators
+from indicators._kernels import DTYPE
 from indicators.volatility import VolatilityIndicators
 from indicators.structure import StructureAnalysis
 from analysis.regime_detector import RegimeDetector
@@ -46,17 +48,26 @@ class SignalGenerator:
             DataFrame with all indicators calculated
         """
         # Trend indicators
-        df = TrendIndicators.calculate_ema(df)
-        df = TrendIndicators.calculate_vwap(df)
+        columns = TrendIndicators.calculate_ema(df)
+        columns.update(TrendIndicators.calculate_vwap(df))
         
         # Momentum indicators
-        df = MomentumIndicators.calculate_rsi(df)
-        df = MomentumIndicators.calculate_macd(df)
-        df = MomentumIndicators.calculate_stochastic(df)
+        close = df['close'].to_numpy(dtype=DTYPE)
+        columns['rsi'] = MomentumIndicators.calculate_rsi(close)
+        columns['macd_line'], columns['macd_signal'], columns['macd_histogram'] = \
+            MomentumIndicators.calculate_macd(close)
+        columns['stoch_k'], columns['stoch_d'] = MomentumIndicators.calculate_stochastic(
+            df['high'].to_numpy(dtype=DTYPE),
+            df['low'].to_numpy(dtype=DTYPE),
+            close
+        )
         
         # Volatility indicators
-        df = VolatilityIndicators.calculate_atr(df)
-        df = VolatilityIndicators.calculate_bollinger_bands(df)
+        columns.update(VolatilityIndicators.calculate_atr(df))
+        columns.update(VolatilityIndicators.calculate_bollinger_bands(df))
+        
+        # All new columns land on the frame in one concat
+        df = apply_indicators(df, columns)
         
         # Regime detection (adds ADX)
         df = self.regime_detector.calculate_adx(df)
@@ -1,10 +1,19 @@
 """Core package exports."""
 from core.enums import SignalType, MarketRegime, TimeFrame, PositionType, TradeStatus
 from core.logger import get_logger, TradingLogger
-from core.database import TradingDatabase
 
 # Models
 try:
     from core.models import Tick, Candle, Signal, Position, MarketSnapshot
 except ImportError:
     pass  # Models may not exist in older setups
+
+
+def __getattr__(name):
+    # TradingDatabase pulls in pandas; load it on first access (PEP 562) so
+    # `import core.logger` stays cheap before the GUI splash is up
+    if name == 'TradingDatabase':
+        from core.database import TradingDatabase
+        globals()[name] = TradingDatabase
+        return TradingDatabase
+    raise AttributeError(f"module 'core' has no attribute {name!r}")
@@ -1,6 +1,11 @@
 """Time-series database handler for OHLCV data and trading records."""
 
+import atexit
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
@@ -10,6 +15,31 @@ from contextlib import contextmanager
 from core.enums import SignalType, TradeStatus
 
 
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades 
+    (signal_id, symbol, entry_timestamp, position_type, quantity,
+     entry_price, stop_loss, target, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# P&L derived from the stored entry in the same statement (no SELECT round-trip)
+_UPDATE_TRADE_EXIT_SQL = """
+    UPDATE trades
+    SET exit_timestamp = ?,
+        exit_price = ?,
+        status = ?,
+        pnl = (? - entry_price) * quantity,
+        pnl_percent = (? - entry_price) / entry_price * 100
+    WHERE id = ?
+"""
+
+# Max statements committed in one background write transaction
+WRITE_BATCH = 50
+
+# Longest flush() waits for the writer before giving up (seconds)
+FLUSH_TIMEOUT = 10.0
+
+
 class TradingDatabase:
     """SQLite database handler optimized for time-series trading data."""
     
@@ -22,6 +52,12 @@ class TradingDatabase:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True, parents=True)
         self._initialize_tables()
+        
+        # Background writer: trade inserts/exits are queued and committed in
+        # batches, one transaction (one fsync) per batch
+        self._write_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
     
     @contextmanager
     def _get_connection(self):
@@ -263,20 +299,32 @@ class TradingDatabase:
             Trade ID
         """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO trades 
-                (signal_id, symbol, entry_timestamp, position_type, quantity,
-                 entry_price, stop_loss, target, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal_id, symbol, datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                position_type, quantity, entry_price, stop_loss, target,
-                TradeStatus.OPEN.value
-            ))
-            
-            return cursor.lastrowid
+            return conn.execute(_INSERT_TRADE_SQL, self._trade_params(
+                signal_id, symbol, position_type, quantity, entry_price, stop_loss, target
+            )).lastrowid
+    
+    def insert_trade_async(self, signal_id: Optional[int], symbol: str,
+                           position_type: str, quantity: int, entry_price: float,
+                           stop_loss: float, target: Optional[float] = None) -> Future:
+        """Queue a trade insert on the background writer.
+        
+        Args are the same as insert_trade.
+        
+        Returns:
+            Future resolving to the trade ID once the batch commits
+        """
+        return self._submit_write(_INSERT_TRADE_SQL, self._trade_params(
+            signal_id, symbol, position_type, quantity, entry_price, stop_loss, target
+        ))
+    
+    @staticmethod
+    def _trade_params(signal_id, symbol, position_type, quantity, entry_price,
+                      stop_loss, target) -> tuple:
+        return (
+            signal_id, symbol, datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            position_type, quantity, entry_price, stop_loss, target,
+            TradeStatus.OPEN.value
+        )
     
     def update_trade_exit(self, trade_id: int, exit_price: float, 
                          status: TradeStatus):
@@ -288,31 +336,105 @@ class TradingDatabase:
             status: New trade status
         """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get trade details
-            cursor.execute("SELECT entry_price, quantity FROM trades WHERE id = ?", 
-                         (trade_id,))
-            row = cursor.fetchone()
-            entry_price = row['entry_price']
-            quantity = row['quantity']
+            conn.execute(_UPDATE_TRADE_EXIT_SQL, self._exit_params(trade_id, exit_price, status))
+    
+    def update_trade_exit_async(self, trade_id: int, exit_price: float,
+                                status: TradeStatus) -> Future:
+        """Queue a trade exit update on the background writer (fire-and-forget).
+        
+        Returns:
+            Future that resolves once the batch commits
+        """
+        return self._submit_write(_UPDATE_TRADE_EXIT_SQL,
+                                  self._exit_params(trade_id, exit_price, status))
+    
+    @staticmethod
+    def _exit_params(trade_id: int, exit_price: float, status: TradeStatus) -> tuple:
+        return (
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            exit_price, status.value, exit_price, exit_price, trade_id
+        )
+    
+    def _submit_write(self, sql: str, params: tuple) -> Future:
+        """Hand a statement to the writer thread (started on first use)."""
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._writer_loop,
+                                                    name="db-writer", daemon=True)
+                    self._writer.start()
+                    # The writer is a daemon: drain the queue before the
+                    # interpreter kills it, or queued exits are lost and
+                    # those trades load back as OPEN next start
+                    atexit.register(self.flush)
+        
+        future = Future()
+        self._write_queue.put((sql, params, future))
+        return future
+    
+    def _writer_loop(self):
+        """Commit queued statements in batches on a dedicated connection."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        while True:
+            # Block for one statement, then take whatever queued up meanwhile
+            # (no artificial wait, so a lone insert isn't delayed)
+            taken = [self._write_queue.get()]
+            while len(taken) < WRITE_BATCH:
+                try:
+                    taken.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-            # Calculate P&L
-            pnl = (exit_price - entry_price) * quantity
-            pnl_percent = ((exit_price - entry_price) / entry_price) * 100
+            # Writes whose caller gave up (cancelled future) are skipped;
+            # the rest can no longer be cancelled
+            batch = [item for item in taken if item[2].set_running_or_notify_cancel()]
+            try:
+                if not batch:
+                    continue
+                conn.execute("BEGIN IMMEDIATE")
+                row_ids = [conn.execute(sql, params).lastrowid for sql, params, _ in batch]
+                conn.execute("COMMIT")
+            except Exception:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                # Replay one autocommit statement at a time so only the
+                # offending write fails, not everything batched with it
+                for sql, params, future in batch:
+                    try:
+                        future.set_result(conn.execute(sql, params).lastrowid)
+                    except Exception as e:
+                        future.set_exception(e)
+            else:
+                for (_, _, future), row_id in zip(batch, row_ids):
+                    future.set_result(row_id)
+            finally:
+                for _ in taken:
+                    self._write_queue.task_done()
+    
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """Block until every queued write has been committed.
+        
+        Args:
+            timeout: Max seconds to wait
             
-            cursor.execute("""
-                UPDATE trades
-                SET exit_timestamp = ?,
-                    exit_price = ?,
-                    status = ?,
-                    pnl = ?,
-                    pnl_percent = ?
-                WHERE id = ?
-            """, (
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                exit_price, status.value, pnl, pnl_percent, trade_id
-            ))
+        Returns:
+            True if the queue drained, False on timeout or a dead writer
+        """
+        if self._writer is None:
+            return True
+        
+        # Queue.join() has no timeout and would hang at exit if the
+        # writer thread died with statements still queued
+        deadline = time.monotonic() + timeout
+        with self._write_queue.all_tasks_done:
+            while self._write_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._writer.is_alive():
+                    return False
+                self._write_queue.all_tasks_done.wait(min(remaining, 0.5))
+        return True
     
     def get_open_trades(self, symbol: Optional[str] = None) -> pd.DataFrame:
         """Get all open trades.
@@ -323,18 +445,35 @@ class TradingDatabase:
         Returns:
             DataFrame with open trades
         """
+        query, params = self._open_trades_query(symbol)
         with self._get_connection() as conn:
-            query = "SELECT * FROM trades WHERE status = 'OPEN'"
-            params = []
-            
-            if symbol:
-                query += " AND symbol = ?"
-                params.append(symbol)
-            
-            query += " ORDER BY entry_timestamp DESC"
-            
             return pd.read_sql_query(query, conn, params=params if params else None)
     
+    def get_open_trades_raw(self, symbol: Optional[str] = None) -> List[sqlite3.Row]:
+        """Get all open trades as raw rows (no DataFrame).
+        
+        Args:
+            symbol: Filter by symbol (optional)
+            
+        Returns:
+            List of sqlite3.Row, accessible by column name
+        """
+        query, params = self._open_trades_query(symbol)
+        with self._get_connection() as conn:
+            return conn.execute(query, params).fetchall()
+    
+    @staticmethod
+    def _open_trades_query(symbol: Optional[str]) -> Tuple[str, list]:
+        query = "SELECT * FROM trades WHERE status = 'OPEN'"
+        params = []
+        
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        
+        query += " ORDER BY entry_timestamp DESC"
+        return query, params
+    
     def insert_portfolio_snapshot(self, total_capital: float, invested: float,
                                  available: float, unrealized_pnl: float,
                                  realized_pnl: float, total_pnl: float,
@@ -1,6 +1,6 @@
 """Core enums and constants for the trading engine."""
 
-from enum import Enum
+from enum import Enum, IntFlag
 
 
 class SignalType(Enum):
@@ -10,6 +10,30 @@ class SignalType(Enum):
     HOLD = "HOLD"
 
 
+class ScanSignal(IntFlag):
+    """Market-scan signal as bit flags (side | strength)."""
+    NEUTRAL = 0
+    BUY = 1
+    SELL = 2
+    STRONG = 4
+    WEAK = 8
+    
+    @property
+    def display_name(self) -> str:
+        """Human-readable label, e.g. 'STRONG BUY'."""
+        return _SCAN_SIGNAL_NAMES.get(int(self), "NEUTRAL")
+
+
+_SCAN_SIGNAL_NAMES = {
+    ScanSignal.BUY | ScanSignal.STRONG: "STRONG BUY",
+    ScanSignal.BUY: "BUY",
+    ScanSignal.BUY | ScanSignal.WEAK: "WEAK BUY",
+    ScanSignal.SELL | ScanSignal.STRONG: "STRONG SELL",
+    ScanSignal.SELL: "SELL",
+    ScanSignal.SELL | ScanSignal.WEAK: "WEAK SELL",
+}
+
+
 class MarketRegime(Enum):
     """Market regime classifications."""
     TREND = "TREND"
@@ -4,6 +4,7 @@ Decoupled from PyQt for Fly.io deployment.
 """
 
 import asyncio
+import concurrent.futures
 import aiohttp
 from datetime import datetime
 from typing import List, Optional, Callable
@@ -12,6 +13,7 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 
+from data.http_session import get_yf_session
 from data.nse_symbol_loader import get_nse_symbol_loader
 
 @dataclass
@@ -39,34 +41,62 @@ class AsyncScanner:
         'Accept': 'application/json',
         'Referer': 'https://www.nseindia.com/'
     }
+    SCAN_TIMEOUT = aiohttp.ClientTimeout(total=10)
+    DEFAULT_CONCURRENCY = 16
+    REFRESH_TIMEOUT = aiohttp.ClientTimeout(total=5)
     
     def __init__(self):
         self._symbol_loader = get_nse_symbol_loader()
+        # Kept open across scans/refreshes so NSE keep-alive connections are
+        # reused; only valid on the event loop that created it (the caller
+        # is expected to drive every call from one persistent loop)
         self._session: Optional[aiohttp.ClientSession] = None
         self._cookies = None
         # Optimization: Thread pool for blocking yfinance calls
         self._executor = None 
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled NSE session, created on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300,
+                                             ssl=False)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.HEADERS,
+                                                  timeout=self.SCAN_TIMEOUT)
+        return self._session
+    
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=20)
+        return self._executor
+    
+    async def close(self):
+        """Close the pooled session and worker threads."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        
+    async def scan_market(self, progress_callback: Optional[Callable[[int, int], None]] = None,
+                          concurrency: int = DEFAULT_CONCURRENCY) -> List[ScanResult]:
+        """Run full market scan.
         
-    async def scan_market(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> List[ScanResult]:
-        """Run full market scan."""
+        Args:
+            progress_callback: Called with (completed, total) about every 1% of symbols
+            concurrency: Max NSE requests in flight; higher mostly buys 429s
+        """
         symbols = self._symbol_loader.get_all_symbols()
         total = len(symbols)
         results = []
         
-        # Optimization: Higher concurrency (Aggressive)
-        semaphore = asyncio.Semaphore(100) 
+        semaphore = asyncio.Semaphore(concurrency)
         
-        # Optimization: Initialize Executor in run
-        import concurrent.futures
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=20)
-        
-        timeout = aiohttp.ClientTimeout(total=10)
-        connector = aiohttp.TCPConnector(limit=0, limit_per_host=20, ssl=False) # No global limit
-        self._session = aiohttp.ClientSession(connector=connector, headers=self.HEADERS, timeout=timeout)
+        self._get_executor()
+        session = self._get_session()
         
         # Get cookies
         try:
-            async with self._session.get('https://www.nseindia.com', timeout=5) as resp:
+            async with session.get('https://www.nseindia.com', timeout=5) as resp:
                 self._cookies = resp.cookies
         except:
             pass
@@ -75,67 +105,55 @@ class AsyncScanner:
             async with semaphore:
                 return await self._analyze_symbol(symbol)
         
-        # Generator for progress tracking
-        pending = [fetch(s) for s in symbols]
+        # Results arrive in completion order, so progress moves per symbol
+        # (reported every ~1%) instead of per 100-symbol batch
+        tasks = [asyncio.ensure_future(fetch(s)) for s in symbols]
+        step = max(total // 100, 1)
         completed = 0
         
-        # Process in larger batches
-        batch_size = 100
-        for i in range(0, total, batch_size):
-            batch = pending[i:i + batch_size]
-            batch_results = await asyncio.gather(*batch, return_exceptions=True)
-            
-            for res in batch_results:
-                if isinstance(res, ScanResult):
-                    results.append(res)
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                res = await next_done
+            except Exception:
+                res = None
+            if res is not None and res.ltp > 0:
+                results.append(res)
             
-            completed += len(batch)
-            if progress_callback:
+            completed += 1
+            if progress_callback and (completed % step == 0 or completed == total):
                 progress_callback(completed, total)
-                
-            # Reduced sleep
-            await asyncio.sleep(0.01)
-            
-        await self._session.close()
-        # Shutdown executor
-        self._executor.shutdown(wait=False)
         
         # Sort by Signal importance
         results.sort(key=lambda x: (x.signal != "NEUTRAL", abs(x.change_pct)), reverse=True)
-        return [r for r in results if r.ltp > 0] # Return only valid
+        return results
     
-    async def refresh_batch(self, symbols: List[str]) -> List[ScanResult]:
+    async def refresh_batch(self, symbols: List[str],
+                            concurrency: int = DEFAULT_CONCURRENCY) -> List[ScanResult]:
         """Refresh specific symbols (for Realtime View)."""
-        results = []
+        self._get_executor()
+        self._get_session()
         
-        # Initialize resources
-        timeout = aiohttp.ClientTimeout(total=5)
-        connector = aiohttp.TCPConnector(limit=200, ssl=False) # Optimized for speed
-        self._session = aiohttp.ClientSession(connector=connector, headers=self.HEADERS, timeout=timeout)
+        semaphore = asyncio.Semaphore(concurrency)
         
-        # Initialize Executor if needed (though _deep_analysis checks it, better to have it)
-        import concurrent.futures
-        if self._executor is None:
-            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
-
-        try:
-            tasks = [self._analyze_symbol(sym) for sym in symbols]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Filter valid
-            valid = [r for r in results if isinstance(r, ScanResult)]
-            return valid
-        finally:
-            await self._session.close() # Ensure cleanup
+        async def fetch(symbol):
+            async with semaphore:
+                return await self._analyze_symbol(symbol, self.REFRESH_TIMEOUT)
+        
+        tasks = [fetch(sym) for sym in symbols]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Filter valid
+        return [r for r in results if isinstance(r, ScanResult)]
     
-    async def _analyze_symbol(self, symbol: str) -> ScanResult:
+    async def _analyze_symbol(self, symbol: str,
+                              timeout: aiohttp.ClientTimeout = SCAN_TIMEOUT) -> ScanResult:
         """Fetch and analyze single symbol."""
         result = ScanResult(symbol=symbol)
         clean_symbol = symbol.replace('.NS', '')
         url = self.NSE_QUOTE_URL.format(clean_symbol)
         
         try:
-            async with self._session.get(url, cookies=self._cookies) as resp:
+            async with self._session.get(url, cookies=self._cookies, timeout=timeout) as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     info = data.get('priceInfo', {})
@@ -190,7 +208,7 @@ class AsyncScanner:
         
         def blocking_logic():
             try:
-                ticker = yf.Ticker(result.symbol)
+                ticker = yf.Ticker(result.symbol, session=get_yf_session())
                 # Fetch more history for stability
                 hist = ticker.history(period="6mo", interval="1d")
                 
@@ -0,0 +1,75 @@
+"""Small thread-safe LRU cache with per-entry TTL."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCacheTTL:
+    """
+    LRU cache whose entries also expire after `ttl` seconds.
+
+    Keys are meant to include whatever makes a result stale (e.g. the last
+    bar timestamp), so the TTL is only a safety net.
+    """
+
+    def __init__(self, capacity: int = 4096, ttl: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            capacity: Max entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expiry)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None on a miss/expired entry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or time.monotonic() >= entry[1]:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Insert/refresh an entry, evicting the LRU one when full."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which predicate(key, value) is true.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [k for k, (v, _) in self._data.items() if predicate(k, v)]
+            for k in stale:
+                del self._data[k]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._data)
@@ -1,4 +1,4 @@
 """Data package exports."""
 from data.fetcher import NSEDataFetcher
 from data.nse_symbols import get_symbol_manager, NSESymbolManager
-from data.snapshot_store import get_snapshot_store, SnapshotStore
+from data.snapshot_store import get_snapshot_store, SnapshotStore, SoASnapshotStore
@@ -7,6 +7,7 @@ from typing import Optional, List
 import time
 
 from core.logger import get_logger
+from data.http_session import get_yf_session
 
 
 class NSEDataFetcher:
@@ -46,13 +47,14 @@ class NSEDataFetcher:
             
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
+            ('timestamp' is always datetime64, so indicators never re-parse it)
         """
         try:
             symbol_with_suffix = self._add_nse_suffix(symbol)
             self.logger.info(f"Fetching historical data for {symbol_with_suffix} "
                            f"(period={period}, interval={interval})")
             
-            ticker = yf.Ticker(symbol_with_suffix)
+            ticker = yf.Ticker(symbol_with_suffix, session=get_yf_session())
             df = ticker.history(period=period, interval=interval)
             
             if df.empty:
@@ -72,6 +74,7 @@ class NSEDataFetcher:
             # Select required columns
             required_cols = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
             df = df[required_cols]
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
             
             # Clean data
             df = df.dropna()
@@ -152,7 +155,7 @@ class NSEDataFetcher:
 
             # 2. Fallback to yfinance
             symbol_with_suffix = self._add_nse_suffix(symbol)
-            ticker = yf.Ticker(symbol_with_suffix)
+            ticker = yf.Ticker(symbol_with_suffix, session=get_yf_session())
             
             # Try to get current price from info
             info = ticker.info
@@ -181,7 +184,7 @@ class NSEDataFetcher:
         """
         try:
             symbol_with_suffix = self._add_nse_suffix(symbol)
-            ticker = yf.Ticker(symbol_with_suffix)
+            ticker = yf.Ticker(symbol_with_suffix, session=get_yf_session())
             info = ticker.info
             
             # Check if we got valid info
@@ -0,0 +1,44 @@
+"""Process-wide HTTP session shared by every yfinance call."""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Recent yfinance releases only accept curl_cffi sessions (browser TLS
+# fingerprint); older ones take a plain requests.Session
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:
+    curl_requests = None
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json,text/html,*/*'
+}
+
+
+def _make_session():
+    if curl_requests is not None:
+        return curl_requests.Session(impersonate="chrome")
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    # Keep-alive pool sized for the fallback/scan thread pools
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("https://", adapter)
+    return session
+
+
+# Singleton
+_session = None
+_lock = threading.Lock()
+
+def get_yf_session():
+    """Shared session so yfinance reuses TCP/TLS connections across calls."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _make_session()
+    return _session
@@ -0,0 +1,92 @@
+"""Short-lived on-disk cache of NSE quotes keyed by (symbol, minute)."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Quote fields stored per row, in column order
+QUOTE_FIELDS = ('ltp', 'open', 'high', 'low', 'prev_close', 'change', 'change_pct', 'volume')
+
+
+class QuoteCache:
+    """
+    SQLite-backed quote cache.
+
+    NSE quotes have ~1 minute resolution, so a rescan within the same minute
+    can be served from disk instead of hitting NSE again.
+    """
+
+    def __init__(self, db_path: str = "data_storage/quote_cache.db", ttl: int = 90):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite file
+            ttl: Seconds a cached quote stays valid
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS quotes (
+                key TEXT PRIMARY KEY,
+                ltp REAL, open REAL, high REAL, low REAL,
+                prev_close REAL, change REAL, change_pct REAL,
+                volume INTEGER,
+                expires REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _key(symbol: str, minute: int) -> str:
+        return f"{symbol}:{minute}"
+
+    def get_many(self, symbols: List[str]) -> Dict[str, Tuple]:
+        """Return {symbol: quote tuple} for symbols cached in the current minute."""
+        if not symbols:
+            return {}
+
+        now = time.time()
+        minute = int(now // 60)
+        keys = [self._key(s, minute) for s in symbols]
+        placeholders = ",".join("?" * len(keys))
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, {', '.join(QUOTE_FIELDS)} FROM quotes "
+                f"WHERE key IN ({placeholders}) AND expires > ?",
+                (*keys, now)
+            ).fetchall()
+
+        return {row[0].rsplit(":", 1)[0]: row[1:] for row in rows}
+
+    def put_many(self, quotes: Iterable[Tuple]):
+        """Store (symbol, *QUOTE_FIELDS) tuples under the current minute."""
+        now = time.time()
+        minute = int(now // 60)
+        expires = now + self.ttl
+        rows = [(self._key(q[0], minute), *q[1:], expires) for q in quotes]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO quotes VALUES ({','.join('?' * (len(QUOTE_FIELDS) + 2))})",
+                rows
+            )
+            self._conn.execute("DELETE FROM quotes WHERE expires <= ?", (now,))
+            self._conn.commit()
+
+
+# Singleton
+_cache: Optional[QuoteCache] = None
+
+def get_quote_cache() -> QuoteCache:
+    global _cache
+    if _cache is None:
+        _cache = QuoteCache()
+    return _cache
@@ -1,10 +1,13 @@
 """Thread-safe snapshot store for real-time market data."""
 
 import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Sequence
 from dataclasses import dataclass, field
 
+import numpy as np
+
 
 @dataclass
 class StockSnapshot:
@@ -79,11 +82,162 @@ class SnapshotStore:
                 self.update(symbol, **data)
 
 
+
+# Float columns held by SoASnapshotStore (volume is int64, timestamp is epoch seconds)
+SOA_FIELDS = ('ltp', 'open', 'high', 'low', 'prev_close', 'change', 'change_pct', 'bid', 'ask')
+
+
+class SoASnapshotStore:
+    """
+    Snapshot store as parallel NumPy columns indexed by symbol id.
+    
+    Price ticks write straight into the arrays (no per-symbol objects), and
+    screens like "gainers > 2%" are single vectorized expressions over the
+    columns. StockSnapshot objects are only built when a caller asks for one.
+    """
+    
+    def __init__(self, capacity: int = 256):
+        self._idx: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._lock = threading.RLock()
+        self._cols: Dict[str, np.ndarray] = {}
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity: int):
+        n = len(self._symbols)
+        for name in SOA_FIELDS:
+            col = np.zeros(capacity, dtype=np.float64)
+            if name in self._cols:
+                col[:n] = self._cols[name][:n]
+            self._cols[name] = col
+        
+        volume = np.zeros(capacity, dtype=np.int64)
+        timestamp = np.zeros(capacity, dtype=np.float64)
+        dirty = np.zeros(capacity, dtype=bool)
+        if n:
+            volume[:n] = self._volume[:n]
+            timestamp[:n] = self._timestamp[:n]
+            dirty[:n] = self._dirty[:n]
+        self._volume = volume
+        self._timestamp = timestamp
+        self._dirty = dirty  # set when a write actually changes ltp/change%
+    
+    def index_of(self, symbol: str) -> int:
+        """Symbol id, registering the symbol on first sight."""
+        idx = self._idx.get(symbol)
+        if idx is None:
+            with self._lock:
+                idx = self._idx.get(symbol)
+                if idx is None:
+                    idx = len(self._symbols)
+                    if idx >= self._volume.shape[0]:
+                        self._allocate(2 * self._volume.shape[0])
+                    self._symbols.append(symbol)
+                    self._idx[symbol] = idx
+        return idx
+    
+    def ids(self, symbols: Sequence[str]) -> np.ndarray:
+        """Symbol ids for a list of symbols."""
+        return np.fromiter((self.index_of(s) for s in symbols), dtype=np.intp, count=len(symbols))
+    
+    def column(self, name: str) -> np.ndarray:
+        """Live view of a column over the registered symbols."""
+        n = len(self._symbols)
+        if name == 'volume':
+            return self._volume[:n]
+        if name == 'timestamp':
+            return self._timestamp[:n]
+        return self._cols[name][:n]
+    
+    def update(self, symbol: str, **kwargs) -> None:
+        """Update fields for a symbol (thread-safe write)."""
+        with self._lock:
+            idx = self.index_of(symbol)
+            for name, value in kwargs.items():
+                if name == 'volume':
+                    self._volume[idx] = value
+                elif name in self._cols:
+                    if name in ('ltp', 'change_pct') and self._cols[name][idx] != value:
+                        self._dirty[idx] = True
+                    self._cols[name][idx] = value
+            self._timestamp[idx] = time.time()
+    
+    def bulk_update(self, ids: np.ndarray, ltp: np.ndarray, prev_close: np.ndarray) -> None:
+        """Write LTP/prev_close for many symbols and derive change columns."""
+        ltp = np.asarray(ltp, dtype=np.float64)
+        prev_close = np.asarray(prev_close, dtype=np.float64)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(prev_close > 0, ltp - prev_close, 0.0)
+            change_pct = np.where(prev_close > 0, change / prev_close * 100, 0.0)
+        
+        with self._lock:
+            cols = self._cols
+            self._dirty[ids] |= (cols['ltp'][ids] != ltp) | (cols['change_pct'][ids] != change_pct)
+            cols['ltp'][ids] = ltp
+            cols['prev_close'][ids] = prev_close
+            cols['change'][ids] = change
+            cols['change_pct'][ids] = change_pct
+            self._timestamp[ids] = time.time()
+    
+    def take_dirty(self) -> np.ndarray:
+        """Ids changed since the last call, clearing their dirty flags."""
+        with self._lock:
+            n = len(self._symbols)
+            changed = np.flatnonzero(self._dirty[:n])
+            self._dirty[:n] = False
+        return changed
+    
+    def _snapshot(self, idx: int) -> StockSnapshot:
+        cols = self._cols
+        return StockSnapshot(
+            symbol=self._symbols[idx],
+            ltp=float(cols['ltp'][idx]),
+            open=float(cols['open'][idx]),
+            high=float(cols['high'][idx]),
+            low=float(cols['low'][idx]),
+            prev_close=float(cols['prev_close'][idx]),
+            volume=int(self._volume[idx]),
+            change=float(cols['change'][idx]),
+            change_pct=float(cols['change_pct'][idx]),
+            bid=float(cols['bid'][idx]),
+            ask=float(cols['ask'][idx]),
+            timestamp=datetime.fromtimestamp(self._timestamp[idx])
+        )
+    
+    def get(self, symbol: str) -> Optional[StockSnapshot]:
+        """Snapshot for a symbol (built on read)."""
+        idx = self._idx.get(symbol)
+        return self._snapshot(idx) if idx is not None else None
+    
+    def get_many(self, ids: Sequence[int]) -> Dict[str, StockSnapshot]:
+        """Snapshots for a set of symbol ids."""
+        return {self._symbols[i]: self._snapshot(i) for i in ids}
+    
+    def get_ltp(self, symbol: str) -> float:
+        """Quick LTP access."""
+        idx = self._idx.get(symbol)
+        return float(self._cols['ltp'][idx]) if idx is not None else 0.0
+    
+    def get_all(self) -> Dict[str, StockSnapshot]:
+        """Snapshots for every symbol."""
+        return self.get_many(range(len(self._symbols)))
+    
+    def get_symbols(self) -> List[str]:
+        """Get all tracked symbols."""
+        return list(self._symbols)
+    
+    def movers(self, min_change_pct: float) -> List[str]:
+        """Symbols whose |change%| is at least the threshold."""
+        hits = np.flatnonzero(np.abs(self.column('change_pct')) >= min_change_pct)
+        return [self._symbols[i] for i in hits]
+
+
 # Singleton
-_store: Optional[SnapshotStore] = None
+_store: Optional[SoASnapshotStore] = None
 
-def get_snapshot_store() -> SnapshotStore:
+def get_snapshot_store() -> SoASnapshotStore:
     global _store
     if _store is None:
-        _store = SnapshotStore()
+        _store = SoASnapshotStore()
     return _store
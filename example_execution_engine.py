@@ -115,7 +115,7 @@ def main():
     print("PORTFOLIO SUMMARY")
     print(f"{'='*80}\n")
     
-    summary = portfolio.get_portfolio_summary()
+    summary = portfolio.get_portfolio_totals()
     print(f"Total Capital: ₹{summary['total_capital']:,.2f}")
     print(f"Available: ₹{summary['available_capital']:,.2f}")
     print(f"Invested: ₹{summary['invested_capital']:,.2f}")
@@ -10,12 +10,14 @@ This module integrates all components for strict rule-based trade execution:
 - Enhanced validation with 70% confidence threshold
 """
 
+import threading
 import pandas as pd
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from core.enums import SignalType, MarketRegime
 from core.logger import get_logger
+from core.ttl_cache import LRUCacheTTL
 from data.fetcher import NSEDataFetcher
 from analysis.signal_generator import SignalGenerator
 from analysis.multi_timeframe import MultiTimeframeAnalyzer
@@ -64,6 +66,13 @@ class RuleDrivenExecutionEngine:
         )
         self.mtf_analyzer = MultiTimeframeAnalyzer(data_fetcher)
         self.trade_lifecycle_manager = TradeLifecycleManager(logger=self.logger)
+        
+        # Setup outcomes (steps 2-7) per (symbol, tf, last bar) - they only
+        # change on a new candle or when price crosses the setup's levels
+        self._setup_cache = LRUCacheTTL(capacity=4096, ttl=300)
+        # Steps 1-8 run in parallel per symbol; the risk check and trade
+        # creation read/update shared portfolio state and must not interleave
+        self._commit_lock = threading.Lock()
     
     def evaluate_trade_opportunity(self, symbol: str, 
                                    higher_tf: str = "15m",
@@ -82,8 +91,20 @@ class RuleDrivenExecutionEngine:
         """
         self.logger.info(f"Evaluating trade opportunity for {symbol}")
         
+        # Lower-timeframe bars first: their last timestamp keys the setup
+        # cache, so a bar already evaluated skips the higher-timeframe fetch
+        # and all indicator work below
+        ltf_bars = self.data_fetcher.fetch_historical(symbol, period="1d", interval=lower_tf)
+        setup_key = None
+        if ltf_bars is not None and not ltf_bars.empty:
+            setup_key = (symbol, lower_tf, ltf_bars['timestamp'].iloc[-1].value)
+            cached = self._setup_cache.get(setup_key)
+            if cached is not None:
+                return self._hold_decision(symbol, f"{cached['reason']} (cached)")
+        
         # Step 1: Multi-timeframe alignment check
-        mtf_analysis = self.mtf_analyzer.analyze_timeframes(symbol, higher_tf, lower_tf)
+        mtf_analysis = self.mtf_analyzer.analyze_timeframes(symbol, higher_tf, lower_tf,
+                                                            ltf_data=ltf_bars)
         
         if not mtf_analysis['aligned']:
             return self._hold_decision(
@@ -95,16 +116,18 @@ class RuleDrivenExecutionEngine:
         
         # Step 2: Generate signal using lower timeframe data
         ltf_data = mtf_analysis['ltf_data']
+        
         signal = self.signal_generator.generate_signal(symbol, ltf_data, lower_tf)
         
         if signal is None:
-            return self._hold_decision(symbol, "No valid signal generated")
+            return self._hold_decision(symbol, "No valid signal generated", cache_key=setup_key)
         
         # Step 3: Validate confidence threshold (≥70%)
         if signal['confidence'] < self.min_confidence:
             return self._hold_decision(
                 symbol,
-                f"Confidence {signal['confidence']:.1f}% below threshold {self.min_confidence}%"
+                f"Confidence {signal['confidence']:.1f}% below threshold {self.min_confidence}%",
+                cache_key=setup_key
             )
         
         self.logger.info(
@@ -116,14 +139,15 @@ class RuleDrivenExecutionEngine:
         volatility_analysis = signal['indicators']['volatility']
         
         if regime == MarketRegime.UNKNOWN:
-            return self._hold_decision(symbol, "Market regime unknown")
+            return self._hold_decision(symbol, "Market regime unknown", cache_key=setup_key)
         
         # Reject if extremely high volatility (unless breakout confirmed)
         atr_percentile = volatility_analysis.get('atr_percentile', 50)
         if atr_percentile > 95:
             return self._hold_decision(
                 symbol,
-                f"Abnormal volatility: ATR at {atr_percentile:.0f}th percentile"
+                f"Abnormal volatility: ATR at {atr_percentile:.0f}th percentile",
+                cache_key=setup_key
             )
         
         # Step 5: Determine entry type
@@ -138,7 +162,8 @@ class RuleDrivenExecutionEngine:
         if not entry_setup.get('valid', False):
             return self._hold_decision(
                 symbol,
-                f"No valid entry setup: {entry_setup.get('reason', 'Unknown')}"
+                f"No valid entry setup: {entry_setup.get('reason', 'Unknown')}",
+                cache_key=setup_key
             )
         
         entry_price = entry_setup['entry_price']
@@ -169,7 +194,8 @@ class RuleDrivenExecutionEngine:
         if targets and targets[0]['rr_ratio'] < self.min_rr:
             return self._hold_decision(
                 symbol,
-                f"Risk-reward {targets[0]['rr_ratio']:.2f} below minimum {self.min_rr}"
+                f"Risk-reward {targets[0]['rr_ratio']:.2f} below minimum {self.min_rr}",
+                cache_key=setup_key
             )
         
         # Step 8: Calculate position quantity (risk-based)
@@ -195,16 +221,17 @@ class RuleDrivenExecutionEngine:
             f"Risk: ₹{qty_calc['risk_amount']:,.2f} ({qty_calc['risk_pct']:.2f}%)"
         )
         
-        # Step 9: Final risk management validation
-        validation = self.risk_manager.validate_trade(
-            symbol, entry_price, stop_loss, signal['confidence']
-        )
-        
-        if not validation['allowed']:
-            return self._hold_decision(symbol, f"Risk check failed: {validation['reason']}")
-        
-        # Step 10: Create trade in lifecycle manager
-        trade = self.trade_lifecycle_manager.create_trade(symbol, signal['signal_type'])
+        with self._commit_lock:
+            # Step 9: Final risk management validation
+            validation = self.risk_manager.validate_trade(
+                symbol, entry_price, stop_loss, signal['confidence']
+            )
+            
+            if not validation['allowed']:
+                return self._hold_decision(symbol, f"Risk check failed: {validation['reason']}")
+            
+            # Step 10: Create trade in lifecycle manager
+            trade = self.trade_lifecycle_manager.create_trade(symbol, signal['signal_type'])
         trade.confidence = signal['confidence']
         trade.risk_reward = targets[0]['rr_ratio'] if targets else 0
         trade.reasoning = signal['reasoning']
@@ -256,20 +283,48 @@ class RuleDrivenExecutionEngine:
             reasoning=trade_order['reasoning']
         )
         
+        # Same bar re-evaluations would hit the signal cooldown anyway
+        if setup_key is not None:
+            self._setup_cache.put(setup_key, {
+                'reason': "Signal already issued for this bar",
+                'levels': (stop_loss, entry_price, *[t['price'] for t in targets])
+            })
+        
         return trade_order
     
-    def _hold_decision(self, symbol: str, reason: str) -> Dict[str, Any]:
+    def invalidate_on_price(self, symbol: str, ltp: float) -> int:
+        """Drop cached setups for a symbol whose levels the new LTP has crossed.
+        
+        Args:
+            symbol: Stock symbol
+            ltp: Latest traded price
+            
+        Returns:
+            Number of cache entries dropped
+        """
+        def crossed(key, value):
+            levels = value.get('levels')
+            return key[0] == symbol and bool(levels) and not (min(levels) < ltp < max(levels))
+        
+        return self._setup_cache.invalidate_where(crossed)
+    
+    def _hold_decision(self, symbol: str, reason: str,
+                       cache_key: Optional[tuple] = None) -> Dict[str, Any]:
         """Generate HOLD decision with explicit justification.
         
         Args:
             symbol: Stock symbol
             reason: Reason for HOLD
+            cache_key: Setup cache key to remember this outcome under
             
         Returns:
             HOLD decision dictionary
         """
         self.logger.info(f"{symbol}: HOLD - {reason}")
         
+        if cache_key is not None:
+            self._setup_cache.put(cache_key, {'reason': reason, 'levels': None})
+        
         return {
             'ACTION': 'HOLD',
             'symbol': symbol,
@@ -1,5 +1,6 @@
 """Trade lifecycle manager for complete trade flow."""
 
+import threading
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from enum import Enum
@@ -246,6 +247,8 @@ class TradeLifecycleManager:
         self.active_trades = {}  # trade_id -> Trade
         self.completed_trades = []
         self.next_trade_id = 1
+        # SignalWorker evaluates symbols on a thread pool
+        self._lock = threading.Lock()
     
     def create_trade(self, symbol: str, signal_type: SignalType) -> Trade:
         """Create a new trade.
@@ -257,11 +260,12 @@ class TradeLifecycleManager:
         Returns:
             Trade instance
         """
-        trade_id = f"T{self.next_trade_id:05d}"
-        self.next_trade_id += 1
-        
-        trade = Trade(trade_id, symbol, signal_type)
-        self.active_trades[trade_id] = trade
+        with self._lock:
+            trade_id = f"T{self.next_trade_id:05d}"
+            self.next_trade_id += 1
+            
+            trade = Trade(trade_id, symbol, signal_type)
+            self.active_trades[trade_id] = trade
         
         if self.logger:
             self.logger.info(f"Created trade {trade_id} for {symbol} ({signal_type.value})")
@@ -277,9 +281,11 @@ class TradeLifecycleManager:
         Returns:
             List of active Trade instances
         """
+        with self._lock:
+            trades = list(self.active_trades.values())
         if symbol:
-            return [t for t in self.active_trades.values() if t.symbol == symbol]
-        return list(self.active_trades.values())
+            return [t for t in trades if t.symbol == symbol]
+        return trades
     
     def close_trade(self, trade_id: str):
         """Move trade from active to completed.
@@ -287,17 +293,18 @@ class TradeLifecycleManager:
         Args:
             trade_id: Trade ID to close
         """
-        if trade_id in self.active_trades:
-            trade = self.active_trades.pop(trade_id)
-            self.completed_trades.append(trade)
-            
-            if self.logger:
-                summary = trade.get_summary()
-                self.logger.info(
-                    f"Closed trade {trade_id}: {trade.symbol} | "
-                    f"P&L: ₹{summary['total_pnl']:,.2f} | "
-                    f"Reason: {trade.exit_reason}"
-                )
+        with self._lock:
+            trade = self.active_trades.pop(trade_id, None)
+            if trade is not None:
+                self.completed_trades.append(trade)
+        
+        if trade is not None and self.logger:
+            summary = trade.get_summary()
+            self.logger.info(
+                f"Closed trade {trade_id}: {trade.symbol} | "
+                f"P&L: ₹{summary['total_pnl']:,.2f} | "
+                f"Reason: {trade.exit_reason}"
+            )
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary of all completed trades.
@@ -0,0 +1,119 @@
+"""Table model for market scan results - one reset per scan instead of per-cell items."""
+
+from typing import List
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+from core.enums import ScanSignal
+from gui.market_scan_worker import ScanResult
+
+
+# Shared colors (created once, not per cell)
+GREEN = QColor("#3fb950")
+BRIGHT_GREEN = QColor("#56d364")
+RED = QColor("#f85149")
+BLUE = QColor("#58a6ff")
+
+HEADERS = ["Symbol", "Signal", "Conf%", "LTP", "Change%",
+           "Stop Loss", "Target 1", "Target 2", "R:R", ""]
+
+TRADE_COLUMN = 9
+
+# Raw sort keys per column (the TRADE column doesn't sort)
+SORT_KEYS = [
+    lambda r: r.symbol,
+    lambda r: r.signal,
+    lambda r: r.confidence,
+    lambda r: r.ltp,
+    lambda r: r.change_pct,
+    lambda r: r.stop_loss,
+    lambda r: r.target1,
+    lambda r: r.target2,
+    lambda r: r.risk_reward_ratio,
+    None,
+]
+
+
+class ScanResultsModel(QAbstractTableModel):
+    """Read-only model over a list of ScanResult rows."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results: List[ScanResult] = []
+
+    def set_results(self, results: List[ScanResult]):
+        """Replace all rows with a single model reset."""
+        self.beginResetModel()
+        self._results = list(results)
+        self.endResetModel()
+
+    def result_at(self, row: int) -> ScanResult:
+        return self._results[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._results)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        r = self._results[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return r.symbol
+            if col == 1:
+                return r.signal.display_name
+            if col == 2:
+                return f"{r.confidence:.0f}%"
+            if col == 3:
+                return f"₹{r.ltp:,.2f}"
+            if col == 4:
+                return f"{r.change_pct:+.2f}%"
+            if col == 5:
+                return f"₹{r.stop_loss:,.2f}"
+            if col == 6:
+                return f"₹{r.target1:,.2f}"
+            if col == 7:
+                return f"₹{r.target2:,.2f}"
+            if col == 8:
+                return f"{r.risk_reward_ratio:.1f}:1"
+            return None
+
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if col == 1:
+                if r.signal & ScanSignal.BUY:
+                    return GREEN
+                if r.signal & ScanSignal.SELL:
+                    return RED
+                return None
+            if col == 4:
+                return GREEN if r.change_pct >= 0 else RED
+            if col == 5:
+                return RED
+            if col == 6:
+                return GREEN
+            if col == 7:
+                return BRIGHT_GREEN
+            if col == 8:
+                return BLUE
+
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        key = SORT_KEYS[column]
+        if key is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._results.sort(key=key, reverse=order == Qt.SortOrder.DescendingOrder)
+        self.layoutChanged.emit()
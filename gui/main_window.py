@@ -1,22 +1,36 @@
 """Production-Grade Trading GUI - Zero-Lag, Thread-Safe, with Live Scan Log."""
 
 import sys
+from collections import deque
 from datetime import datetime
 from typing import Dict, Optional, List
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QPushButton, QTableWidget, 
-                           QTableWidgetItem, QTabWidget, QGroupBox, QSpinBox, 
+                           QTableWidgetItem, QTableView, QTabWidget, QGroupBox, QSpinBox, 
                            QHeaderView, QMessageBox, QSplitter, QLineEdit,
                            QProgressBar, QTextEdit, QComboBox, QCheckBox)
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QFont, QTextCursor
+import numpy as np
 import pyqtgraph as pg
 
-from core.enums import SignalType, PositionType
+from core.enums import SignalType, PositionType, ScanSignal
+from core.logger import get_logger
 from data.nse_symbols import get_symbol_manager
+from data.http_session import get_yf_session
 from data.snapshot_store import get_snapshot_store, StockSnapshot
 from gui.workers import PriceWorker, SignalWorker, DataBridge
-from gui.market_scan_worker import MarketScanWorker, ScanResult
+from gui.market_scan_worker import MarketScanWorker, ScanResult, ScanColumns
+from gui.components.scan_table_model import ScanResultsModel, TRADE_COLUMN
+from indicators import _kernels as kernels
+
+
+# Signal label on the chart; filled with .format() on each update
+SIGNAL_LABEL_HTML = (
+    '<div style="text-align: left; color: {color};">'
+    '<span style="font-size: 18pt; font-weight: bold;">{signal}</span><br>'
+    '<span style="font-size: 10pt; color: #c9d1d9;">LTP: {ltp:.2f} | RSI: {rsi:.1f}</span></div>'
+)
 
 
 class TradingEngineGUI(QMainWindow):
@@ -25,6 +39,7 @@ class TradingEngineGUI(QMainWindow):
     def __init__(self, engine):
         super().__init__()
         self.engine = engine
+        self._logger = get_logger()
         self.setWindowTitle("NSE Trading Engine Pro - Full Market Scanner")
         self.setGeometry(100, 100, 1700, 950)
         
@@ -41,7 +56,10 @@ class TradingEngineGUI(QMainWindow):
         self._market_scanner: Optional[MarketScanWorker] = None
         
         # Scan results cache
-        self._last_scan_results: List[ScanResult] = []
+        self._last_scan_results: Optional[ScanColumns] = None
+        
+        # Scan log lines, flushed to the widget in batches
+        self._log_buffer: deque = deque(maxlen=5000)
         
         # Styling
         self._apply_dark_theme()
@@ -61,6 +79,10 @@ class TradingEngineGUI(QMainWindow):
         self._chart_timer.timeout.connect(self._update_chart)
         self._chart_timer.start(30000)  # Update chart every 30 seconds
         
+        self._log_flush_timer = QTimer()
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        self._log_flush_timer.start(200)  # Flush scan log 5x per second
+        
         # Initial chart load
         QTimer.singleShot(1000, self._update_chart)
     
@@ -278,11 +300,32 @@ class TradingEngineGUI(QMainWindow):
         self.rsi_chart.addItem(pg.InfiniteLine(pos=70, angle=0, pen=pg.mkPen('#ff6b6b', width=1, style=Qt.PenStyle.DashLine)))
         self.rsi_chart.addItem(pg.InfiniteLine(pos=30, angle=0, pen=pg.mkPen('#3fb950', width=1, style=Qt.PenStyle.DashLine)))
         
+        self._rsi_curve = self.rsi_chart.plot(pen=pg.mkPen('#a371f7', width=1.5))
+        
         layout.addWidget(self.rsi_chart)
         
         # Link X-axis
         self.rsi_chart.setXLink(self.chart)
         
+        # Persistent chart items: created once, only moved/retexted on update
+        dash = Qt.PenStyle.DashLine
+        self._price_line = pg.InfiniteLine(angle=0, pen=pg.mkPen('#58a6ff', width=1, style=dash))
+        self._line_t1 = pg.InfiniteLine(angle=0, pen=pg.mkPen('#3fb950', width=1, style=dash),
+                                        label="T1: {value:.2f}", labelOpts={'color': '#3fb950', 'position': 0.9})
+        self._line_t2 = pg.InfiniteLine(angle=0, pen=pg.mkPen('#3fb950', width=1, style=dash),
+                                        label="T2: {value:.2f}", labelOpts={'color': '#3fb950', 'position': 0.9})
+        self._line_sl = pg.InfiniteLine(angle=0, pen=pg.mkPen('#f85149', width=1, style=dash),
+                                        label="SL: {value:.2f}", labelOpts={'color': '#f85149', 'position': 0.9})
+        self._signal_text = pg.TextItem(anchor=(0, 0))
+        self._level_lines = (self._line_sl, self._line_t1, self._line_t2)
+        
+        for item in (self._price_line, *self._level_lines, self._signal_text):
+            item.setVisible(False)
+            self.chart.addItem(item)
+        
+        # Per-update items (candles, overlays), removed before each redraw
+        self._chart_items: List = []
+        
         return group
     
     def _create_trade_panel(self) -> QWidget:
@@ -399,12 +442,12 @@ class TradingEngineGUI(QMainWindow):
         self.lbl_results_count.setStyleSheet("color: #58a6ff; font-weight: bold;")
         results_layout.addWidget(self.lbl_results_count)
         
-        self.signals_table = QTableWidget()
-        self.signals_table.setColumnCount(10)
-        self.signals_table.setHorizontalHeaderLabels([
-            "Symbol", "Signal", "Conf%", "LTP", "Change%", 
-            "Stop Loss", "Target 1", "Target 2", "R:R", ""
-        ])
+        self.signals_model = ScanResultsModel(self)
+        self.signals_model.modelReset.connect(self._attach_trade_buttons)
+        self.signals_model.layoutChanged.connect(self._attach_trade_buttons)
+        
+        self.signals_table = QTableView()
+        self.signals_table.setModel(self.signals_model)
         self.signals_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.signals_table.setAlternatingRowColors(True)
         self.signals_table.setSortingEnabled(True)
@@ -483,7 +526,8 @@ class TradingEngineGUI(QMainWindow):
         
         self.positions_table.setRowCount(0)
         for symbol, pos in positions.items():
-            snap = snapshots.get(symbol)
+            # Updates are deltas - unchanged symbols come from the store
+            snap = snapshots.get(symbol) or self._snapshot_store.get(symbol)
             ltp = snap.ltp if snap else pos.get('current_price', pos['entry_price'])
             pnl = (ltp - pos['entry_price']) * pos['quantity']
             total_pnl += pnl
@@ -560,212 +604,188 @@ class TradingEngineGUI(QMainWindow):
     
     def _update_chart(self):
         """Update chart with candlestick view (multi-timeframe)."""
+        import yfinance as yf
+        
+        timeframe = self.combo_timeframe.currentText()
+        
+        # Map timeframe to yfinance period/interval
+        tf_map = {
+            "1m": ("1d", "1m"),
+            "5m": ("5d", "5m"),
+            "15m": ("5d", "15m"),
+            "30m": ("5d", "30m"),
+            "1h": ("1mo", "1h"),
+            "1d": ("1y", "1d"),
+            "1wk": ("2y", "1wk"),
+            "1mo": ("5y", "1mo")
+        }
+        
+        period, interval = tf_map.get(timeframe, ("1y", "1d"))
+        
+        # Fetch OHLC data (network/provider errors just skip this tick)
         try:
-            import yfinance as yf
-            
-            timeframe = self.combo_timeframe.currentText()
-            
-            # Map timeframe to yfinance period/interval
-            tf_map = {
-                "1m": ("1d", "1m"),
-                "5m": ("5d", "5m"),
-                "15m": ("5d", "15m"),
-                "30m": ("5d", "30m"),
-                "1h": ("1mo", "1h"),
-                "1d": ("1y", "1d"),
-                "1wk": ("2y", "1wk"),
-                "1mo": ("5y", "1mo")
-            }
+            ticker = yf.Ticker(self._selected_symbol, session=get_yf_session())
+            df = ticker.history(period=period, interval=interval)
+        except Exception as e:
+            self._logger.debug(f"Chart fetch failed for {self._selected_symbol}: {e}")
+            return
+        
+        # Signal logic needs at least two bars
+        if df is None or len(df) < 2:
+            return
+        
+        try:
+            for item in self._chart_items:
+                self.chart.removeItem(item)
+            self._chart_items.clear()
             
-            period, interval = tf_map.get(timeframe, ("1y", "1d"))
+            # Limit candle count for performance (max 100 candles)
+            if len(df) > 100:
+                df = df.iloc[-100:]
             
-            # Fetch OHLC data
-            ticker = yf.Ticker(self._selected_symbol)
-            df = ticker.history(period=period, interval=interval)
+            # Optimization: one float64 view of closes shared by all indicator kernels
+            closes = df['Close'].to_numpy(dtype=np.float64, copy=False)
             
-            if df is not None and not df.empty:
-                self.chart.clear()
-                
-                # Limit candle count for performance (max 100 candles)
-                if len(df) > 100:
-                    df = df.iloc[-100:]
-                
-                # Prepare candlestick data
-                for i, (idx, row) in enumerate(df.iterrows()):
-                    open_price = row['Open']
-                    high = row['High']
-                    low = row['Low']
-                    close = row['Close']
-                    
-                    # Determine color
-                    if close >= open_price:
-                        color = '#3fb950'  # Green (bullish)
-                    else:
-                        color = '#f85149'  # Red (bearish)
-                    
-                    # Draw wick (high-low line)
-                    wick = pg.PlotCurveItem(
-                        x=[i, i],
-                        y=[low, high],
-                        pen=pg.mkPen(color, width=1)
-                    )
-                    self.chart.addItem(wick)
-                    
-                    # Draw body (open-close bar)
-                    body_low = min(open_price, close)
-                    body_high = max(open_price, close)
-                    
-                    # Use bar graph for body
-                    body = pg.BarGraphItem(
-                        x=[i],
-                        height=[body_high - body_low],
-                        width=0.6,
-                        y0=body_low,
-                        brush=pg.mkBrush(color),
-                        pen=pg.mkPen(color)
-                    )
-                    self.chart.addItem(body)
-                
-                # Add current price line
-                current_price = df['Close'].iloc[-1]
-                price_line = pg.InfiniteLine(
-                    pos=current_price,
-                    angle=0,
-                    pen=pg.mkPen('#58a6ff', width=1, style=Qt.PenStyle.DashLine)
-                )
-                self.chart.addItem(price_line)
+            # Prepare candlestick data
+            for i, (idx, row) in enumerate(df.iterrows()):
+                open_price = row['Open']
+                high = row['High']
+                low = row['Low']
+                close = row['Close']
                 
-                # --- OVERLAYS: EMA 50/200 ---
-                if hasattr(self, 'chk_ema') and self.chk_ema.isChecked():
-                    ema50 = df['Close'].ewm(span=50, adjust=False).mean()
-                    ema200 = df['Close'].ewm(span=200, adjust=False).mean()
-                    
-                    self.chart.plot(ema50.values, pen=pg.mkPen('#ffdf5d', width=1.5), name="EMA 50") # Yellow
-                    self.chart.plot(ema200.values, pen=pg.mkPen('#d1d5da', width=1.5), name="EMA 200") # White
-                
-                # --- OVERLAYS: Bollinger Bands ---
-                if hasattr(self, 'chk_bb') and self.chk_bb.isChecked():
-                    sma20 = df['Close'].rolling(window=20).mean()
-                    std20 = df['Close'].rolling(window=20).std()
-                    upper = sma20 + (std20 * 2)
-                    lower = sma20 - (std20 * 2)
-                    
-                    # Fill area (pseudo-fill by plotting lines)
-                    self.chart.plot(upper.values, pen=pg.mkPen('#79c0ff', width=1))
-                    self.chart.plot(lower.values, pen=pg.mkPen('#79c0ff', width=1))
-                    
-                # --- SUBPLOT: RSI ---
-                if hasattr(self, 'chk_rsi') and self.chk_rsi.isChecked():
-                    self.rsi_chart.setVisible(True)
-                    self.rsi_chart.clear()
-                    
-                    # Draw levels
-                    self.rsi_chart.addItem(pg.InfiniteLine(pos=70, angle=0, pen=pg.mkPen('#ff7b72', width=1, style=Qt.PenStyle.DashLine)))
-                    self.rsi_chart.addItem(pg.InfiniteLine(pos=30, angle=0, pen=pg.mkPen('#7ee787', width=1, style=Qt.PenStyle.DashLine)))
-                    
-                    # Calc RSI
-                    delta = df['Close'].diff()
-                    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                    rs = gain / loss
-                    rsi = 100 - (100 / (1 + rs))
-                    
-                    self.rsi_chart.plot(rsi.values, pen=pg.mkPen('#a371f7', width=1.5))
+                # Determine color
+                if close >= open_price:
+                    color = '#3fb950'  # Green (bullish)
                 else:
-                    self.rsi_chart.setVisible(False)
-                
-
+                    color = '#f85149'  # Red (bearish)
                 
-                # --- LIVE ANALYSIS & SIGNAL VISUALIZATION ---
-                # Calculate simple analysis for the chart view
-                last_close = df['Close'].iloc[-1]
-                prev_close = df['Close'].iloc[-2]
-                change_pct = ((last_close - prev_close) / prev_close) * 100
+                # Draw wick (high-low line)
+                wick = pg.PlotCurveItem(
+                    x=[i, i],
+                    y=[low, high],
+                    pen=pg.mkPen(color, width=1)
+                )
+                self.chart.addItem(wick)
+                self._chart_items.append(wick)
                 
-                # Indicators for Logic
-                rsi_val = 50
-                ema50_val = last_close
+                # Draw body (open-close bar)
+                body_low = min(open_price, close)
+                body_high = max(open_price, close)
                 
-                if len(df) > 14:
-                    delta = df['Close'].diff()
-                    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                    rs = gain / loss
-                    rsi_series = 100 - (100 / (1 + rs))
-                    rsi_val = rsi_series.iloc[-1]
+                # Use bar graph for body
+                body = pg.BarGraphItem(
+                    x=[i],
+                    height=[body_high - body_low],
+                    width=0.6,
+                    y0=body_low,
+                    brush=pg.mkBrush(color),
+                    pen=pg.mkPen(color)
+                )
+                self.chart.addItem(body)
+                self._chart_items.append(body)
+            
+            # Add current price line
+            current_price = df['Close'].iloc[-1]
+            self._price_line.setValue(current_price)
+            self._price_line.setVisible(True)
+            
+            # --- OVERLAYS: EMA 50/200 ---
+            if hasattr(self, 'chk_ema') and self.chk_ema.isChecked():
+                ema50 = df['Close'].ewm(span=50, adjust=False).mean()
+                ema200 = df['Close'].ewm(span=200, adjust=False).mean()
                 
-                if len(df) > 50:
-                    ema50_series = df['Close'].ewm(span=50, adjust=False).mean()
-                    ema50_val = ema50_series.iloc[-1]
+                self._chart_items.append(self.chart.plot(ema50.values, pen=pg.mkPen('#ffdf5d', width=1.5), name="EMA 50")) # Yellow
+                self._chart_items.append(self.chart.plot(ema200.values, pen=pg.mkPen('#d1d5da', width=1.5), name="EMA 200")) # White
+            
+            # --- OVERLAYS: Bollinger Bands ---
+            if hasattr(self, 'chk_bb') and self.chk_bb.isChecked():
+                sma20 = df['Close'].rolling(window=20).mean()
+                std20 = df['Close'].rolling(window=20).std()
+                upper = sma20 + (std20 * 2)
+                lower = sma20 - (std20 * 2)
                 
-                # Determine Signal
-                signal_text = "NEUTRAL"
-                signal_color = "#8b949e" # Grey
+                # Fill area (pseudo-fill by plotting lines)
+                self._chart_items.append(self.chart.plot(upper.values, pen=pg.mkPen('#79c0ff', width=1)))
+                self._chart_items.append(self.chart.plot(lower.values, pen=pg.mkPen('#79c0ff', width=1)))
                 
-                # Trading Logic (Simplified for visualization)
-                if last_close > ema50_val:
-                    if rsi_val < 30: 
-                        signal_text = "STRONG BUY (Oversold Dip)"
-                        signal_color = "#3fb950" # Green
-                    elif last_close > prev_close * 1.01:
-                        signal_text = "BUY (Momentum)"
-                        signal_color = "#3fb950"
-                elif last_close < ema50_val:
-                    if rsi_val > 70:
-                        signal_text = "STRONG SELL (Overbought Top)"
-                        signal_color = "#f85149" # Red
-                    elif last_close < prev_close * 0.99:
-                        signal_text = "SELL (Momentum)"
-                        signal_color = "#f85149"
+            # --- SUBPLOT: RSI ---
+            if hasattr(self, 'chk_rsi') and self.chk_rsi.isChecked():
+                self.rsi_chart.setVisible(True)
                 
-                # Calculate Levels (ATR-based or Percentage)
-                volatility = df['High'].iloc[-5:].max() - df['Low'].iloc[-5:].min()
-                if volatility == 0: volatility = last_close * 0.01
+                # Calc RSI
+                rsi_series = kernels.rsi(closes, 14)
                 
-                if "BUY" in signal_text:
-                    sl = last_close - (volatility * 0.5)
-                    t1 = last_close + volatility
-                    t2 = last_close + (volatility * 2)
-                    
-                    # Plot Targets (Green Dashed)
-                    self.chart.addItem(pg.InfiniteLine(pos=t1, angle=0, pen=pg.mkPen('#3fb950', width=1, style=Qt.PenStyle.DashLine), label=f"T1: {t1:.2f}", labelOpts={'color': '#3fb950', 'position': 0.9}))
-                    self.chart.addItem(pg.InfiniteLine(pos=t2, angle=0, pen=pg.mkPen('#3fb950', width=1, style=Qt.PenStyle.DashLine), label=f"T2: {t2:.2f}", labelOpts={'color': '#3fb950', 'position': 0.9}))
-                    # Plot SL (Red Dashed)
-                    self.chart.addItem(pg.InfiniteLine(pos=sl, angle=0, pen=pg.mkPen('#f85149', width=1, style=Qt.PenStyle.DashLine), label=f"SL: {sl:.2f}", labelOpts={'color': '#f85149', 'position': 0.9}))
-                    
-                elif "SELL" in signal_text:
-                    sl = last_close + (volatility * 0.5)
-                    t1 = last_close - volatility
-                    t2 = last_close - (volatility * 2)
-                    
-                    self.chart.addItem(pg.InfiniteLine(pos=t1, angle=0, pen=pg.mkPen('#3fb950', width=1, style=Qt.PenStyle.DashLine), label=f"T1: {t1:.2f}", labelOpts={'color': '#3fb950', 'position': 0.9}))
-                    self.chart.addItem(pg.InfiniteLine(pos=t2, angle=0, pen=pg.mkPen('#3fb950', width=1, style=Qt.PenStyle.DashLine), label=f"T2: {t2:.2f}", labelOpts={'color': '#3fb950', 'position': 0.9}))
-                    self.chart.addItem(pg.InfiniteLine(pos=sl, angle=0, pen=pg.mkPen('#f85149', width=1, style=Qt.PenStyle.DashLine), label=f"SL: {sl:.2f}", labelOpts={'color': '#f85149', 'position': 0.9}))
+                self._rsi_curve.setData(rsi_series)
+            else:
+                self.rsi_chart.setVisible(False)
+            
 
-                # Display Signal Label on Chart
-                text_item = pg.TextItem(html=f'<div style="text-align: left; color: {signal_color};"><span style="font-size: 18pt; font-weight: bold;">{signal_text}</span><br><span style="font-size: 10pt; color: #c9d1d9;">LTP: {last_close:.2f} | RSI: {rsi_val:.1f}</span></div>', anchor=(0, 0))
-                self.chart.addItem(text_item)
-                # Position text top-left (using view coordinates)
-                # We need to set position after view is updated, but for now we place it at start of visible range
-                # Better approach: mapToView or setPos relative to view range. 
-                # Simplest for pyqtgraph: setPos to a coordinate.
-                # Let's put it at the top left of the visible data.
-                view_box = self.chart.getViewBox()
-                # view_range = view_box.viewRange()
-                # x_min = view_range[0][0]
-                # y_max = view_range[1][1]
-                # text_item.setPos(x_min, y_max) 
-                # Since interacting with viewbox ranges inside update might be tricky due to auto-ranging, let's just place it near the last candle for visibility or use 0, max_y
-                
-                start_x = df.index[0] if isinstance(df.index, (int, float)) else 0 # It's reset index so 0 to N
-                # Actually our x-axis is 0..N-1
-                text_item.setPos(0, df['High'].max())
+            
+            # --- LIVE ANALYSIS & SIGNAL VISUALIZATION ---
+            # Calculate simple analysis for the chart view
+            last_close = df['Close'].iloc[-1]
+            prev_close = df['Close'].iloc[-2]
+            change_pct = ((last_close - prev_close) / prev_close) * 100
+            
+            # Indicators for Logic: RSI14, EMA50 and ATR14 in one fused pass
+            rsi_val, ema50_val, volatility = kernels.chart_overlay(
+                closes,
+                df['High'].to_numpy(dtype=np.float64, copy=False),
+                df['Low'].to_numpy(dtype=np.float64, copy=False)
+            )
+            
+            # Determine Signal
+            signal_text = "NEUTRAL"
+            signal_color = "#8b949e" # Grey
+            
+            # Trading Logic (Simplified for visualization)
+            if last_close > ema50_val:
+                if rsi_val < 30: 
+                    signal_text = "STRONG BUY (Oversold Dip)"
+                    signal_color = "#3fb950" # Green
+                elif last_close > prev_close * 1.01:
+                    signal_text = "BUY (Momentum)"
+                    signal_color = "#3fb950"
+            elif last_close < ema50_val:
+                if rsi_val > 70:
+                    signal_text = "STRONG SELL (Overbought Top)"
+                    signal_color = "#f85149" # Red
+                elif last_close < prev_close * 0.99:
+                    signal_text = "SELL (Momentum)"
+                    signal_color = "#f85149"
+            
+            # Calculate Levels (ATR-based or Percentage)
+            if not volatility > 0: volatility = last_close * 0.01
+            
+            if "BUY" in signal_text:
+                sl = last_close - (volatility * 0.5)
+                t1 = last_close + volatility
+                t2 = last_close + (volatility * 2)
+            elif "SELL" in signal_text:
+                sl = last_close + (volatility * 0.5)
+                t1 = last_close - volatility
+                t2 = last_close - (volatility * 2)
+            
+            # Plot Targets (Green Dashed) and SL (Red Dashed), hidden for NEUTRAL
+            has_levels = "BUY" in signal_text or "SELL" in signal_text
+            for line in self._level_lines:
+                line.setVisible(has_levels)
+            if has_levels:
+                self._line_sl.setValue(sl)
+                self._line_t1.setValue(t1)
+                self._line_t2.setValue(t2)
 
-                # Update LTP label
-                self.lbl_ltp.setText(f"LTP: ₹{current_price:,.2f}")
-                
-        except Exception as e:
-            pass
+            # Display Signal Label on Chart, top-left of the data (x-axis is 0..N-1)
+            self._signal_text.setHtml(SIGNAL_LABEL_HTML.format(
+                color=signal_color, signal=signal_text, ltp=last_close, rsi=rsi_val))
+            self._signal_text.setPos(0, df['High'].max())
+            self._signal_text.setVisible(True)
+
+            # Update LTP label
+            self.lbl_ltp.setText(f"LTP: ₹{current_price:,.2f}")
+            
+        except (KeyError, IndexError) as e:
+            self._logger.debug(f"Chart data incomplete for {self._selected_symbol}: {e}")
     
     def _scan_market(self):
         """Launch FULL market scan with live log."""
@@ -773,22 +793,38 @@ class TradingEngineGUI(QMainWindow):
         self.btn_scan.setText("⏳ SCANNING...")
         self.scan_progress.setVisible(True)
         self.scan_progress.setValue(0)
-        self.signals_table.setRowCount(0)
+        self.signals_model.set_results([])
         self.txt_scan_log.clear()
+        self._log_buffer.clear()
         self._log("🚀 Starting full market scan...")
         
         self._market_scanner = MarketScanWorker()
         self._market_scanner.scan_started.connect(self._on_scan_started)
         self._market_scanner.scan_progress.connect(self._on_scan_progress)
-        self._market_scanner.stock_scanned.connect(self._on_stock_scanned)
+        self._market_scanner.batch_scanned.connect(self._on_batch_scanned)
         self._market_scanner.scan_complete.connect(self._on_scan_complete)
         self._market_scanner.scan_error.connect(self._on_scan_error)
         self._market_scanner.start()
     
     def _log(self, message: str):
-        """Add message to scan log."""
+        """Queue message for the scan log (written by _flush_log)."""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.txt_scan_log.append(f"[{timestamp}] {message}")
+        self._log_buffer.append(f"[{timestamp}] {message}")
+    
+    def _flush_log(self):
+        """Write all queued log lines in a single insert."""
+        if not self._log_buffer:
+            return
+        
+        lines = list(self._log_buffer)
+        self._log_buffer.clear()
+        
+        text = "\n".join(lines)
+        if not self.txt_scan_log.document().isEmpty():
+            text = "\n" + text
+        
+        self.txt_scan_log.moveCursor(QTextCursor.MoveOperation.End)
+        self.txt_scan_log.insertPlainText(text)
         self.txt_scan_log.moveCursor(QTextCursor.MoveOperation.End)
     
     def _on_scan_started(self, total: int):
@@ -800,26 +836,27 @@ class TradingEngineGUI(QMainWindow):
         self.scan_progress.setValue(scanned)
         self.lbl_scan_status.setText(f"Scanned {scanned}/{total} ({scanned*100//total}%)")
     
-    def _on_stock_scanned(self, symbol: str, status: str, ltp: float):
-        """Live log of each stock scanned."""
-        if ltp > 0:
-            self._log(f"{symbol}: {status} (₹{ltp:.2f})")
-        else:
-            self._log(f"{symbol}: {status}")
+    def _on_batch_scanned(self, rows: list):
+        """Live log of each stock scanned, delivered one batch at a time."""
+        for symbol, status, ltp in rows:
+            if ltp > 0:
+                self._log(f"{symbol}: {status} (₹{ltp:.2f})")
+            else:
+                self._log(f"{symbol}: {status}")
     
-    def _on_scan_complete(self, results: List[ScanResult]):
+    def _on_scan_complete(self, results: ScanColumns):
         self.btn_scan.setEnabled(True)
         self.btn_scan.setText("🚀 SCAN ALL NSE STOCKS")
         self.scan_progress.setVisible(False)
         
         self._last_scan_results = results
-        actionable = [r for r in results if r.signal != "NEUTRAL"]
+        actionable = np.flatnonzero(results.signal)
         
         self._log(f"✅ Scan complete! Found {len(actionable)} signals from {len(results)} stocks")
         self.lbl_scan_status.setText(f"Found {len(actionable)} signals from {len(results)} stocks")
         self.lbl_results_count.setText(f"{len(actionable)} signals found")
         
-        self._display_results(actionable)
+        self._display_results(results.rows(actionable[:150]))
     
     def _on_scan_error(self, error: str):
         self.btn_scan.setEnabled(True)
@@ -831,80 +868,36 @@ class TradingEngineGUI(QMainWindow):
     
     def _display_results(self, results: List[ScanResult]):
         """Display scan results with Stop Loss, Target 1, Target 2, Risk-Reward."""
-        self.signals_table.setSortingEnabled(False)
-        self.signals_table.setRowCount(0)
-        
-        for r in results[:150]:  # Top 150
-            row = self.signals_table.rowCount()
-            self.signals_table.insertRow(row)
-            
-            # Symbol
-            self.signals_table.setItem(row, 0, QTableWidgetItem(r.symbol))
-            
-            # Signal with color
-            sig_item = QTableWidgetItem(r.signal)
-            if "BUY" in r.signal:
-                sig_item.setForeground(QColor("#3fb950"))
-            elif "SELL" in r.signal:
-                sig_item.setForeground(QColor("#f85149"))
-            self.signals_table.setItem(row, 1, sig_item)
-            
-            # Confidence
-            self.signals_table.setItem(row, 2, QTableWidgetItem(f"{r.confidence:.0f}%"))
-            
-            # LTP
-            self.signals_table.setItem(row, 3, QTableWidgetItem(f"₹{r.ltp:,.2f}"))
-            
-            # Change %
-            chg_item = QTableWidgetItem(f"{r.change_pct:+.2f}%")
-            chg_item.setForeground(QColor("#3fb950") if r.change_pct >= 0 else QColor("#f85149"))
-            self.signals_table.setItem(row, 4, chg_item)
-            
-            # Stop Loss (RED color)
-            sl_item = QTableWidgetItem(f"₹{r.stop_loss:,.2f}")
-            sl_item.setForeground(QColor("#f85149"))
-            self.signals_table.setItem(row, 5, sl_item)
-            
-            # Target 1 (GREEN color)
-            t1_item = QTableWidgetItem(f"₹{r.target1:,.2f}")
-            t1_item.setForeground(QColor("#3fb950"))
-            self.signals_table.setItem(row, 6, t1_item)
-            
-            # Target 2 (BRIGHT GREEN color)
-            t2_item = QTableWidgetItem(f"₹{r.target2:,.2f}")
-            t2_item.setForeground(QColor("#56d364"))
-            self.signals_table.setItem(row, 7, t2_item)
-            
-            # Risk-Reward Ratio
-            rr_item = QTableWidgetItem(f"{r.risk_reward_ratio:.1f}:1")
-            rr_item.setForeground(QColor("#58a6ff"))
-            self.signals_table.setItem(row, 8, rr_item)
-            
-            # Trade button
+        # Top 150, one model reset instead of per-cell items
+        self.signals_model.set_results(results[:150])
+    
+    def _attach_trade_buttons(self):
+        """(Re)attach TRADE buttons after the model resets or re-sorts."""
+        for row in range(self.signals_model.rowCount()):
+            r = self.signals_model.result_at(row)
             btn = QPushButton("TRADE")
             btn.setStyleSheet("background-color: #1f6feb; color: white; padding: 5px;")
-            btn.clicked.connect(lambda ch, sym=r.symbol, side=r.signal.replace("STRONG ", "").replace("WEAK ", ""): self._do_execute(sym, side, 10))
-            self.signals_table.setCellWidget(row, 9, btn)
-        
-        self.signals_table.setSortingEnabled(True)
+            btn.clicked.connect(lambda ch, sym=r.symbol, side="BUY" if r.signal & ScanSignal.BUY else "SELL": self._do_execute(sym, side, 10))
+            self.signals_table.setIndexWidget(self.signals_model.index(row, TRADE_COLUMN), btn)
     
     def _apply_filter(self, filter_text: str):
         """Apply filter to results."""
         if not self._last_scan_results:
             return
         
+        signal = self._last_scan_results.signal
         if filter_text == "All Signals":
-            filtered = [r for r in self._last_scan_results if r.signal != "NEUTRAL"]
+            filtered = np.flatnonzero(signal)
         elif filter_text == "BUY Only":
-            filtered = [r for r in self._last_scan_results if "BUY" in r.signal]
+            filtered = np.flatnonzero(signal & ScanSignal.BUY)
         elif filter_text == "SELL Only":
-            filtered = [r for r in self._last_scan_results if "SELL" in r.signal]
+            filtered = np.flatnonzero(signal & ScanSignal.SELL)
         elif filter_text == "Strong Only":
-            filtered = [r for r in self._last_scan_results if "STRONG" in r.signal]
+            filtered = np.flatnonzero(signal & ScanSignal.STRONG)
         else:
-            filtered = self._last_scan_results
+            filtered = np.arange(len(signal))
         
-        self._display_results(filtered)
+        self._display_results(self._last_scan_results.rows(filtered[:150]))
         self.lbl_results_count.setText(f"{len(filtered)} signals shown")
     
     def _execute_trade(self, side: str):
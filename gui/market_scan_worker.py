@@ -10,12 +10,146 @@ Provides:
 
 import asyncio
 import aiohttp
+import numpy as np
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from PyQt6.QtCore import QThread, pyqtSignal
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# HTTP/2 client (httpx + h2) is optional; aiohttp over HTTP/1.1 otherwise
+try:
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+TIMEOUT_ERRORS = (asyncio.TimeoutError,) + ((httpx.TimeoutException,) if httpx else ())
+
+from core.enums import ScanSignal
+from data.http_session import get_yf_session
 from data.nse_symbol_loader import get_nse_symbol_loader
+from data.quote_cache import get_quote_cache, QUOTE_FIELDS
+from indicators import _kernels as kernels
+from indicators._kernels import njit
+
+
+# Scan signals produced by the levels kernel
+STRONG_BUY = int(ScanSignal.BUY | ScanSignal.STRONG)
+BUY = int(ScanSignal.BUY)
+WEAK_BUY = int(ScanSignal.BUY | ScanSignal.WEAK)
+WEAK_SELL = int(ScanSignal.SELL | ScanSignal.WEAK)
+SELL = int(ScanSignal.SELL)
+STRONG_SELL = int(ScanSignal.SELL | ScanSignal.STRONG)
+
+ANALYSIS_FORMATS = {
+    int(ScanSignal.NEUTRAL): "Consolidating",
+    STRONG_BUY: "Momentum {:+.1f}%",
+    BUY: "Momentum {:+.1f}%",
+    WEAK_BUY: "Mild Bullish {:+.1f}%",
+    WEAK_SELL: "Mild Bearish {:+.1f}%",
+    SELL: "Momentum {:+.1f}%",
+    STRONG_SELL: "Momentum {:+.1f}%",
+}
+
+
+@lru_cache(maxsize=None)
+def make_levels_kernel(th_strong: float = 4.0, th_normal: float = 2.0, th_weak: float = 1.0,
+                       buf_pct: float = 0.2, min_buf: float = 0.005):
+    """
+    Build the signal/level ladder kernel with its thresholds baked in.
+    
+    The returned function is compiled once per configuration (numba folds
+    the captured constants) and writes its outputs in place, so it can be
+    pointed straight at ScanColumns slices.
+    
+    Args:
+        th_strong: |change%| for STRONG signals
+        th_normal: |change%| for BUY/SELL
+        th_weak: |change%| for WEAK signals
+        buf_pct: Stop buffer as a fraction of the day's range
+        min_buf: Minimum stop buffer as a fraction of price
+    
+    Returns:
+        kernel(ltp, high, low, prev_close, change_pct,
+               signal, valid, confidence, stop_loss, target1, target2, risk, reward, rr)
+    """
+    @njit
+    def levels(ltp, high, low, prev_close, change_pct,
+               signal, valid, confidence, stop_loss, target1, target2, risk, reward, rr):
+        for i in range(ltp.shape[0]):
+            p = ltp[i]
+            if p <= 0 or prev_close[i] <= 0:
+                signal[i] = 0
+                confidence[i] = 0.0
+                valid[i] = False
+                continue
+            
+            valid[i] = True
+            hi = high[i] if high[i] > 0 else p * 1.01
+            lo = low[i] if low[i] > 0 else p * 0.99
+            
+            # Day range (ATR proxy) with buffer, minimum share of price
+            buf = max((hi - lo) * buf_pct, p * min_buf)
+            chg = change_pct[i]
+            a = abs(chg)
+            
+            if a >= th_weak:
+                strong = a >= th_normal
+                if chg > 0:
+                    # BUY: SL below day's low, targets above LTP
+                    sl = round(lo - buf, 2)
+                    r = p - sl
+                    direction = 1.0
+                    if strong:
+                        signal[i] = STRONG_BUY if a >= th_strong else BUY
+                    else:
+                        signal[i] = WEAK_BUY
+                else:
+                    # SELL: SL above day's high, targets below LTP
+                    sl = round(hi + buf, 2)
+                    r = sl - p
+                    direction = -1.0
+                    if strong:
+                        signal[i] = STRONG_SELL if a >= th_strong else SELL
+                    else:
+                        signal[i] = WEAK_SELL
+                
+                stop_loss[i] = sl
+                risk[i] = r
+                t1 = round(p + direction * r, 2)
+                target1[i] = t1
+                
+                if strong:
+                    # 1:1 and 2:1 risk-reward
+                    confidence[i] = min(60 + a * 5, 80)
+                    target2[i] = round(p + direction * r * 2, 2)
+                    rew = direction * (t1 - p)
+                    reward[i] = rew
+                    rr[i] = round(rew / r, 2) if r > 0 else 0.0
+                else:
+                    confidence[i] = 40 + a * 5
+                    target2[i] = round(p + direction * r * 1.5, 2)
+                    reward[i] = 0.0
+                    rr[i] = 1.0
+            else:
+                # NEUTRAL: still calculate levels for reference
+                signal[i] = 0
+                confidence[i] = 30.0
+                sl = round(lo - buf, 2)
+                stop_loss[i] = sl
+                target1[i] = round(hi, 2)
+                target2[i] = round(hi + (hi - lo) * 0.5, 2)
+                risk[i] = p - sl
+                reward[i] = 0.0
+                rr[i] = 0.0
+    
+    return levels
 
 
 @dataclass
@@ -32,7 +166,7 @@ class ScanResult:
     change_pct: float = 0.0
     
     # Signal info
-    signal: str = "NEUTRAL"
+    signal: ScanSignal = ScanSignal.NEUTRAL
     confidence: float = 0.0
     
     # Technical levels (THE NEW FIELDS)
@@ -50,6 +184,92 @@ class ScanResult:
     error: str = ""
 
 
+# Float columns shared by ScanColumns and ScanResult
+FLOAT_COLUMNS = ('ltp', 'open', 'high', 'low', 'prev_close', 'change', 'change_pct',
+                 'confidence', 'stop_loss', 'target1', 'target2', 'risk', 'reward',
+                 'risk_reward_ratio')
+
+
+@dataclass
+class ScanColumns:
+    """
+    Scan results as parallel column arrays, one row per symbol.
+    
+    ScanResult objects are only built on demand (row/rows) for what the
+    table actually shows.
+    """
+    symbols: List[str]
+    ltp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    prev_close: np.ndarray
+    change: np.ndarray
+    change_pct: np.ndarray
+    confidence: np.ndarray
+    stop_loss: np.ndarray
+    target1: np.ndarray
+    target2: np.ndarray
+    risk: np.ndarray
+    reward: np.ndarray
+    risk_reward_ratio: np.ndarray
+    volume: np.ndarray
+    signal: np.ndarray      # ScanSignal values
+    valid: np.ndarray       # levels computed for this row
+    analysis: List[str]     # extra reasoning from deep analysis
+    error: List[str]
+    scan_time: datetime = field(default_factory=datetime.now)
+    
+    @classmethod
+    def allocate(cls, symbols: List[str]) -> 'ScanColumns':
+        n = len(symbols)
+        return cls(
+            symbols=list(symbols),
+            **{name: np.zeros(n, dtype=np.float64) for name in FLOAT_COLUMNS},
+            volume=np.zeros(n, dtype=np.int64),
+            signal=np.zeros(n, dtype=np.int64),
+            valid=np.zeros(n, dtype=bool),
+            analysis=[""] * n,
+            error=[""] * n
+        )
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def take(self, idx: np.ndarray) -> 'ScanColumns':
+        """New ScanColumns holding only rows `idx`, in that order."""
+        return ScanColumns(
+            symbols=[self.symbols[i] for i in idx],
+            **{name: getattr(self, name)[idx] for name in FLOAT_COLUMNS},
+            volume=self.volume[idx],
+            signal=self.signal[idx],
+            valid=self.valid[idx],
+            analysis=[self.analysis[i] for i in idx],
+            error=[self.error[i] for i in idx],
+            scan_time=self.scan_time
+        )
+    
+    def row(self, i: int) -> ScanResult:
+        """Materialize row `i` as a ScanResult."""
+        signal = int(self.signal[i])
+        analysis = self.analysis[i]
+        if self.valid[i]:
+            analysis = ANALYSIS_FORMATS[signal].format(self.change_pct[i]) + analysis
+        
+        return ScanResult(
+            symbol=self.symbols[i],
+            **{name: float(getattr(self, name)[i]) for name in FLOAT_COLUMNS},
+            volume=int(self.volume[i]),
+            signal=ScanSignal(signal),
+            analysis=analysis,
+            scan_time=self.scan_time,
+            error=self.error[i]
+        )
+    
+    def rows(self, idx) -> List[ScanResult]:
+        return [self.row(i) for i in idx]
+
+
 class MarketScanWorker(QThread):
     """
     Enhanced market scanner with proper technical analysis.
@@ -58,8 +278,8 @@ class MarketScanWorker(QThread):
     # Signals
     scan_started = pyqtSignal(int)
     scan_progress = pyqtSignal(int, int)
-    stock_scanned = pyqtSignal(str, str, float)
-    scan_complete = pyqtSignal(list)
+    batch_scanned = pyqtSignal(list)  # [(symbol, status, ltp), ...] per batch
+    scan_complete = pyqtSignal(object)  # ScanColumns, ranked
     scan_error = pyqtSignal(str)
     
     # Settings
@@ -76,13 +296,23 @@ class MarketScanWorker(QThread):
         'Referer': 'https://www.nseindia.com/'
     }
     
+    # Shared across scans: one event loop + warm keep-alive session for the process
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _session = None  # httpx.AsyncClient (HTTP/2) or aiohttp.ClientSession
+    _cookies = None
+    
     def __init__(self):
         super().__init__()
         self._symbol_loader = get_nse_symbol_loader()
+        self._quote_cache = get_quote_cache()
+        self._levels_kernel = make_levels_kernel()
         self._running = False
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._cookies = None
         self._semaphore: Optional[asyncio.Semaphore] = None
+        self._hist_cache: Dict[str, np.ndarray] = {}
+        self._cols: Optional[ScanColumns] = None
+        
+        # Compile the numba kernels now so the first scanned mover doesn't pay for it
+        kernels.warmup()
     
     def run(self):
         """Execute full market scan."""
@@ -98,12 +328,13 @@ class MarketScanWorker(QThread):
             
             self.scan_started.emit(total)
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # Scans never overlap (button is disabled), so the loop is reused sequentially
+            cls = type(self)
+            if cls._loop is None or cls._loop.is_closed():
+                cls._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(cls._loop)
             
-            results = loop.run_until_complete(self._scan_all(symbols))
-            
-            loop.close()
+            results = cls._loop.run_until_complete(self._scan_all(symbols))
             
             if self._running:
                 self.scan_complete.emit(results)
@@ -113,177 +344,263 @@ class MarketScanWorker(QThread):
         
         self._running = False
     
-    async def _scan_all(self, symbols: List[str]) -> List[ScanResult]:
-        """Async scan all symbols."""
+    async def _scan_all(self, symbols: List[str]) -> ScanColumns:
+        """Async scan all symbols into column arrays."""
         total = len(symbols)
-        results: List[ScanResult] = []
-        scanned = 0
+        cols = ScanColumns.allocate(symbols)
+        self._cols = cols
+        self._hist_cache = {}
         
         self._semaphore = asyncio.Semaphore(self.CONCURRENCY)
         
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ssl=False)
-        timeout = aiohttp.ClientTimeout(total=self.TIMEOUT)
-        self._session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers=self.HEADERS
-        )
+        await self._get_session()
         
-        try:
-            async with self._session.get('https://www.nseindia.com') as resp:
-                self._cookies = resp.cookies
-        except:
-            pass
-        
-        for i in range(0, total, self.BATCH_SIZE):
+        for start in range(0, total, self.BATCH_SIZE):
             if not self._running:
                 break
             
-            batch = symbols[i:i + self.BATCH_SIZE]
-            tasks = [self._fetch_single(s) for s in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+            stop = min(start + self.BATCH_SIZE, total)
+            
+            # Quotes cached this minute skip the NSE round-trip
+            hits = self._quote_cache.get_many(cols.symbols[start:stop])
+            pending = []
+            for i in range(start, stop):
+                quote = hits.get(cols.symbols[i])
+                if quote is None:
+                    pending.append(i)
+                else:
+                    for name, value in zip(QUOTE_FIELDS, quote):
+                        getattr(cols, name)[i] = value
+            
+            if pending:
+                await asyncio.gather(*[self._fetch_single(i) for i in pending], return_exceptions=True)
+                self._quote_cache.put_many(
+                    (cols.symbols[i], *(getattr(cols, name)[i].item() for name in QUOTE_FIELDS))
+                    for i in pending if not cols.error[i] and cols.ltp[i] > 0
+                )
             
-            for r in batch_results:
-                if isinstance(r, ScanResult):
-                    results.append(r)
+            # TECHNICAL ANALYSIS (whole batch at once)
+            self._calculate_levels(start, stop)
             
-            scanned += len(batch)
-            self.scan_progress.emit(scanned, total)
+            # One cross-thread signal per batch instead of one per stock
+            self.batch_scanned.emit([(cols.symbols[i], self._status_for(i), float(cols.ltp[i]))
+                                     for i in range(start, stop)])
             
-            if i + self.BATCH_SIZE < total:
+            self.scan_progress.emit(stop, total)
+            
+            if stop < total:
                 await asyncio.sleep(0.1)
         
-        if self._session and not self._session.closed:
-            await self._session.close()
+        # Optimization: Only deep analyze if significant movement (> 1%),
+        # off one batched history download for all movers
+        movers = np.flatnonzero(cols.valid & (np.abs(cols.change_pct) >= 1.0))
+        if self._running and len(movers):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._prefetch_history, [cols.symbols[i] for i in movers])
+            self._deep_technical_analysis(movers)
+        
+        # Filter, then actionable first, confidence, |R:R| - all descending
+        idx = np.flatnonzero(cols.ltp > 0)
+        order = np.lexsort((
+            np.abs(cols.risk_reward_ratio[idx]),
+            cols.confidence[idx],
+            cols.signal[idx] != ScanSignal.NEUTRAL
+        ))[::-1]
+        
+        return cols.take(idx[order])
+    
+    @classmethod
+    async def _get_session(cls):
+        """Return the shared session, creating it (and NSE cookies) on first use."""
+        if httpx is not None:
+            if cls._session is None or cls._session.is_closed:
+                # One HTTP/2 connection multiplexes all concurrent quote requests
+                cls._session = httpx.AsyncClient(
+                    http2=True,
+                    headers=cls.HEADERS,
+                    timeout=cls.TIMEOUT,
+                    verify=False,
+                    limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+                )
+                cls._cookies = None
+        elif cls._session is None or cls._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ssl=False,
+                keepalive_timeout=300,
+                enable_cleanup_closed=True
+            )
+            timeout = aiohttp.ClientTimeout(total=cls.TIMEOUT)
+            cls._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers=cls.HEADERS
+            )
+            cls._cookies = None
         
-        # Filter and sort
-        valid_results = [r for r in results if r.ltp > 0]
-        valid_results.sort(key=lambda x: (x.signal != "NEUTRAL", x.confidence, abs(x.risk_reward_ratio)), reverse=True)
+        if cls._cookies is None:
+            await cls._refresh_cookies()
         
-        return valid_results
+        return cls._session
+    
+    @classmethod
+    async def _get(cls, url: str, cookies=None):
+        """GET through whichever client is active; returns (status, body, cookies)."""
+        if httpx is not None:
+            resp = await cls._session.get(url)
+            return resp.status_code, resp.content, resp.cookies
+        
+        async with cls._session.get(url, cookies=cookies) as resp:
+            body = await resp.read() if resp.status == 200 else b""
+            return resp.status, body, resp.cookies
+    
+    @classmethod
+    async def _refresh_cookies(cls):
+        """Fetch fresh NSE cookies (first use, or after a 401/403)."""
+        try:
+            _, _, cls._cookies = await cls._get('https://www.nseindia.com')
+        except Exception:
+            pass
     
-    async def _fetch_single(self, symbol: str) -> ScanResult:
-        """Fetch data for single symbol with technical analysis."""
+    async def _fetch_single(self, i: int):
+        """Fetch quote for row `i` and write it into the scan columns."""
         async with self._semaphore:
-            result = ScanResult(symbol=symbol)
-            clean_symbol = symbol.replace('.NS', '')
+            cols = self._cols
+            clean_symbol = cols.symbols[i].replace('.NS', '')
             url = self.NSE_QUOTE_URL.format(clean_symbol)
             
+            cookies = self._cookies
+            error = ""
+            
             try:
-                async with self._session.get(url, cookies=self._cookies) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        price_info = data.get('priceInfo', {})
-                        
-                        result.ltp = price_info.get('lastPrice', 0) or 0
-                        result.open = price_info.get('open', 0) or 0
-                        result.prev_close = price_info.get('previousClose', 0) or 0
-                        result.change = price_info.get('change', 0) or 0
-                        result.change_pct = price_info.get('pChange', 0) or 0
-                        
-                        intra = price_info.get('intraDayHighLow', {})
-                        result.high = intra.get('max', 0) or 0
-                        result.low = intra.get('min', 0) or 0
-                        
-                        sec_info = data.get('securityWiseDP', {})
-                        result.volume = sec_info.get('quantityTraded', 0) or 0
-                        
-                        # TECHNICAL ANALYSIS
-                        # Optimization: Only deep analyze if significant movement (> 1%)
-                        if abs(result.change_pct) >= 1.0:
-                            self._deep_technical_analysis(result)
-                        else:
-                            self._calculate_levels(result)
-                        
-                        status = f"✓ {result.signal}" if result.ltp > 0 else "✗ No data"
-                        self.stock_scanned.emit(symbol, status, result.ltp)
-                        
-                        return result
+                status, body, _ = await self._get(url, cookies)
+                if status == 200:
+                    data = json_loads(body)
+                    pi = data.get('priceInfo') or {}
+                    intra = pi.get('intraDayHighLow') or {}
+                    sec_info = data.get('securityWiseDP') or {}
+                    get = pi.get
                     
-                    elif resp.status == 429:
-                        result.error = "rate_limited"
-                        self.stock_scanned.emit(symbol, "⏳ Rate limited", 0)
-                    else:
-                        result.error = f"HTTP {resp.status}"
-                        self.stock_scanned.emit(symbol, f"✗ HTTP {resp.status}", 0)
+                    cols.ltp[i] = get('lastPrice') or 0
+                    cols.open[i] = get('open') or 0
+                    cols.prev_close[i] = get('previousClose') or 0
+                    cols.change[i] = get('change') or 0
+                    cols.change_pct[i] = get('pChange') or 0
+                    
+                    cols.high[i] = intra.get('max') or 0
+                    cols.low[i] = intra.get('min') or 0
+                    
+                    cols.volume[i] = sec_info.get('quantityTraded') or 0
+                    return
                 
-            except asyncio.TimeoutError:
-                result.error = "timeout"
-                self.stock_scanned.emit(symbol, "⏳ Timeout", 0)
+                elif status == 429:
+                    error = "rate_limited"
+                else:
+                    error = f"HTTP {status}"
+                
+            except TIMEOUT_ERRORS:
+                error = "timeout"
             except Exception as e:
-                result.error = str(e)[:30]
-                self.stock_scanned.emit(symbol, "✗ Error", 0)
+                error = str(e)[:30]
+            
+            cols.error[i] = error
             
-            return result
+            # Cookies expired: refresh once for everyone still using the old ones
+            if error in ("HTTP 401", "HTTP 403") and self._cookies is cookies:
+                await self._refresh_cookies()
     
-    def _deep_technical_analysis(self, result: ScanResult):
-        """
-        Perform deep technical analysis with historical data (RSI, EMA).
-        Warning: This is slower, so only use for active stocks.
-        """
+    def _status_for(self, i: int) -> str:
+        """Scan-log status text for row `i`."""
+        error = self._cols.error[i]
+        if not error:
+            if self._cols.ltp[i] > 0:
+                return f"✓ {ScanSignal(int(self._cols.signal[i])).display_name}"
+            return "✗ No data"
+        if error == "rate_limited":
+            return "⏳ Rate limited"
+        if error == "timeout":
+            return "⏳ Timeout"
+        if error.startswith("HTTP "):
+            return f"✗ {error}"
+        return "✗ Error"
+    
+    def _prefetch_history(self, symbols: List[str]):
+        """Download 3mo daily closes for all symbols in one batched request."""
         import yfinance as yf
-        import pandas as pd
-        import numpy as np
         
         try:
-            # Fetch history (enough for EMA 50)
-            ticker = yf.Ticker(result.symbol)
-            hist = ticker.history(period="3mo", interval="1d")
-            
-            if hist.empty or len(hist) < 50:
-                self._calculate_levels(result)
-                return
-            
-            closes = hist['Close'].values
-            
-            # --- RSI (14) ---
-            delta = np.diff(closes)
-            gain = (delta * (delta > 0)).copy()
-            loss = (-delta * (delta < 0)).copy()
-            
-            avg_gain = np.mean(gain[:14])
-            avg_loss = np.mean(loss[:14])
-            
-            # Simple RSI approximation for speed
-            for i in range(14, len(delta)):
-                avg_gain = (avg_gain * 13 + gain[i]) / 14
-                avg_loss = (avg_loss * 13 + loss[i]) / 14
-                
-            rs = avg_gain / avg_loss if avg_loss != 0 else 0
-            rsi = 100 - (100 / (1 + rs))
-            
-            # --- EMA (50) ---
-            ema50 = pd.Series(closes).ewm(span=50, adjust=False).mean().iloc[-1]
-            
+            data = yf.download(symbols, period="3mo", interval="1d",
+                               group_by='ticker', threads=True, progress=False,
+                               session=get_yf_session())
+        except Exception:
+            return
+        
+        if data is None or data.empty:
+            return
+        
+        for symbol in symbols:
+            try:
+                closes = data[symbol]['Close'].dropna()
+            except KeyError:
+                continue
+            self._hist_cache[symbol] = closes.to_numpy(dtype=np.float64)
+    
+    def _deep_technical_analysis(self, movers: np.ndarray):
+        """
+        Refine signal confidence for the mover rows with historical data (RSI, EMA).
+        Expects levels already set by _calculate_levels and history in the
+        prefetch cache; symbols without cached history keep their basic levels.
+        """
+        cols = self._cols
+        
+        rows = []
+        histories = []
+        for i in movers:
+            closes = self._hist_cache.get(cols.symbols[i])
+            if closes is not None and len(closes) >= 50:
+                rows.append(i)
+                histories.append(closes)
+        if not rows:
+            return
+        
+        # Optimization: stack every mover's history into one padded matrix and
+        # compute RSI(14)/EMA(50) for all of them in a single parallel kernel
+        lengths = np.fromiter((len(h) for h in histories), dtype=np.int64, count=len(histories))
+        close2d = np.zeros((len(histories), lengths.max()), dtype=np.float64)
+        for r, h in enumerate(histories):
+            close2d[r, :len(h)] = h
+        
+        rsi_vals = np.empty(len(rows))
+        ema_vals = np.empty(len(rows))
+        kernels.scan_rsi_ema(close2d, lengths, rsi_vals, ema_vals, 14, 50)
+        
+        for i, rsi, ema50 in zip(rows, rsi_vals, ema_vals):
             # Update Signal Reasoning
             rsi_signal = ""
             if rsi < 30: rsi_signal = "Oversold (RSI < 30)"
             elif rsi > 70: rsi_signal = "Overbought (RSI > 70)"
             else: rsi_signal = f"RSI Neutral ({rsi:.0f})"
             
-            trend = "Bullish" if result.ltp > ema50 else "Bearish"
-            
-            # Recalculate Levels with Tech Confirmation
-            self._calculate_levels(result)
+            ltp = cols.ltp[i]
+            signal = int(cols.signal[i])
+            confidence = cols.confidence[i]
+            trend = "Bullish" if ltp > ema50 else "Bearish"
             
             # Boost confidence if indicators align
-            if "BUY" in result.signal:
-                if result.ltp > ema50: result.confidence += 10
-                if rsi < 40: result.confidence += 10  # Buying dip
-                result.analysis = f"{result.analysis} | {trend} > EMA50. {rsi_signal}."
+            if signal & ScanSignal.BUY:
+                if ltp > ema50: confidence += 10
+                if rsi < 40: confidence += 10  # Buying dip
+                cols.analysis[i] = f" | {trend} > EMA50. {rsi_signal}."
                 
-            elif "SELL" in result.signal:
-                if result.ltp < ema50: result.confidence += 10
-                if rsi > 60: result.confidence += 10  # Selling top
-                result.analysis = f"{result.analysis} | {trend} < EMA50. {rsi_signal}."
+            elif signal & ScanSignal.SELL:
+                if ltp < ema50: confidence += 10
+                if rsi > 60: confidence += 10  # Selling top
+                cols.analysis[i] = f" | {trend} < EMA50. {rsi_signal}."
                 
-            result.confidence = min(result.confidence, 100)
-            
-        except Exception:
-            # Fallback to basic levels if yfinance fails
-            self._calculate_levels(result)
+            cols.confidence[i] = min(confidence, 100)
 
-    def _calculate_levels(self, result: ScanResult):
+    def _calculate_levels(self, start: int, stop: int):
         """
         Calculate Stop Loss, Target 1, Target 2 with proper analysis.
         
@@ -291,109 +608,20 @@ class MarketScanWorker(QThread):
         - For BUY: SL = Day Low - buffer, Targets above LTP
         - For SELL: SL = Day High + buffer, Targets below LTP
         - Risk-Reward ratio calculated
-        """
-        if result.ltp <= 0 or result.prev_close <= 0:
-            result.signal = "NEUTRAL"
-            result.confidence = 0
-            return
-        
-        ltp = result.ltp
-        high = result.high if result.high > 0 else ltp * 1.01
-        low = result.low if result.low > 0 else ltp * 0.99
-        change_pct = result.change_pct
         
-        # Calculate day range (ATR proxy)
-        day_range = high - low
-        buffer = day_range * 0.2  # 20% buffer beyond day range
-        
-        # Minimum buffer of 0.5% of price
-        min_buffer = ltp * 0.005
-        buffer = max(buffer, min_buffer)
-        
-        # BUY SIGNAL ANALYSIS
-        if change_pct >= 2.0:
-            result.signal = "STRONG BUY" if change_pct >= 4.0 else "BUY"
-            result.confidence = min(60 + change_pct * 5, 80) # Cap base confidence, let Deep Analysis boost it
-            
-            # Stop Loss: Below day's low with buffer
-            result.stop_loss = round(low - buffer, 2)
-            
-            # Risk calculation
-            result.risk = ltp - result.stop_loss
-            
-            # Target 1: 1:1 risk-reward
-            result.target1 = round(ltp + result.risk, 2)
-            
-            # Target 2: 2:1 risk-reward
-            result.target2 = round(ltp + (result.risk * 2), 2)
-            
-            # Risk-Reward Ratio
-            result.reward = result.target1 - ltp
-            result.risk_reward_ratio = round(result.reward / result.risk, 2) if result.risk > 0 else 0
-            
-            result.analysis = f"Momentum +{change_pct:.1f}%"
-        
-        # SELL SIGNAL ANALYSIS
-        elif change_pct <= -2.0:
-            result.signal = "STRONG SELL" if change_pct <= -4.0 else "SELL"
-            result.confidence = min(60 + abs(change_pct) * 5, 80)
-            
-            # Stop Loss: Above day's high with buffer
-            result.stop_loss = round(high + buffer, 2)
-            
-            # Risk calculation
-            result.risk = result.stop_loss - ltp
-            
-            # Target 1: 1:1 risk-reward (below LTP for sell)
-            result.target1 = round(ltp - result.risk, 2)
-            
-            # Target 2: 2:1 risk-reward
-            result.target2 = round(ltp - (result.risk * 2), 2)
-            
-            # Risk-Reward Ratio
-            result.reward = ltp - result.target1
-            result.risk_reward_ratio = round(result.reward / result.risk, 2) if result.risk > 0 else 0
-            
-            result.analysis = f"Momentum {change_pct:.1f}%"
-        
-        # WEAK SIGNALS
-        elif change_pct >= 1.0:
-            result.signal = "WEAK BUY"
-            result.confidence = 40 + change_pct * 5
-            
-            result.stop_loss = round(low - buffer, 2)
-            result.risk = ltp - result.stop_loss
-            result.target1 = round(ltp + result.risk, 2)
-            result.target2 = round(ltp + (result.risk * 1.5), 2)
-            result.risk_reward_ratio = 1.0
-            
-            result.analysis = f"Mild Bullish +{change_pct:.1f}%"
-        
-        elif change_pct <= -1.0:
-            result.signal = "WEAK SELL"
-            result.confidence = 40 + abs(change_pct) * 5
-            
-            result.stop_loss = round(high + buffer, 2)
-            result.risk = result.stop_loss - ltp
-            result.target1 = round(ltp - result.risk, 2)
-            result.target2 = round(ltp - (result.risk * 1.5), 2)
-            result.risk_reward_ratio = 1.0
-            
-            result.analysis = f"Mild Bearish {change_pct:.1f}%"
+        Runs the compiled levels kernel over rows [start, stop) of the scan
+        columns, writing results in place.
+        """
+        cols = self._cols
+        rows = slice(start, stop)
         
-        # NEUTRAL
-        else:
-            result.signal = "NEUTRAL"
-            result.confidence = 30
-            
-            # Still calculate levels for reference
-            result.stop_loss = round(low - buffer, 2)
-            result.target1 = round(high, 2)
-            result.target2 = round(high + (high - low) * 0.5, 2)
-            result.risk = ltp - result.stop_loss
-            result.risk_reward_ratio = 0
-            
-            result.analysis = "Consolidating"
+        self._levels_kernel(
+            cols.ltp[rows], cols.high[rows], cols.low[rows],
+            cols.prev_close[rows], cols.change_pct[rows],
+            cols.signal[rows], cols.valid[rows], cols.confidence[rows],
+            cols.stop_loss[rows], cols.target1[rows], cols.target2[rows],
+            cols.risk[rows], cols.reward[rows], cols.risk_reward_ratio[rows]
+        )
     
     def stop(self):
         """Stop the worker."""
@@ -1,138 +1,317 @@
 """Background workers for zero-lag GUI updates - Using yfinance for reliable prices."""
 
+import asyncio
 import time
+import threading
+import aiohttp
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import yfinance as yf
-from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from datetime import datetime, time as dtime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
 
+from core.logger import get_logger
+from data.http_session import get_yf_session
 from data.snapshot_store import get_snapshot_store, StockSnapshot
 
 
-@dataclass 
-class QuoteData:
-    """Simple quote data."""
-    symbol: str
-    ltp: float = 0.0
-    open: float = 0.0
-    high: float = 0.0
-    low: float = 0.0
-    prev_close: float = 0.0
-    change: float = 0.0
-    change_pct: float = 0.0
-    volume: int = 0
+# Yahoo batch quote endpoint: one request per QUOTE_CHUNK symbols
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+QUOTE_CHUNK = 20
+
+# The quote endpoint rejects requests without a session cookie + crumb
+# (401 "Invalid Crumb"); both come from these two URLs
+YAHOO_COOKIE_URL = "https://fc.yahoo.com"
+YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+# After a failed crumb fetch, go straight to the fallback for this long
+CRUMB_RETRY = 300
+
+# prev_close doesn't move intraday - refetch it at most this often
+PREV_CLOSE_TTL = 600
+
+# NSE cash session (IST); polling slows down outside it
+IST = timezone(timedelta(hours=5, minutes=30))
+MARKET_OPEN = dtime(9, 15)
+MARKET_CLOSE = dtime(15, 30)
+OFF_HOURS_INTERVAL = 60.0
+CLOSED_FETCH_GRACE = 30 * 60  # keep fetching this long after close (closing prints)
+
+QUOTE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json'
+}
 
 
 class PriceWorker(QThread):
     """
     Background worker for continuous price updates.
-    Uses yfinance for reliable data fetching.
+    
+    Runs one asyncio loop: batched quote chunks are fetched concurrently
+    over a single aiohttp session, and only the yfinance fallback (blocking)
+    goes to the thread pool.
     """
     
     prices_updated = pyqtSignal(dict)  # {symbol: StockSnapshot}
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, symbols: List[str] = None, interval_ms: int = 3000):
+    def __init__(self, symbols: Sequence[str] = (), interval_ms: int = 3000,
+                 holidays: Optional[Iterable] = None):
         super().__init__()
-        self._symbols = symbols or []
+        # Immutable and swapped whole: readers iterate a consistent snapshot
+        self._symbols: Tuple[str, ...] = tuple(symbols or ())
         self._interval = interval_ms / 1000.0
         self._running = True
         self._store = get_snapshot_store()
+        self._pool = ThreadPoolExecutor(max_workers=8)
+        self._prev_close_cache: Dict[str, Tuple[float, float]] = {}  # symbol -> (value, expiry)
+        self._holidays = set(holidays or ())  # NSE trading holidays (date objects)
+        self._closed_since: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._auth: Optional[Tuple[str, str]] = None  # (crumb, Cookie header)
+        self._auth_retry_at = 0.0
+        self._logged_statuses = set()  # quote HTTP statuses already logged
     
-    def set_symbols(self, symbols: List[str]):
+    def set_symbols(self, symbols: Sequence[str]):
         """Update the symbols to track."""
-        self._symbols = symbols.copy()
+        self._symbols = tuple(symbols)
     
     def add_symbol(self, symbol: str):
         """Add a symbol to track."""
         if symbol not in self._symbols:
-            self._symbols.append(symbol)
+            self._symbols = self._symbols + (symbol,)
+            self.invalidate(symbol)
+    
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop the cached prev_close for a symbol (all symbols if None)."""
+        if symbol is None:
+            self._prev_close_cache.clear()
+        else:
+            self._prev_close_cache.pop(symbol, None)
+    
+    def _get_prev_close(self, symbol: str) -> Optional[float]:
+        """Cached prev_close, or None if missing/expired."""
+        entry = self._prev_close_cache.get(symbol)
+        if entry and time.monotonic() < entry[1]:
+            return entry[0]
+        return None
+    
+    def _set_prev_close(self, symbol: str, value: float):
+        if value:
+            self._prev_close_cache[symbol] = (value, time.monotonic() + PREV_CLOSE_TTL)
+    
+    def _market_open(self, now: Optional[datetime] = None) -> bool:
+        """True during the NSE session (Mon-Fri 09:15-15:30 IST, non-holiday)."""
+        now = now or datetime.now(IST)
+        if now.weekday() >= 5 or now.date() in self._holidays:
+            return False
+        return MARKET_OPEN <= now.time() <= MARKET_CLOSE
     
     def run(self):
         """Main worker loop - fetch prices continuously."""
-        while self._running:
-            try:
-                if self._symbols:
-                    snapshots = self._fetch_prices_batch()
-                    if snapshots:
-                        self.prices_updated.emit(snapshots)
-                
-            except Exception as e:
-                self.error_occurred.emit(str(e))
-            
-            time.sleep(self._interval)
-    
-    def _fetch_prices_batch(self) -> Dict[str, StockSnapshot]:
-        """Fetch prices for all symbols using yfinance."""
-        snapshots = {}
-        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
         try:
-            # Batch fetch with yfinance
-            symbols_str = " ".join(self._symbols)
-            tickers = yf.Tickers(symbols_str)
-            
-            for symbol in self._symbols:
+            loop.run_until_complete(self._price_loop())
+        finally:
+            self._loop = None
+            loop.close()
+    
+    async def _price_loop(self):
+        self._wake = asyncio.Event()
+        timeout = aiohttp.ClientTimeout(total=5)
+        async with aiohttp.ClientSession(headers=QUOTE_HEADERS, timeout=timeout) as session:
+            while self._running:
+                is_open = self._market_open()
+                if is_open:
+                    if self._closed_since is not None:
+                        # New session: yesterday's close is today's prev_close
+                        self.invalidate()
+                    self._closed_since = None
+                elif self._closed_since is None:
+                    self._closed_since = time.monotonic()
+                
+                # Long after the close the store already holds the last prices
+                stale_ok = not is_open and time.monotonic() - self._closed_since > CLOSED_FETCH_GRACE
+                
                 try:
-                    ticker = tickers.tickers.get(symbol)
-                    if ticker:
-                        info = ticker.fast_info
-                        
-                        ltp = info.last_price if hasattr(info, 'last_price') else 0
-                        prev_close = info.previous_close if hasattr(info, 'previous_close') else 0
-                        
-                        if ltp and ltp > 0:
-                            change = ltp - prev_close if prev_close else 0
-                            change_pct = (change / prev_close * 100) if prev_close else 0
-                            
-                            # Update store
-                            self._store.update(
-                                symbol,
-                                ltp=ltp,
-                                prev_close=prev_close,
-                                change=change,
-                                change_pct=change_pct
-                            )
-                            
-                            snap = self._store.get(symbol)
-                            if snap:
-                                snapshots[symbol] = snap
-                except:
-                    pass
+                    if self._symbols and not stale_ok:
+                        snapshots = await self._fetch_prices_batch(session)
+                        if snapshots:
+                            self.prices_updated.emit(snapshots)
                     
-        except Exception:
-            # Fallback: fetch one by one
-            for symbol in self._symbols:
+                except Exception as e:
+                    self.error_occurred.emit(str(e))
+                
+                # Sleep until the next tick, or until stop() wakes us
                 try:
-                    ticker = yf.Ticker(symbol)
-                    info = ticker.fast_info
-                    
-                    ltp = info.last_price if hasattr(info, 'last_price') else 0
-                    prev_close = info.previous_close if hasattr(info, 'previous_close') else 0
-                    
-                    if ltp and ltp > 0:
-                        change = ltp - prev_close if prev_close else 0
-                        change_pct = (change / prev_close * 100) if prev_close else 0
-                        
-                        self._store.update(
-                            symbol,
-                            ltp=ltp,
-                            prev_close=prev_close,
-                            change=change,
-                            change_pct=change_pct
-                        )
-                        
-                        snap = self._store.get(symbol)
-                        if snap:
-                            snapshots[symbol] = snap
-                except:
+                    await asyncio.wait_for(
+                        self._wake.wait(),
+                        timeout=self._interval if is_open else OFF_HOURS_INTERVAL
+                    )
+                except asyncio.TimeoutError:
                     pass
+    
+    async def _fetch_prices_batch(self, session: aiohttp.ClientSession) -> Dict[str, StockSnapshot]:
+        """Fetch prices for all symbols via the batched quote endpoint."""
+        symbols = self._symbols
+        
+        quotes = await self._fetch_prices_http(session, symbols)
+        
+        # yfinance only for symbols missing from the batch response (in parallel)
+        missing = [s for s in symbols if s not in quotes]
+        if missing:
+            quotes.update(await self._fetch_fallback(missing))
         
-        return snapshots
+        # Columnar write into the store: no per-symbol objects on the hot path
+        valid = [(s, q) for s, q in quotes.items() if q[0] and q[0] > 0]
+        if not valid:
+            return {}
+        
+        ids = self._store.ids([s for s, _ in valid])
+        ltp = np.fromiter((q[0] for _, q in valid), dtype=np.float64, count=len(valid))
+        prev_close = np.fromiter((q[1] or 0.0 for _, q in valid), dtype=np.float64, count=len(valid))
+        self._store.bulk_update(ids, ltp, prev_close)
+        
+        # Emit only the symbols whose price actually moved
+        return self._store.get_many(self._store.take_dirty())
+    
+    def _fetch_auth(self) -> Optional[Tuple[str, str]]:
+        """(crumb, Cookie header) from the shared yfinance session, or None.
+        
+        Blocking; runs on the pool. The cookie lands in the shared session,
+        so yfinance's own calls reuse it too.
+        """
+        http = get_yf_session()
+        try:
+            # fc.yahoo.com answers 404 but sets the session cookie
+            http.get(YAHOO_COOKIE_URL, timeout=5)
+            resp = http.get(YAHOO_CRUMB_URL, timeout=5)
+            crumb = resp.text.strip()
+        except Exception as e:
+            get_logger().warning(f"Yahoo crumb fetch failed: {e}")
+            return None
+        if resp.status_code != 200 or not crumb or '<' in crumb:
+            get_logger().warning(f"Yahoo crumb fetch failed: HTTP {resp.status_code}")
+            return None
+        cookie = "; ".join(f"{k}={v}" for k, v in http.cookies.items())
+        return crumb, cookie
+    
+    async def _get_auth(self) -> Optional[Tuple[str, str]]:
+        """Cached crumb/cookie; refetched after a rejection, with backoff on failure."""
+        if self._auth is None and time.monotonic() >= self._auth_retry_at:
+            loop = asyncio.get_running_loop()
+            self._auth = await loop.run_in_executor(self._pool, self._fetch_auth)
+            if self._auth is None:
+                self._auth_retry_at = time.monotonic() + CRUMB_RETRY
+        return self._auth
+    
+    def _log_status(self, status: int):
+        """Log each non-200 quote status once (repeats would flood every tick)."""
+        if status not in self._logged_statuses:
+            self._logged_statuses.add(status)
+            get_logger().warning(f"Yahoo quote endpoint returned HTTP {status}; "
+                                 f"falling back to per-symbol fetches")
+    
+    async def _fetch_prices_http(self, session: aiohttp.ClientSession,
+                                 symbols: Sequence[str]) -> Dict[str, Tuple[float, float]]:
+        """Batched quotes as {symbol: (ltp, prev_close)}, QUOTE_CHUNK symbols per request."""
+        auth = await self._get_auth()
+        if auth is None:
+            return {}  # no crumb: every request would be a guaranteed 401
+        
+        it = iter(symbols)
+        chunks = []
+        while True:
+            chunk = list(islice(it, QUOTE_CHUNK))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        
+        quotes = {}
+        for part in await asyncio.gather(*(self._fetch_chunk(session, c, auth) for c in chunks)):
+            quotes.update(part)
+        return quotes
+    
+    async def _fetch_chunk(self, session: aiohttp.ClientSession, chunk: List[str],
+                           auth: Tuple[str, str]) -> Dict[str, Tuple[float, float]]:
+        quotes = {}
+        
+        # Only ask for the LTP once every prev_close in the chunk is cached
+        cached = {s: self._get_prev_close(s) for s in chunk}
+        warm = all(v is not None for v in cached.values())
+        fields = 'regularMarketPrice' if warm else 'regularMarketPrice,regularMarketPreviousClose'
+        
+        crumb, cookie = auth
+        try:
+            async with session.get(
+                YAHOO_QUOTE_URL,
+                params={'symbols': ",".join(chunk), 'fields': fields, 'crumb': crumb},
+                headers={'Cookie': cookie}
+            ) as resp:
+                if resp.status != 200:
+                    self._log_status(resp.status)
+                    if resp.status in (401, 403):
+                        self._auth = None  # crumb expired: fetch a new one next tick
+                    return quotes
+                data = await resp.json(content_type=None)
+            results = (data.get('quoteResponse') or {}).get('result') or []
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return quotes
+        
+        for q in results:
+            symbol = q.get('symbol')
+            ltp = q.get('regularMarketPrice')
+            if not (symbol and ltp):
+                continue
+            prev_close = q.get('regularMarketPreviousClose')
+            if prev_close:
+                self._set_prev_close(symbol, prev_close)
+            else:
+                prev_close = cached.get(symbol) or self._get_prev_close(symbol) or 0
+            quotes[symbol] = (ltp, prev_close)
+        
+        return quotes
+    
+    async def _fetch_fallback(self, symbols: List[str]) -> Dict[str, Tuple[float, float]]:
+        """Per-symbol yfinance fetches on the pool, bounded by the poll interval."""
+        loop = asyncio.get_running_loop()
+        futures = {loop.run_in_executor(self._pool, self._fetch_one, s): s for s in symbols}
+        
+        done, pending = await asyncio.wait(futures, timeout=self._interval * 0.8)
+        # Slow symbols are picked up on the next tick
+        for fut in pending:
+            fut.cancel()
+        
+        quotes = {}
+        for fut in done:
+            if fut.exception() is None and fut.result():
+                quotes[futures[fut]] = fut.result()
+        return quotes
+    
+    def _fetch_one(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Single-symbol (ltp, prev_close) via yfinance."""
+        try:
+            info = yf.Ticker(symbol, session=get_yf_session()).fast_info
+            ltp = info.last_price if hasattr(info, 'last_price') else 0
+            prev_close = self._get_prev_close(symbol)
+            if prev_close is None:
+                prev_close = info.previous_close if hasattr(info, 'previous_close') else 0
+                self._set_prev_close(symbol, prev_close)
+            return ltp, prev_close
+        except Exception:
+            return None
     
     def stop(self):
         """Stop the worker."""
         self._running = False
+        loop = self._loop
+        if loop is not None and self._wake is not None:
+            loop.call_soon_threadsafe(self._wake.set)
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
 
 class SignalWorker(QThread):
@@ -146,12 +325,17 @@ class SignalWorker(QThread):
         self._engine = engine
         self._running = True
         self._scan_requested = False
-        self._symbols_to_scan: List[str] = []
+        self._symbols_to_scan: Tuple[str, ...] = ()
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._wakeup = threading.Event()
     
-    def request_scan(self, symbols: List[str]):
+    def request_scan(self, symbols: Sequence[str]):
         """Request a market scan."""
-        self._symbols_to_scan = symbols.copy()
+        self._symbols_to_scan = tuple(symbols)
         self._scan_requested = True
+        self._wakeup.set()
     
     def run(self):
         """Main worker loop."""
@@ -160,24 +344,44 @@ class SignalWorker(QThread):
                 self._scan_requested = False
                 signals = []
                 
-                for symbol in self._symbols_to_scan:
+                futures = [self._submit(symbol) for symbol in self._symbols_to_scan]
+                for fut in as_completed(futures):
                     try:
-                        result = self._engine.evaluate_trade_opportunity(symbol)
-                        if result.get('ACTION') == 'EXECUTE_TRADE':
-                            signals.append(result)
-                    except:
-                        pass
+                        result = fut.result()
+                    except Exception:
+                        continue
+                    if result.get('ACTION') == 'EXECUTE_TRADE':
+                        signals.append(result)
                 
                 if signals:
                     self.signals_found.emit(signals)
                 
                 self.scan_complete.emit()
             
-            time.sleep(0.1)
+            # Sleep until request_scan/stop instead of polling
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+    
+    def _submit(self, symbol: str) -> Future:
+        """Evaluate a symbol, sharing the future with any in-flight evaluation of it."""
+        with self._inflight_lock:
+            fut = self._inflight.get(symbol)
+            if fut is None:
+                fut = self._pool.submit(self._engine.evaluate_trade_opportunity, symbol)
+                self._inflight[symbol] = fut
+                fut.add_done_callback(lambda f, s=symbol: self._release(s, f))
+            return fut
+    
+    def _release(self, symbol: str, fut: Future):
+        with self._inflight_lock:
+            if self._inflight.get(symbol) is fut:
+                del self._inflight[symbol]
     
     def stop(self):
         """Stop the worker."""
         self._running = False
+        self._wakeup.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
 
 class DataBridge(QObject):
@@ -202,9 +406,13 @@ class DataBridge(QObject):
         self._price_worker.start()
     
     def _on_prices(self, snapshots: Dict[str, StockSnapshot]):
-        """Handle price updates from worker."""
+        """Handle price updates from worker (only symbols that changed)."""
+        engine = self._signal_worker._engine if self._signal_worker else None
         for symbol, snap in snapshots.items():
             self.price_update.emit(symbol, snap.ltp, snap.change_pct)
+            # Re-evaluate setups whose levels the price just crossed
+            if engine is not None and hasattr(engine, 'invalidate_on_price'):
+                engine.invalidate_on_price(symbol, snap.ltp)
     
     def start_signal_scanning(self, engine):
         """Start background signal scanner."""
@@ -1,13 +1,31 @@
 """Indicators package initialization."""
 
-from indicators.trend import TrendIndicators
-from indicators.momentum import MomentumIndicators
-from indicators.volatility import VolatilityIndicators
-from indicators.structure import StructureAnalysis
+import importlib
+
+# Indicator classes are loaded on first access (PEP 562) so importing the
+# package - or just indicators._kernels - doesn't pull in pandas at startup
+_LAZY = {
+    'TrendIndicators': 'indicators.trend',
+    'MomentumIndicators': 'indicators.momentum',
+    'VolatilityIndicators': 'indicators.volatility',
+    'StructureAnalysis': 'indicators.structure',
+    'apply_indicators': 'indicators.columns',
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'indicators' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'TrendIndicators',
     'MomentumIndicators',
     'VolatilityIndicators',
-    'StructureAnalysis'
+    'StructureAnalysis',
+    'apply_indicators'
 ]
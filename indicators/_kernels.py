@@ -0,0 +1,602 @@
+"""
+Array kernels shared by the indicators, scanners and chart views.
+
+Everything here works on raw ndarrays so hot paths can skip the pandas
+Series/Block overhead. TA-Lib is used when installed, otherwise a NumPy
+implementation with the same output layout is used. Scalar loops are
+compiled with numba when it is available and run as plain Python otherwise.
+
+Indicator inputs are stored as DTYPE (float32): NSE prices carry ~5
+significant digits, and halving the bytes per bar halves the memory traffic
+of the bandwidth-bound passes. The kernels still accumulate in float64.
+"""
+
+import numpy as np
+
+# Storage dtype for indicator inputs/outputs
+DTYPE = np.float32
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+try:
+    from numba import njit, prange
+    NUMBA = True
+except ImportError:
+    NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+# Fallback for chart_series when numba is missing: the EMA/Wilder
+# recursions are first-order IIR filters, which lfilter runs in C
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI over a close array.
+
+    Args:
+        close: Close prices
+        period: RSI period
+
+    Returns:
+        RSI array (DTYPE), NaN for the first `period` values
+    """
+    if talib is not None:
+        # TA-Lib only takes doubles
+        return talib.RSI(np.asarray(close, dtype=np.float64), timeperiod=period).astype(DTYPE)
+
+    close = np.asarray(close, dtype=DTYPE)
+    out = np.empty(close.shape[0], dtype=DTYPE)
+    rsi_wilder(close, period, out)
+    return out
+
+
+@njit(cache=True)
+def chart_overlay(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                  rsi_period: int = 14, ema_period: int = 50, atr_period: int = 14,
+                  vol_window: int = 5):
+    """
+    Last RSI, EMA and ATR in one pass over the bars.
+
+    Args:
+        closes, highs, lows: Bar columns (float64)
+        rsi_period: Wilder RSI period
+        ema_period: EMA span
+        atr_period: Wilder ATR period (TA-Lib definition)
+        vol_window: Bars in the high-low range used when history is too
+            short for the ATR
+
+    Returns:
+        Tuple of (rsi, ema, atr); RSI is 50 and EMA is the last close
+        when there aren't enough bars
+    """
+    n = closes.shape[0]
+    alpha = 2.0 / (ema_period + 1)
+    ema = closes[0]
+    avg_gain = 0.0
+    avg_loss = 0.0
+    atr = 0.0
+
+    for i in range(1, n):
+        c = closes[i]
+        prev = closes[i - 1]
+        ema = alpha * c + (1.0 - alpha) * ema
+
+        d = c - prev
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        tr = max(highs[i] - lows[i], abs(highs[i] - prev), abs(lows[i] - prev))
+
+        if i <= rsi_period:
+            avg_gain += gain
+            avg_loss += loss
+            if i == rsi_period:
+                avg_gain /= rsi_period
+                avg_loss /= rsi_period
+        else:
+            avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+
+        if i <= atr_period:
+            atr += tr
+            if i == atr_period:
+                atr /= atr_period
+        else:
+            atr = (atr * (atr_period - 1) + tr) / atr_period
+
+    if n <= atr_period:
+        hi = highs[n - 1]
+        lo = lows[n - 1]
+        for i in range(max(0, n - vol_window), n):
+            if highs[i] > hi:
+                hi = highs[i]
+            if lows[i] < lo:
+                lo = lows[i]
+        atr = hi - lo
+
+    rsi_val = _rsi_value(avg_gain, avg_loss) if n > rsi_period else 50.0
+    ema_val = ema if n > ema_period else closes[n - 1]
+    return rsi_val, ema_val, atr
+
+
+@njit(cache=True)
+def rsi_wilder(close: np.ndarray, period: int, out: np.ndarray):
+    """
+    Wilder RSI written into `out` (same layout as TA-Lib RSI).
+
+    Args:
+        close: Close prices (float64)
+        period: RSI period
+        out: Output array, same length as close; NaN for the first `period`
+    """
+    n = close.shape[0]
+    out[:] = np.nan
+    if n <= period:
+        return
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= period
+    avg_loss /= period
+    out[period] = _rsi_value(avg_gain, avg_loss)
+
+    for i in range(period + 1, n):
+        d = close[i] - close[i - 1]
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        out[i] = _rsi_value(avg_gain, avg_loss)
+
+
+@njit(cache=True)
+def ewma(x: np.ndarray, alpha: float, out: np.ndarray):
+    """
+    Exponentially weighted mean series written into `out`.
+
+    Same recurrence as pandas ewm(adjust=False): seeded at the first
+    non-NaN value, NaN inputs carry the previous mean forward.
+
+    Args:
+        x: Input values (float64)
+        alpha: Smoothing factor, e.g. 2 / (span + 1)
+        out: Output array, same length as x
+    """
+    s = np.nan
+    for i in range(x.shape[0]):
+        v = x[i]
+        if not np.isnan(v):
+            s = v if np.isnan(s) else alpha * v + (1.0 - alpha) * s
+        out[i] = s
+
+
+# Compiled EMA kernels keyed by their alpha tuple
+_ema_kernels = {}
+
+
+def make_ema_kernel(alphas: tuple):
+    """
+    EMA kernel specialized to a fixed set of ewm(adjust=False) alphas.
+
+    The loop is generated with every alpha inlined as a constant and one
+    local per EMA, so for the usual 9/21/50/200 set numba sees a fully
+    unrolled update that stays in registers. Kernels are compiled once per
+    alpha tuple and reused.
+
+    Args:
+        alphas: Smoothing factor per EMA, e.g. 2 / (period + 1)
+
+    Returns:
+        kernel(close, out) filling out[:, j] with the EMA for alphas[j]
+    """
+    alphas = tuple(float(a) for a in alphas)
+    kernel = _ema_kernels.get(alphas)
+    if kernel is not None:
+        return kernel
+
+    k = range(len(alphas))
+    lines = [
+        "def _ema_kernel(close, out):",
+        "    n = close.shape[0]",
+        "    if n == 0:",
+        "        return",
+        "    c = close[0]",
+    ]
+    lines += [f"    e{j} = c" for j in k]
+    lines += [f"    out[0, {j}] = c" for j in k]
+    lines += ["    for i in range(1, n):", "        c = close[i]"]
+    for j in k:
+        lines.append(f"        e{j} = {alphas[j]!r} * c + {1.0 - alphas[j]!r} * e{j}")
+        lines.append(f"        out[i, {j}] = e{j}")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    kernel = njit(fastmath=True)(namespace["_ema_kernel"])
+    _ema_kernels[alphas] = kernel
+    return kernel
+
+
+@njit(cache=True)
+def rolling_mean_std(x: np.ndarray, w: int, mean_out: np.ndarray, std_out: np.ndarray):
+    """
+    Rolling mean and sample std (ddof=1) from one running-sum pass.
+
+    Matches rolling(w).mean() / rolling(w).std(): the first w-1 slots and
+    any window containing a NaN are NaN. Sums are taken on x - pivot so
+    s2 - s*s/w doesn't cancel at price levels, and every w bars the pivot
+    moves to the current window and the sums are rebuilt exactly - this
+    keeps the shift small when prices drift and stops rounding error in
+    the running sums from accumulating, so float32 input stays accurate.
+
+    Args:
+        x: Input series (float64 or DTYPE)
+        w: Window length (>= 2)
+        mean_out: Output array for the mean, same length as x
+        std_out: Output array for the std, same length as x
+    """
+    n = x.shape[0]
+    pivot = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            pivot = float(x[i])
+            break
+
+    s = 0.0
+    s2 = 0.0
+    nans = 0
+    since_pivot = 0
+    for i in range(n):
+        v = x[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            d = v - pivot
+            s += d
+            s2 += d * d
+        if i >= w:
+            old = x[i - w]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                d = old - pivot
+                s -= d
+                s2 -= d * d
+
+        if i < w - 1 or nans > 0:
+            mean_out[i] = np.nan
+            std_out[i] = np.nan
+            continue
+
+        since_pivot += 1
+        if since_pivot >= w:
+            # Re-centre on this window and recompute the sums from scratch
+            since_pivot = 0
+            pivot = float(x[i - w + 1])
+            s = 0.0
+            s2 = 0.0
+            for j in range(i - w + 1, i + 1):
+                d = x[j] - pivot
+                s += d
+                s2 += d * d
+
+        var = (s2 - s * s / w) / (w - 1)
+        mean_out[i] = pivot + s / w
+        std_out[i] = np.sqrt(var) if var > 0.0 else 0.0
+
+
+@njit(cache=True)
+def stoch(high: np.ndarray, low: np.ndarray, close: np.ndarray, k: int, d: int,
+          out_k: np.ndarray, out_d: np.ndarray):
+    """
+    Stochastic %K / %D written into `out_k` / `out_d`.
+
+    Matches rolling(k).min/max and rolling(d).mean: NaN until the window is
+    full or whenever it contains a NaN.
+
+    Args:
+        high, low, close: Bar columns (float64)
+        k: %K lookback
+        d: %D smoothing (SMA of %K)
+        out_k, out_d: Output arrays, same length as close
+    """
+    n = close.shape[0]
+    out_k[:] = np.nan
+    out_d[:] = np.nan
+
+    for i in range(k - 1, n):
+        hi = -np.inf
+        lo = np.inf
+        bad = False
+        for j in range(i - k + 1, i + 1):
+            if np.isnan(high[j]) or np.isnan(low[j]):
+                bad = True
+                break
+            if high[j] > hi:
+                hi = high[j]
+            if low[j] < lo:
+                lo = low[j]
+        if bad:
+            continue
+        rng = hi - lo
+        num = close[i] - lo
+        if rng != 0:
+            out_k[i] = 100.0 * num / rng
+        elif num != 0:
+            out_k[i] = np.inf if num > 0 else -np.inf
+
+    for i in range(d - 1, n):
+        acc = 0.0
+        for j in range(i - d + 1, i + 1):
+            acc += out_k[j]
+        out_d[i] = acc / d
+
+
+@njit(cache=True)
+def volume_profile(low: np.ndarray, high: np.ndarray, vol: np.ndarray,
+                   edges: np.ndarray, out_bins: np.ndarray):
+    """
+    Spread each candle's volume evenly over the price bins its range covers.
+
+    Args:
+        low, high, vol: Bar columns (float64)
+        edges: Bin edges (len(out_bins) + 1, ascending)
+        out_bins: Per-bin volume, accumulated in place
+    """
+    bins = out_bins.shape[0]
+    for i in range(low.shape[0]):
+        lo = np.searchsorted(edges, low[i], side='right') - 1
+        hi = np.searchsorted(edges, high[i], side='right')
+        if lo < 0:
+            lo = 0
+        if hi > bins:
+            hi = bins
+        width = hi - lo
+        if width <= 0:
+            continue
+        v = vol[i] / width
+        for b in range(lo, hi):
+            out_bins[b] += v
+
+
+@njit(cache=True, parallel=True)
+def scan_rsi_ema(close2d: np.ndarray, lengths: np.ndarray, rsi_out: np.ndarray,
+                 ema_out: np.ndarray, rsi_period: int = 14, ema_period: int = 50):
+    """
+    Last Wilder RSI and EMA for many symbols at once, one row per symbol.
+
+    Rows are independent, so they are spread over all cores with prange
+    (a plain loop without numba).
+
+    Args:
+        close2d: Closes, one left-aligned row per symbol (padding ignored)
+        lengths: Number of valid closes in each row
+        rsi_out: Last RSI per row
+        ema_out: Last EMA per row (seeded at the first close)
+        rsi_period: Wilder RSI period
+        ema_period: EMA span
+    """
+    alpha = 2.0 / (ema_period + 1)
+    for s in prange(close2d.shape[0]):
+        n = lengths[s]
+        row = close2d[s]
+
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for i in range(1, n):
+            d = row[i] - row[i - 1]
+            gain = d if d > 0 else 0.0
+            loss = -d if d < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_period:
+                    avg_gain /= rsi_period
+                    avg_loss /= rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+        rsi_out[s] = _rsi_value(avg_gain, avg_loss) if n > rsi_period else 50.0
+
+        ema = row[0]
+        for i in range(1, n):
+            ema = alpha * row[i] + (1.0 - alpha) * ema
+        ema_out[s] = ema
+
+
+@njit(cache=True)
+def chart_series(close: np.ndarray, fast: int, slow: int, rsi_period: int, bb_window: int,
+                 ema_fast: np.ndarray, ema_slow: np.ndarray, rsi_out: np.ndarray,
+                 mean_out: np.ndarray, std_out: np.ndarray):
+    """
+    Dashboard chart columns: two EMAs and Wilder RSI in one pass, then the
+    Bollinger mean/std via rolling_mean_std.
+
+    The EMAs use the adjusted weighting of pandas ewm(span=...) (the
+    default the chart always used), i.e. sum(w_i x_i) / sum(w_i) with
+    w_i = (1 - alpha)^age, so early bars aren't dominated by the seed.
+
+    Args:
+        close: Close prices (float64, no NaNs)
+        fast, slow: EMA spans
+        rsi_period: Wilder RSI period
+        bb_window: Bollinger window
+        ema_fast, ema_slow, rsi_out, mean_out, std_out: Output arrays, same
+            length as close
+    """
+    n = close.shape[0]
+    a_fast = 2.0 / (fast + 1)
+    a_slow = 2.0 / (slow + 1)
+    num_fast = num_slow = den_fast = den_slow = 0.0
+    avg_gain = avg_loss = 0.0
+
+    for i in range(n):
+        x = close[i]
+        num_fast = x + (1.0 - a_fast) * num_fast
+        den_fast = 1.0 + (1.0 - a_fast) * den_fast
+        ema_fast[i] = num_fast / den_fast
+        num_slow = x + (1.0 - a_slow) * num_slow
+        den_slow = 1.0 + (1.0 - a_slow) * den_slow
+        ema_slow[i] = num_slow / den_slow
+
+        rsi_out[i] = np.nan
+        if i == 0:
+            continue
+        d = x - close[i - 1]
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        if i <= rsi_period:
+            avg_gain += gain
+            avg_loss += loss
+            if i == rsi_period:
+                avg_gain /= rsi_period
+                avg_loss /= rsi_period
+                rsi_out[i] = _rsi_value(avg_gain, avg_loss)
+        else:
+            avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+            rsi_out[i] = _rsi_value(avg_gain, avg_loss)
+
+    rolling_mean_std(close, bb_window, mean_out, std_out)
+
+
+def chart_series_iir(close: np.ndarray, fast: int, slow: int, rsi_period: int, bb_window: int,
+                     ema_fast: np.ndarray, ema_slow: np.ndarray, rsi_out: np.ndarray,
+                     mean_out: np.ndarray, std_out: np.ndarray):
+    """
+    chart_series for installs without numba (same arguments and outputs).
+
+    Needs SciPy. The adjusted EMA is num/den where both follow
+    y[i] = x[i] + (1 - alpha) * y[i-1]; the denominator has the closed form
+    (1 - (1 - alpha)^(i+1)) / alpha. Wilder's averages are the same filter
+    with alpha = 1/period, seeded with the SMA of the first `period` moves.
+    """
+    n = close.shape[0]
+    steps = np.arange(1, n + 1)
+    for span, out in ((fast, ema_fast), (slow, ema_slow)):
+        alpha = 2.0 / (span + 1)
+        num = lfilter([1.0], [1.0, alpha - 1.0], close)
+        out[:] = num * alpha / (1.0 - (1.0 - alpha) ** steps)
+
+    rsi_out[:] = np.nan
+    if n > rsi_period:
+        d = np.diff(close)
+        gain = np.maximum(d, 0.0)
+        loss = np.maximum(-d, 0.0)
+        decay = 1.0 - 1.0 / rsi_period
+        avg_gain = np.empty(n - rsi_period)
+        avg_loss = np.empty(n - rsi_period)
+        for src, avg in ((gain, avg_gain), (loss, avg_loss)):
+            avg[0] = src[:rsi_period].mean()
+            avg[1:] = lfilter([1.0 / rsi_period], [1.0, -decay], src[rsi_period:],
+                              zi=[decay * avg[0]])[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        flat = avg_loss == 0
+        rsi[flat] = np.where(avg_gain[flat] > 0, 100.0, 50.0)
+        rsi_out[rsi_period:] = rsi
+
+    rolling_mean_std(close, bb_window, mean_out, std_out)
+
+
+@njit(cache=True)
+def trailing_stop(slots: np.ndarray, prices: np.ndarray, entry: np.ndarray,
+                  signed_qty: np.ndarray, direction: np.ndarray, stop: np.ndarray,
+                  target: np.ndarray, pnl: np.ndarray, moved: np.ndarray) -> bool:
+    """
+    Mark positions to market and ratchet their trailing stops in place.
+
+    Same rules as the NumPy path in PortfolioState._apply_prices, fused
+    into one loop with no temporaries. Works in direction-signed space, so
+    a better stop is always a max. NaN stops/targets never move or fire,
+    which is why this one is not compiled with fastmath.
+
+    Args:
+        slots: Position slots to update
+        prices: New price per entry in `slots`
+        entry, signed_qty, direction, stop, target, pnl: Portfolio slot
+            arrays (stop and pnl are written)
+        moved: Per-entry flag, set when the stop moved to break-even
+
+    Returns:
+        True if any P&L changed
+    """
+    changed = False
+    for k in range(slots.shape[0]):
+        i = slots[k]
+        price = prices[k]
+        d = direction[i]
+        e = entry[i]
+
+        value = (price - e) * signed_qty[i]
+        if value != pnl[i]:
+            changed = True
+        pnl[i] = value
+
+        signed_sl = d * stop[i]
+        best = signed_sl
+
+        # Break-even once Target 1 is reached
+        moved[k] = False
+        if d * (price - target[i]) >= 0:
+            candidate = d * e
+            moved[k] = candidate > signed_sl
+            if candidate > best:
+                best = candidate
+
+        # Trail at 1.5% once 2% in profit
+        if d * (price - e) / e * 100 > 2.0:
+            candidate = d * np.round(price * (1.0 - 0.015 * d), 2)
+            if candidate > best:
+                best = candidate
+
+        stop[i] = d * best
+    return changed
+
+
+def warmup():
+    """Trigger JIT compilation of the numba kernels on a tiny input."""
+    dummy = np.ones(64, dtype=np.float64)
+    small = np.ones(64, dtype=DTYPE)
+    out = np.empty(64, dtype=DTYPE)
+    out2 = np.empty(64, dtype=DTYPE)
+    rsi_wilder(small, 14, out)
+    ewma(small, 2.0 / 13, out)
+    make_ema_kernel(tuple(2.0 / (p + 1) for p in (9, 21, 50, 200)))(dummy, np.empty((64, 4)))
+    stoch(small, small, small, 14, 3, out, out2)
+    rolling_mean_std(dummy, 20, np.empty(64), np.empty(64))
+    rolling_mean_std(small, 20, np.empty(64), np.empty(64))
+    volume_profile(small, small, dummy, np.linspace(0.0, 2.0, 21), np.zeros(20))
+    scan_rsi_ema(dummy.reshape(1, -1), np.array([64], dtype=np.int64),
+                 np.empty(1), np.empty(1))
+    chart_overlay(dummy, dummy, dummy)
+    chart_series(dummy, 50, 200, 14, 20, np.empty(64), np.empty(64), np.empty(64),
+                 np.empty(64), np.empty(64))
+    slots = np.arange(4)
+    trailing_stop(slots, dummy[:4], dummy, dummy, dummy, np.ones(64), np.ones(64),
+                  np.zeros(64), np.zeros(4, dtype=np.bool_))
+
+
+@njit(cache=True)
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
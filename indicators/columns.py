@@ -0,0 +1,28 @@
+"""Attach computed indicator columns to an OHLCV frame in one step."""
+
+import pandas as pd
+import numpy as np
+from typing import Dict
+
+
+def apply_indicators(df: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Return `df` with the indicator arrays appended as columns.
+    
+    The indicator functions return bare arrays, so the frame is only
+    rebuilt once here instead of being copied by every indicator.
+    
+    Args:
+        df: DataFrame with OHLCV data
+        columns: Column name -> array (same length as df)
+        
+    Returns:
+        New DataFrame with the columns added (existing ones replaced)
+    """
+    if not columns:
+        return df
+    
+    stale = [name for name in columns if name in df.columns]
+    if stale:
+        df = df.drop(columns=stale)
+    
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
@@ -2,96 +2,87 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+from indicators import _kernels as kernels
 
 
 class MomentumIndicators:
     """Calculate momentum-based technical indicators."""
     
+    # Signal -> momentum score contribution
+    _RSI_SCORE = {'BULLISH': 25, 'BEARISH': -25, 'OVERSOLD': 40, 'OVERBOUGHT': -40}
+    _MACD_SCORE = {'BULLISH_CROSS': 40, 'BEARISH_CROSS': -40, 'BULLISH': 20, 'BEARISH': -20}
+    _STOCH_SCORE = {'BULLISH_CROSS': 35, 'BEARISH_CROSS': -35, 'OVERSOLD': 30,
+                    'OVERBOUGHT': -30, 'BULLISH': 15, 'BEARISH': -15}
+    
     @staticmethod
-    def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-        """Calculate Relative Strength Index.
+    def calculate_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+        """Calculate Relative Strength Index (Wilder smoothing).
         
         Args:
-            df: DataFrame with 'close' column
+            close: Close prices (DTYPE)
             period: RSI period
             
         Returns:
-            DataFrame with RSI column added
+            RSI array aligned with close
         """
-        df_result = df.copy()
-        
-        # Price changes
-        delta = df_result['close'].diff()
-        
-        # Separate gains and losses
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        # Calculate average gain and loss
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        # Calculate RS and RSI
-        rs = avg_gain / avg_loss
-        df_result['rsi'] = 100 - (100 / (1 + rs))
-        
-        return df_result
+        # One pass over the raw close array (TA-Lib or numba Wilder RMA)
+        return kernels.rsi(close, period)
     
     @staticmethod
-    def calculate_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, 
-                      signal: int = 9) -> pd.DataFrame:
+    def calculate_macd(close: np.ndarray, fast: int = 12, slow: int = 26, 
+                      signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Calculate MACD (Moving Average Convergence Divergence).
         
         Args:
-            df: DataFrame with 'close' column
+            close: Close prices (DTYPE)
             fast: Fast EMA period
             slow: Slow EMA period
             signal: Signal line period
             
         Returns:
-            DataFrame with MACD, signal, and histogram columns
+            Tuple of (macd_line, macd_signal, macd_histogram) arrays
         """
-        df_result = df.copy()
+        close = np.asarray(close, dtype=kernels.DTYPE)
+        n = close.shape[0]
         
-        # Calculate MACD line
-        ema_fast = df_result['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df_result['close'].ewm(span=slow, adjust=False).mean()
-        df_result['macd_line'] = ema_fast - ema_slow
+        # Calculate MACD line (numba ewm(adjust=False) kernel)
+        ema_fast = np.empty(n, dtype=kernels.DTYPE)
+        ema_slow = np.empty(n, dtype=kernels.DTYPE)
+        kernels.ewma(close, 2.0 / (fast + 1), ema_fast)
+        kernels.ewma(close, 2.0 / (slow + 1), ema_slow)
+        macd_line = ema_fast - ema_slow
         
         # Calculate signal line
-        df_result['macd_signal'] = df_result['macd_line'].ewm(span=signal, adjust=False).mean()
+        macd_signal = np.empty(n, dtype=kernels.DTYPE)
+        kernels.ewma(macd_line, 2.0 / (signal + 1), macd_signal)
         
         # Calculate histogram
-        df_result['macd_histogram'] = df_result['macd_line'] - df_result['macd_signal']
-        
-        return df_result
+        return macd_line, macd_signal, macd_line - macd_signal
     
     @staticmethod
-    def calculate_stochastic(df: pd.DataFrame, k_period: int = 14, 
-                           d_period: int = 3) -> pd.DataFrame:
+    def calculate_stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                           k_period: int = 14, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
         """Calculate Stochastic Oscillator.
         
         Args:
-            df: DataFrame with OHLCV data
+            high, low, close: Bar columns (DTYPE)
             k_period: %K period
             d_period: %D period (SMA of %K)
             
         Returns:
-            DataFrame with stochastic %K and %D columns
+            Tuple of (stoch_k, stoch_d) arrays
         """
-        df_result = df.copy()
-        
-        # Calculate %K
-        low_min = df_result['low'].rolling(window=k_period).min()
-        high_max = df_result['high'].rolling(window=k_period).max()
-        
-        df_result['stoch_k'] = 100 * (df_result['close'] - low_min) / (high_max - low_min)
+        close = np.asarray(close, dtype=kernels.DTYPE)
+        stoch_k = np.empty(close.shape[0], dtype=kernels.DTYPE)
+        stoch_d = np.empty(close.shape[0], dtype=kernels.DTYPE)
         
-        # Calculate %D (SMA of %K)
-        df_result['stoch_d'] = df_result['stoch_k'].rolling(window=d_period).mean()
+        # %K over the rolling high/low range, %D = SMA of %K (numba kernel)
+        kernels.stoch(np.asarray(high, dtype=kernels.DTYPE), np.asarray(low, dtype=kernels.DTYPE),
+                      close, k_period, d_period, stoch_k, stoch_d)
         
-        return df_result
+        return stoch_k, stoch_d
     
     @staticmethod
     def analyze_momentum(df: pd.DataFrame, rsi_overbought: float = 70,
@@ -178,38 +169,9 @@ class MomentumIndicators:
                 stoch_signal = 'BEARISH'
         
         # Calculate overall momentum score (-100 to +100)
-        score = 0
-        
-        if rsi_signal == 'BULLISH':
-            score += 25
-        elif rsi_signal == 'BEARISH':
-            score -= 25
-        elif rsi_signal == 'OVERSOLD':
-            score += 40
-        elif rsi_signal == 'OVERBOUGHT':
-            score -= 40
-        
-        if macd_signal == 'BULLISH_CROSS':
-            score += 40
-        elif macd_signal == 'BEARISH_CROSS':
-            score -= 40
-        elif macd_signal == 'BULLISH':
-            score += 20
-        elif macd_signal == 'BEARISH':
-            score -= 20
-        
-        if stoch_signal == 'BULLISH_CROSS':
-            score += 35
-        elif stoch_signal == 'BEARISH_CROSS':
-            score -= 35
-        elif stoch_signal == 'OVERSOLD':
-            score += 30
-        elif stoch_signal == 'OVERBOUGHT':
-            score -= 30
-        elif stoch_signal == 'BULLISH':
-            score += 15
-        elif stoch_signal == 'BEARISH':
-            score -= 15
+        score = (MomentumIndicators._RSI_SCORE.get(rsi_signal, 0) +
+                 MomentumIndicators._MACD_SCORE.get(macd_signal, 0) +
+                 MomentumIndicators._STOCH_SCORE.get(stoch_signal, 0))
         
         return {
             'rsi_signal': rsi_signal,
@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Tuple
 
+from indicators import _kernels as kernels
+
 
 class StructureAnalysis:
     """Analyze market structure and price patterns."""
@@ -26,43 +28,28 @@ class StructureAnalysis:
         
         df_lookback = df.tail(lookback)
         
-        # Find swing highs and lows
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(2, len(df_lookback) - 2):
-            # Swing high: higher than 2 candles on each side
-            if (df_lookback.iloc[i]['high'] > df_lookback.iloc[i-1]['high'] and
-                df_lookback.iloc[i]['high'] > df_lookback.iloc[i-2]['high'] and
-                df_lookback.iloc[i]['high'] > df_lookback.iloc[i+1]['high'] and
-                df_lookback.iloc[i]['high'] > df_lookback.iloc[i+2]['high']):
-                swing_highs.append(df_lookback.iloc[i]['high'])
-            
-            # Swing low: lower than 2 candles on each side
-            if (df_lookback.iloc[i]['low'] < df_lookback.iloc[i-1]['low'] and
-                df_lookback.iloc[i]['low'] < df_lookback.iloc[i-2]['low'] and
-                df_lookback.iloc[i]['low'] < df_lookback.iloc[i+1]['low'] and
-                df_lookback.iloc[i]['low'] < df_lookback.iloc[i+2]['low']):
-                swing_lows.append(df_lookback.iloc[i]['low'])
-        
-        # Cluster similar levels
-        def cluster_levels(levels: List[float], proximity: float) -> List[float]:
-            if not levels:
+        # Swing points: higher/lower than 2 candles on each side (one vectorized pass)
+        h = df_lookback['high'].to_numpy(dtype=np.float64)
+        l = df_lookback['low'].to_numpy(dtype=np.float64)
+        
+        hc = h[2:-2]
+        swing_high_mask = (hc > h[1:-3]) & (hc > h[:-4]) & (hc > h[3:-1]) & (hc > h[4:])
+        swing_highs = hc[swing_high_mask]
+        
+        lc = l[2:-2]
+        swing_low_mask = (lc < l[1:-3]) & (lc < l[:-4]) & (lc < l[3:-1]) & (lc < l[4:])
+        swing_lows = lc[swing_low_mask]
+        
+        # Cluster similar levels: split the sorted levels wherever the gap to
+        # the previous level exceeds the proximity, then average each group
+        def cluster_levels(levels: np.ndarray, proximity: float) -> List[float]:
+            if levels.size == 0:
                 return []
             
-            levels_sorted = sorted(levels)
-            clusters = []
-            current_cluster = [levels_sorted[0]]
-            
-            for level in levels_sorted[1:]:
-                if level <= current_cluster[-1] * (1 + proximity / 100):
-                    current_cluster.append(level)
-                else:
-                    clusters.append(sum(current_cluster) / len(current_cluster))
-                    current_cluster = [level]
-            
-            clusters.append(sum(current_cluster) / len(current_cluster))
-            return clusters
+            arr = np.sort(levels)
+            starts = np.concatenate(([0], np.flatnonzero(arr[1:] > arr[:-1] * (1 + proximity / 100)) + 1))
+            sizes = np.diff(np.append(starts, arr.size))
+            return (np.add.reduceat(arr, starts) / sizes).tolist()
         
         support_levels = cluster_levels(swing_lows, proximity_pct)
         resistance_levels = cluster_levels(swing_highs, proximity_pct)
@@ -98,27 +85,32 @@ class StructureAnalysis:
         # Check for volume confirmation
         volume_confirmed = current_volume > avg_volume * volume_multiplier
         
-        # Check for resistance breakout (bullish)
-        for resistance in sr_levels.get('resistance', []):
-            if prev['close'] < resistance and latest['close'] > resistance:
-                return {
-                    'breakout': True,
-                    'direction': 'BULLISH',
-                    'level': resistance,
-                    'volume_confirmed': volume_confirmed,
-                    'strength': 'STRONG' if volume_confirmed else 'WEAK'
-                }
-        
-        # Check for support breakdown (bearish)
-        for support in sr_levels.get('support', []):
-            if prev['close'] > support and latest['close'] < support:
-                return {
-                    'breakout': True,
-                    'direction': 'BEARISH',
-                    'level': support,
-                    'volume_confirmed': volume_confirmed,
-                    'strength': 'STRONG' if volume_confirmed else 'WEAK'
-                }
+        prev_close = prev['close']
+        latest_close = latest['close']
+        
+        # Check for resistance breakout (bullish): lowest level above prev close
+        resistance = np.sort(np.asarray(sr_levels.get('resistance', []), dtype=np.float64))
+        idx = np.searchsorted(resistance, prev_close, side='right')
+        if idx < resistance.size and latest_close > resistance[idx]:
+            return {
+                'breakout': True,
+                'direction': 'BULLISH',
+                'level': float(resistance[idx]),
+                'volume_confirmed': volume_confirmed,
+                'strength': 'STRONG' if volume_confirmed else 'WEAK'
+            }
+        
+        # Check for support breakdown (bearish): highest level below prev close
+        support = np.sort(np.asarray(sr_levels.get('support', []), dtype=np.float64))
+        idx = np.searchsorted(support, prev_close, side='left') - 1
+        if idx >= 0 and latest_close < support[idx]:
+            return {
+                'breakout': True,
+                'direction': 'BEARISH',
+                'level': float(support[idx]),
+                'volume_confirmed': volume_confirmed,
+                'strength': 'STRONG' if volume_confirmed else 'WEAK'
+            }
         
         return {'breakout': False, 'direction': None}
     
@@ -143,18 +135,15 @@ class StructureAnalysis:
         # Create price bins
         bin_edges = np.linspace(price_min, price_max, bins + 1)
         
-        # Assign volume to each bin based on where price traded
+        # Assign volume to each bin based on where price traded:
+        # each candle spreads its volume evenly over the bins its range covers
         bin_volumes = np.zeros(bins)
-        
-        for _, row in df.iterrows():
-            # Find which bins this candle's range covers
-            low_bin = np.digitize(row['low'], bin_edges) - 1
-            high_bin = np.digitize(row['high'], bin_edges) - 1
-            
-            # Distribute volume across bins
-            affected_bins = range(max(0, low_bin), min(bins, high_bin + 1))
-            for bin_idx in affected_bins:
-                bin_volumes[bin_idx] += row['volume'] / max(1, len(affected_bins))
+        kernels.volume_profile(
+            df['low'].to_numpy(dtype=kernels.DTYPE),
+            df['high'].to_numpy(dtype=kernels.DTYPE),
+            df['volume'].to_numpy(dtype=np.float64),
+            bin_edges, bin_volumes
+        )
         
         # Find Point of Control (highest volume bin)
         poc_bin = np.argmax(bin_volumes)
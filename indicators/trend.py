@@ -4,12 +4,49 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
+from indicators import _kernels as kernels
+
+# EMA as a first-order IIR filter (C loop, no pandas objects) when SciPy is around
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+
+def _build_alignment_table():
+    """(trend, strength, bullish_alignment) for every EMA comparison pattern.
+
+    Index is a base-3 code of sign(ema_i - ema_i+1) for the 9/21, 21/50 and
+    50/200 pairs (digit 0 = below, 1 = equal/NaN, 2 = above).
+    """
+    table = []
+    for code in range(27):
+        c0, c1, c2 = code // 9 - 1, code // 3 % 3 - 1, code % 3 - 1
+        if c0 == c1 == c2 == 1:
+            table.append(('BULLISH', 80, True))
+        elif c0 == c1 == c2 == -1:
+            table.append(('BEARISH', 80, False))
+        elif c0 == 1:
+            # Partial alignment - short-term trend decides
+            table.append(('BULLISH', 50, False))
+        elif c0 == -1:
+            table.append(('BEARISH', 50, False))
+        else:
+            table.append(('NEUTRAL', 30, False))
+    return table
+
 
 class TrendIndicators:
     """Calculate trend-based technical indicators."""
     
+    _ALIGNMENT = _build_alignment_table()
+    _ALIGNMENT_WEIGHTS = np.array([9, 3, 1])
+    _ALIGNMENT_TREND = np.array([row[0] for row in _ALIGNMENT])
+    _ALIGNMENT_STRENGTH = np.array([row[1] for row in _ALIGNMENT])
+    _ALIGNMENT_BULLISH = np.array([row[2] for row in _ALIGNMENT])
+    
     @staticmethod
-    def calculate_ema(df: pd.DataFrame, periods: list = [9, 21, 50, 200]) -> pd.DataFrame:
+    def calculate_ema(df: pd.DataFrame, periods: list = [9, 21, 50, 200]) -> Dict[str, np.ndarray]:
         """Calculate Exponential Moving Averages.
         
         Args:
@@ -17,17 +54,33 @@ class TrendIndicators:
             periods: List of EMA periods
             
         Returns:
-            DataFrame with EMA columns added
+            Dict of ema_<period> -> EMA array
         """
-        df_result = df.copy()
-        
-        for period in periods:
-            df_result[f'ema_{period}'] = df_result['close'].ewm(span=period, adjust=False).mean()
+        close = df['close'].to_numpy(dtype=np.float64)
+        ema_matrix = np.empty((close.shape[0], len(periods)))
+        
+        if kernels.NUMBA:
+            # Fused: one pass over close updates every period, with the
+            # alphas baked into a kernel compiled for this period set
+            kernel = kernels.make_ema_kernel(tuple(2.0 / (p + 1) for p in periods))
+            kernel(close, ema_matrix)
+            periods_left = []
+        else:
+            periods_left = periods
+        
+        for j, period in enumerate(periods_left):
+            if lfilter is not None and close.shape[0]:
+                # y[i] = a*x[i] + (1-a)*y[i-1], seeded so that y[0] = x[0]
+                alpha = 2.0 / (period + 1)
+                ema_matrix[:, j] = lfilter([alpha], [1.0, alpha - 1.0], close,
+                                           zi=[(1.0 - alpha) * close[0]])[0]
+            else:
+                ema_matrix[:, j] = df['close'].ewm(span=period, adjust=False).mean().to_numpy()
         
-        return df_result
+        return {f'ema_{period}': ema_matrix[:, j] for j, period in enumerate(periods)}
     
     @staticmethod
-    def calculate_vwap(df: pd.DataFrame, reset_period: str = 'daily') -> pd.DataFrame:
+    def calculate_vwap(df: pd.DataFrame, reset_period: str = 'daily') -> Dict[str, np.ndarray]:
         """Calculate Volume Weighted Average Price.
         
         Args:
@@ -35,31 +88,97 @@ class TrendIndicators:
             reset_period: How often to reset VWAP ('daily', 'weekly', 'none')
             
         Returns:
-            DataFrame with VWAP column added
+            Dict with the 'vwap' array
         """
-        df_result = df.copy()
-        
         # Typical price
-        df_result['typical_price'] = (df_result['high'] + df_result['low'] + df_result['close']) / 3
-        df_result['tp_volume'] = df_result['typical_price'] * df_result['volume']
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        tp_volume = (high + low + close) * (1.0 / 3.0) * volume
         
         if reset_period == 'daily':
             # Reset VWAP at the start of each day
-            df_result['date'] = pd.to_datetime(df_result['timestamp']).dt.date
-            df_result['cumul_tp_vol'] = df_result.groupby('date')['tp_volume'].cumsum()
-            df_result['cumul_vol'] = df_result.groupby('date')['volume'].cumsum()
-            df_result = df_result.drop('date', axis=1)
+            # Fetchers hand over typed timestamps; only parse if they didn't
+            timestamps = df['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps)
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_localize(None)  # local wall-clock days
+            days = timestamps.to_numpy().astype('datetime64[D]').view(np.int64)
+            if days.shape[0] and (days[1:] >= days[:-1]).all():
+                # Sorted bars: days are contiguous runs, no grouping needed
+                starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+                cumul_tp_vol = TrendIndicators._run_cumsum(tp_volume, starts)
+                cumul_vol = TrendIndicators._run_cumsum(volume, starts)
+            else:
+                _, day_ids = np.unique(days, return_inverse=True)
+                cumul_tp_vol = TrendIndicators._segment_cumsum(tp_volume, day_ids)
+                cumul_vol = TrendIndicators._segment_cumsum(volume, day_ids)
         else:
             # Running VWAP
-            df_result['cumul_tp_vol'] = df_result['tp_volume'].cumsum()
-            df_result['cumul_vol'] = df_result['volume'].cumsum()
+            cumul_tp_vol = np.cumsum(tp_volume)
+            cumul_vol = np.cumsum(volume)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = cumul_tp_vol / cumul_vol
         
-        df_result['vwap'] = df_result['cumul_tp_vol'] / df_result['cumul_vol']
+        return {'vwap': vwap}
+    
+    @staticmethod
+    def _segment_cumsum(values: np.ndarray, group_ids: np.ndarray) -> np.ndarray:
+        """Cumulative sum restarting for each group id (groupby().cumsum()).
         
-        # Clean up temporary columns
-        df_result = df_result.drop(['typical_price', 'tp_volume', 'cumul_tp_vol', 'cumul_vol'], axis=1)
+        Args:
+            values: Values to accumulate
+            group_ids: Dense group id per row
+            
+        Returns:
+            Per-group running totals, in the original row order
+        """
+        if values.shape[0] == 0:
+            return values.copy()
         
-        return df_result
+        order = np.argsort(group_ids, kind='stable')
+        sorted_ids = group_ids[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        
+        result = np.empty_like(values)
+        result[order] = TrendIndicators._run_cumsum(values[order], starts)
+        return result
+    
+    @staticmethod
+    def _run_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """Cumulative sum restarting at each index in `starts` (starts[0] == 0).
+        
+        One full cumsum, then each run's preceding total is subtracted.
+        """
+        cumsum = np.cumsum(values)
+        offsets = np.zeros(len(starts))
+        offsets[1:] = cumsum[starts[1:] - 1]
+        return cumsum - np.repeat(offsets, np.diff(np.r_[starts, len(values)]))
+    
+    @staticmethod
+    def analyze_trend_batch(latest_emas: np.ndarray) -> Dict[str, np.ndarray]:
+        """Classify EMA alignment for a whole basket of symbols at once.
+        
+        Same rules as analyze_trend, applied row-wise.
+        
+        Args:
+            latest_emas: (n_symbols, 4) array of the latest EMA 9/21/50/200
+            
+        Returns:
+            Dict of per-symbol 'trend', 'strength' and 'ema_alignment' arrays
+        """
+        latest_emas = np.asarray(latest_emas, dtype=np.float64).reshape(-1, 4)
+        signs = np.nan_to_num(np.sign(latest_emas[:, :-1] - latest_emas[:, 1:]))
+        codes = ((signs + 1) @ TrendIndicators._ALIGNMENT_WEIGHTS).astype(np.intp)
+        
+        return {
+            'trend': TrendIndicators._ALIGNMENT_TREND[codes],
+            'strength': TrendIndicators._ALIGNMENT_STRENGTH[codes],
+            'ema_alignment': TrendIndicators._ALIGNMENT_BULLISH[codes]
+        }
     
     @staticmethod
     def analyze_trend(df: pd.DataFrame) -> Dict[str, Any]:
@@ -79,41 +198,29 @@ class TrendIndicators:
                 'price_vs_vwap': 'NEUTRAL'
             }
         
-        latest = df.iloc[-1]
+        # Last two rows of every column we need, as one small float array
+        columns = set(df.columns)
+        wanted = [c for c in ('ema_9', 'ema_21', 'ema_50', 'ema_200', 'close', 'vwap') if c in columns]
+        tail = df.iloc[-2:][wanted].to_numpy(dtype=np.float64)
+        prev, latest = dict(zip(wanted, tail[0])), dict(zip(wanted, tail[1]))
         
         # Check EMA alignment (bullish: EMA9 > EMA21 > EMA50 > EMA200)
         ema_cols = ['ema_9', 'ema_21', 'ema_50', 'ema_200']
-        ema_available = all(col in df.columns for col in ema_cols)
+        ema_available = columns.issuperset(ema_cols)
         
         if ema_available:
-            ema_values = [latest[col] for col in ema_cols]
-            bullish_alignment = all(ema_values[i] > ema_values[i+1] for i in range(len(ema_values)-1))
-            bearish_alignment = all(ema_values[i] < ema_values[i+1] for i in range(len(ema_values)-1))
-            
-            if bullish_alignment:
-                trend = 'BULLISH'
-                strength = 80
-            elif bearish_alignment:
-                trend = 'BEARISH'
-                strength = 80
-            else:
-                # Partial alignment - check short-term trend
-                if latest['ema_9'] > latest['ema_21']:
-                    trend = 'BULLISH'
-                    strength = 50
-                elif latest['ema_9'] < latest['ema_21']:
-                    trend = 'BEARISH'
-                    strength = 50
-                else:
-                    trend = 'NEUTRAL'
-                    strength = 30
+            # Pattern of pairwise comparisons -> one table lookup, no branching
+            ema_values = tail[1, :4]
+            signs = np.nan_to_num(np.sign(ema_values[:-1] - ema_values[1:]))
+            code = int(((signs + 1) * TrendIndicators._ALIGNMENT_WEIGHTS).sum())
+            trend, strength, bullish_alignment = TrendIndicators._ALIGNMENT[code]
         else:
             trend = 'UNKNOWN'
             strength = 0
         
         # Price vs VWAP
         price_vs_vwap = 'NEUTRAL'
-        if 'vwap' in df.columns:
+        if 'vwap' in columns:
             if latest['close'] > latest['vwap'] * 1.01:
                 price_vs_vwap = 'ABOVE'
             elif latest['close'] < latest['vwap'] * 0.99:
@@ -122,8 +229,7 @@ class TrendIndicators:
         # Golden/Death cross detection
         golden_cross = False
         death_cross = False
-        if 'ema_50' in df.columns and 'ema_200' in df.columns and len(df) >= 2:
-            prev = df.iloc[-2]
+        if 'ema_50' in columns and 'ema_200' in columns:
             if prev['ema_50'] <= prev['ema_200'] and latest['ema_50'] > latest['ema_200']:
                 golden_cross = True
             elif prev['ema_50'] >= prev['ema_200'] and latest['ema_50'] < latest['ema_200']:
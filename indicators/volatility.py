@@ -2,14 +2,16 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any
+
+from indicators import _kernels as kernels
 
 
 class VolatilityIndicators:
     """Calculate volatility-based technical indicators."""
     
     @staticmethod
-    def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    def calculate_atr(df: pd.DataFrame, period: int = 14) -> Dict[str, np.ndarray]:
         """Calculate Average True Range.
         
         Args:
@@ -17,26 +19,31 @@ class VolatilityIndicators:
             period: ATR period
             
         Returns:
-            DataFrame with ATR column added
+            Dict with the 'atr' array
         """
-        df_result = df.copy()
-        
-        # True Range components
-        high_low = df_result['high'] - df_result['low']
-        high_close = np.abs(df_result['high'] - df_result['close'].shift(1))
-        low_close = np.abs(df_result['low'] - df_result['close'].shift(1))
-        
-        # True Range
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        
-        # Average True Range
-        df_result['atr'] = true_range.rolling(window=period).mean()
-        
-        return df_result
+        # True Range on raw arrays (no intermediate Series / concat)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        
+        # fmax skips the NaN prev close on the first bar, like max(axis=1) did
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)),
+                             np.abs(low - prev_close))
+        
+        # Average True Range: SMA as a 'valid' convolution (a NaN bar only
+        # blanks the windows containing it, same as rolling().mean())
+        atr = np.full_like(true_range, np.nan)
+        if true_range.shape[0] >= period:
+            atr[period - 1:] = np.convolve(true_range, np.full(period, 1.0 / period), mode='valid')
+        
+        return {'atr': atr}
     
     @staticmethod
     def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, 
-                                 std_dev: float = 2.0) -> pd.DataFrame:
+                                 std_dev: float = 2.0) -> Dict[str, np.ndarray]:
         """Calculate Bollinger Bands.
         
         Args:
@@ -45,24 +52,31 @@ class VolatilityIndicators:
             std_dev: Number of standard deviations
             
         Returns:
-            DataFrame with Bollinger Bands columns added
+            Dict of bb_middle/bb_upper/bb_lower/bb_bandwidth arrays
         """
-        df_result = df.copy()
-        
-        # Middle band (SMA)
-        df_result['bb_middle'] = df_result['close'].rolling(window=period).mean()
+        # DTYPE input: the kernel's pivoted sums keep float32 closes accurate
+        close = df['close'].to_numpy(dtype=kernels.DTYPE)
         
-        # Standard deviation
-        rolling_std = df_result['close'].rolling(window=period).std()
+        # Middle band (SMA) and standard deviation from a single pass
+        middle = np.empty(close.shape[0])
+        rolling_std = np.empty(close.shape[0])
+        kernels.rolling_mean_std(close, period, middle, rolling_std)
         
-        # Upper and lower bands
-        df_result['bb_upper'] = df_result['bb_middle'] + (rolling_std * std_dev)
-        df_result['bb_lower'] = df_result['bb_middle'] - (rolling_std * std_dev)
+        # Upper and lower bands (half-width computed once)
+        rolling_std *= std_dev
+        upper = middle + rolling_std
+        lower = middle - rolling_std
         
-        # Bandwidth (volatility measure)
-        df_result['bb_bandwidth'] = (df_result['bb_upper'] - df_result['bb_lower']) / df_result['bb_middle']
+        # Bandwidth (volatility measure): (upper - lower) / middle
+        bandwidth = rolling_std / middle
+        bandwidth *= 2.0
         
-        return df_result
+        return {
+            'bb_middle': middle,
+            'bb_upper': upper,
+            'bb_lower': lower,
+            'bb_bandwidth': bandwidth
+        }
     
     @staticmethod
     def calculate_stop_loss_target(current_price: float, atr: float, 
@@ -81,29 +95,34 @@ class VolatilityIndicators:
         Returns:
             Dictionary with stop-loss and target prices
         """
-        if signal_type == 'BUY':
-            stop_loss = current_price - (atr * sl_multiplier)
-            targets = [current_price + (atr * mult) for mult in target_multipliers]
-            risk = current_price - stop_loss
-        else:  # SELL
-            stop_loss = current_price + (atr * sl_multiplier)
-            targets = [current_price - (atr * mult) for mult in target_multipliers]
-            risk = stop_loss - current_price
-        
-        # Calculate risk-reward ratios
-        rewards = [abs(target - current_price) for target in targets]
-        risk_rewards = [reward / risk if risk > 0 else 0 for reward in rewards]
+        direction = 1.0 if signal_type == 'BUY' else -1.0  # SELL mirrors BUY
+        risk = atr * sl_multiplier
+        stop_loss = current_price - direction * risk
+        
+        # All targets / rewards / R:R in one array pass
+        targets = current_price + direction * atr * np.asarray(target_multipliers, dtype=np.float64)
+        rewards = np.abs(targets - current_price)
+        risk_rewards = rewards / risk if risk > 0 else np.zeros_like(rewards)
         
         return {
             'entry': current_price,
             'stop_loss': stop_loss,
-            'targets': targets,
+            'targets': targets.tolist(),
             'risk': risk,
-            'rewards': rewards,
-            'risk_reward_ratios': risk_rewards,
-            'best_risk_reward': max(risk_rewards) if risk_rewards else 0
+            'rewards': rewards.tolist(),
+            'risk_reward_ratios': risk_rewards.tolist(),
+            'best_risk_reward': float(risk_rewards.max()) if risk_rewards.size else 0
         }
     
+    @staticmethod
+    def _percentile_rank(values, current: float) -> float:
+        """Percent of non-NaN values strictly below `current` (0 if none)."""
+        arr = np.asarray(values, dtype=np.float64)
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return 0
+        return np.count_nonzero(arr < current) / arr.size * 100
+    
     @staticmethod
     def analyze_volatility(df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze volatility indicators.
@@ -127,10 +146,7 @@ class VolatilityIndicators:
         # ATR Percentile
         atr_percentile = 0
         if 'atr' in df.columns:
-            current_atr = latest['atr']
-            atr_series = df['atr'].dropna()
-            if len(atr_series) > 0:
-                atr_percentile = (atr_series < current_atr).sum() / len(atr_series) * 100
+            atr_percentile = VolatilityIndicators._percentile_rank(df['atr'], latest['atr'])
         
         # Volatility Regime
         if atr_percentile > 80:
@@ -160,10 +176,9 @@ class VolatilityIndicators:
         # Bollinger Band Squeeze (low volatility condition)
         bb_squeeze = False
         if 'bb_bandwidth' in df.columns:
-            current_bw = latest['bb_bandwidth']
-            bw_series = df['bb_bandwidth'].dropna()
-            if len(bw_series) > 0:
-                bw_percentile = (bw_series < current_bw).sum() / len(bw_series) * 100
+            bw_values = df['bb_bandwidth'].to_numpy(dtype=np.float64)
+            if (~np.isnan(bw_values)).any():
+                bw_percentile = VolatilityIndicators._percentile_rank(bw_values, latest['bb_bandwidth'])
                 bb_squeeze = bw_percentile < 20  # Bottom 20% = squeeze
         
         return {
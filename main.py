@@ -1,18 +1,13 @@
 """Main Application Entry Point."""
 
 import sys
-import yaml
-from pathlib import Path
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QPixmap
+from PyQt6.QtWidgets import QApplication, QSplashScreen
 
 # Import from current directory structure
+# (pandas-heavy modules are imported in main() once the splash is painted)
 from core.logger import get_logger
-from core.database import TradingDatabase
-from data.fetcher import NSEDataFetcher
-from portfolio.state import PortfolioState
-from portfolio.risk_manager import RiskManager
-from execution.execution_engine import RuleDrivenExecutionEngine
-from gui.main_window import TradingEngineGUI
 
 def main():
     """Initialize and run the trading engine."""
@@ -21,6 +16,26 @@ def main():
     logger = get_logger()
     logger.info("Starting NSE Trading Engine (Root Mode)...")
     
+    # Qt first so a window is on screen while pandas & co. load
+    app = QApplication(sys.argv)
+    # Apply Dark Theme
+    app.setStyle('Fusion')
+    
+    pixmap = QPixmap(420, 120)
+    pixmap.fill(QColor('#1e1e1e'))
+    splash = QSplashScreen(pixmap)
+    splash.show()
+    splash.showMessage("Loading NSE Trading Engine...",
+                       Qt.AlignmentFlag.AlignCenter, QColor('white'))
+    app.processEvents()
+    
+    from core.database import TradingDatabase
+    from data.fetcher import NSEDataFetcher
+    from portfolio.state import PortfolioState
+    from portfolio.risk_manager import RiskManager
+    from execution.execution_engine import RuleDrivenExecutionEngine
+    from gui.main_window import TradingEngineGUI
+    
     # PRELOAD NSE SYMBOLS AT STARTUP (Critical for scanner)
     from data.nse_symbol_loader import preload_nse_symbols
     symbol_count = preload_nse_symbols()
@@ -54,15 +69,15 @@ def main():
         )
         
         # Start GUI
-        app = QApplication(sys.argv)
-        # Apply Dark Theme
-        app.setStyle('Fusion')
-        
         window = TradingEngineGUI(engine)
         window.show()
+        splash.finish(window)
         
         logger.info("GUI Started Successfully.")
-        sys.exit(app.exec())
+        exit_code = app.exec()
+        # Commit queued trade writes before the daemon writer thread dies
+        db.flush()
+        sys.exit(exit_code)
         
     except Exception as e:
         logger.error(f"Fatal Error: {e}")
@@ -10,70 +10,82 @@ class PerformanceAnalytics:
     """Calculate portfolio performance metrics."""
     
     @staticmethod
-    def calculate_returns_series(portfolio_snapshots: pd.DataFrame) -> pd.Series:
+    def calculate_returns_series(portfolio_snapshots: pd.DataFrame) -> np.ndarray:
         """Calculate returns series from portfolio snapshots.
         
         Args:
             portfolio_snapshots: DataFrame with portfolio history
             
         Returns:
-            Series of returns
+            Array of period returns
         """
         if portfolio_snapshots.empty or len(portfolio_snapshots) < 2:
-            return pd.Series()
+            return np.empty(0)
         
-        returns = portfolio_snapshots['total_capital'].pct_change().dropna()
-        return returns
+        capital = portfolio_snapshots['total_capital'].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(capital) / capital[:-1]
+        return returns[~np.isnan(returns)]
     
     @staticmethod
-    def calculate_sharpe_ratio(returns: pd.Series, periods_per_year: int = 252,
+    def calculate_sharpe_ratio(returns: np.ndarray, periods_per_year: int = 252,
                               risk_free_rate: float = 0.06) -> float:
         """Calculate Sharpe Ratio.
         
         Args:
-            returns: Returns series
+            returns: Returns array
             periods_per_year: Trading periods per year (252 for daily)
             risk_free_rate: Annual risk-free rate
             
         Returns:
             Sharpe Ratio
         """
-        if returns.empty or returns.std() == 0:
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size < 2:
+            return 0.0
+        
+        std = returns.std(ddof=1)
+        if std == 0:
             return 0.0
         
         # Annualize returns and volatility
         mean_return = returns.mean() * periods_per_year
-        std_return = returns.std() * np.sqrt(periods_per_year)
+        std_return = std * np.sqrt(periods_per_year)
         
         sharpe = (mean_return - risk_free_rate) / std_return
-        return sharpe
+        return float(sharpe)
     
     @staticmethod
-    def calculate_sortino_ratio(returns: pd.Series, periods_per_year: int = 252,
+    def calculate_sortino_ratio(returns: np.ndarray, periods_per_year: int = 252,
                                risk_free_rate: float = 0.06) -> float:
         """Calculate Sortino Ratio (downside deviation only).
         
         Args:
-            returns: Returns series
+            returns: Returns array
             periods_per_year: Trading periods per year
             risk_free_rate: Annual risk-free rate
             
         Returns:
             Sortino Ratio
         """
-        if returns.empty:
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size == 0:
             return 0.0
         
         # Downside deviation (only negative returns)
         downside_returns = returns[returns < 0]
-        if downside_returns.empty or downside_returns.std() == 0:
+        if downside_returns.size < 2:
+            return 0.0
+        
+        downside = downside_returns.std(ddof=1)
+        if downside == 0:
             return 0.0
         
         mean_return = returns.mean() * periods_per_year
-        downside_std = downside_returns.std() * np.sqrt(periods_per_year)
+        downside_std = downside * np.sqrt(periods_per_year)
         
         sortino = (mean_return - risk_free_rate) / downside_std
-        return sortino
+        return float(sortino)
     
     @staticmethod
     def calculate_max_drawdown(portfolio_values: pd.Series) -> Dict[str, Any]:
@@ -88,23 +100,28 @@ class PerformanceAnalytics:
         if portfolio_values.empty:
             return {'max_drawdown': 0, 'drawdown_duration': 0}
         
-        # Calculate running maximum
-        running_max = portfolio_values.expanding().max()
+        values = portfolio_values.to_numpy(dtype=np.float64)
+        
+        # Calculate running maximum (fmax skips NaN gaps like expanding().max())
+        running_max = np.fmax.accumulate(values)
         
         # Calculate drawdown
-        drawdown = (portfolio_values - running_max) / running_max * 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = (values - running_max) / running_max * 100
+        
+        if np.isnan(drawdown).all():
+            return {'max_drawdown': 0, 'drawdown_duration_days': 0, 'max_dd_date': None}
         
-        max_dd = drawdown.min()
-        max_dd_idx = drawdown.idxmin()
+        dd_pos = int(np.nanargmin(drawdown))
+        max_dd = drawdown[dd_pos]
+        max_dd_idx = portfolio_values.index[dd_pos]
         
-        # Find recovery
+        # Find recovery: first value back at the pre-drawdown peak
         recovery_idx = None
-        if max_dd_idx is not None:
-            post_dd = portfolio_values[max_dd_idx:]
-            peak_value = running_max[max_dd_idx]
-            recovery = post_dd[post_dd >= peak_value]
-            if not recovery.empty:
-                recovery_idx = recovery.index[0]
+        recovered = values[dd_pos:] >= running_max[dd_pos]
+        rec_pos = int(recovered.argmax())
+        if recovered[rec_pos]:
+            recovery_idx = portfolio_values.index[dd_pos + rec_pos]
         
         # Calculate duration
         if max_dd_idx is not None and recovery_idx is not None:
@@ -113,7 +130,7 @@ class PerformanceAnalytics:
             duration = 0
         
         return {
-            'max_drawdown': abs(max_dd),
+            'max_drawdown': abs(float(max_dd)),
             'drawdown_duration_days': duration,
             'max_dd_date': max_dd_idx
         }
@@ -147,19 +164,20 @@ class PerformanceAnalytics:
             return {'total_trades': 0}
         
         total_trades = len(closed_trades)
-        winning_trades = closed_trades[closed_trades['pnl'] > 0]
-        losing_trades = closed_trades[closed_trades['pnl'] < 0]
+        pnl = closed_trades['pnl'].to_numpy(dtype=np.float64)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
         
-        win_count = len(winning_trades)
-        loss_count = len(losing_trades)
+        win_count = wins.size
+        loss_count = losses.size
         
         win_rate = (win_count / total_trades * 100) if total_trades > 0 else 0
         
-        avg_win = winning_trades['pnl'].mean() if not winning_trades.empty else 0
-        avg_loss = losing_trades['pnl'].mean() if not losing_trades.empty else 0
+        avg_win = wins.mean() if win_count else 0
+        avg_loss = losses.mean() if loss_count else 0
         
-        gross_profit = winning_trades['pnl'].sum() if not winning_trades.empty else 0
-        gross_loss = abs(losing_trades['pnl'].sum()) if not losing_trades.empty else 0
+        gross_profit = wins.sum() if win_count else 0
+        gross_loss = abs(losses.sum()) if loss_count else 0
         
         profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else 0
         
@@ -173,8 +191,8 @@ class PerformanceAnalytics:
             'win_rate': win_rate,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
-            'largest_win': winning_trades['pnl'].max() if not winning_trades.empty else 0,
-            'largest_loss': losing_trades['pnl'].min() if not losing_trades.empty else 0,
+            'largest_win': wins.max() if win_count else 0,
+            'largest_loss': losses.min() if loss_count else 0,
             'gross_profit': gross_profit,
             'gross_loss': gross_loss,
             'profit_factor': profit_factor,
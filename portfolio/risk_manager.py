@@ -1,15 +1,74 @@
 """Risk management rules and position sizing."""
 
+import time
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 from datetime import datetime, timedelta
 
 from portfolio.state import PortfolioState
 
 
+@lru_cache(maxsize=2048)
+def _size_core(total_paise: int, available_paise: int, entry_paise: int, stop_paise: int,
+               confidence_c: int, risk_per_trade_bp: int,
+               max_capital_per_trade_bp: int) -> Optional[tuple]:
+    """Pure position-sizing arithmetic, all in integers.
+    
+    Money is in paise, confidence in hundredths (0-10000) and percentages in
+    basis points, so every step is exact and each quantity is a single
+    floor division. Every input that affects the result is part of the
+    cache key (capital included), so a fill or exit simply produces new
+    keys - nothing to invalidate.
+    
+    Returns:
+        (quantity, investment, risk_per_share) in shares/rupees, or None for
+        a zero stop distance
+    """
+    # Calculate position size based on stop-loss distance
+    risk_per_share = abs(entry_paise - stop_paise)
+    if risk_per_share == 0:
+        return None
+    
+    # Risk amount = capital * risk% scaled by confidence (0.5 to 1.0):
+    # total * bp/10_000 * (10_000 + conf_c)/20_000, per share at risk
+    quantity = (total_paise * risk_per_trade_bp * (10_000 + confidence_c)
+                // (200_000_000 * risk_per_share))
+    
+    # Apply max capital per trade limit
+    max_investment_bp = total_paise * max_capital_per_trade_bp  # paise * 10_000
+    if quantity * entry_paise * 10_000 > max_investment_bp:
+        # Scale down quantity
+        quantity = max_investment_bp // (10_000 * entry_paise)
+    
+    # Check available capital
+    if quantity * entry_paise > available_paise:
+        quantity = available_paise // entry_paise
+    
+    return quantity, quantity * entry_paise / 100, risk_per_share / 100
+
+
 class RiskManager:
     """Enforce risk management rules and calculate position sizing."""
     
+    # Shared read-only results for rejected sizings (no per-call dict)
+    _INVALID_SL = MappingProxyType({
+        'quantity': 0,
+        'investment': 0,
+        'risk_amount': 0,
+        'valid': False,
+        'reason': 'Invalid stop-loss distance'
+    })
+    _INSUFFICIENT = MappingProxyType({
+        'quantity': 0,
+        'investment': 0,
+        'risk_amount': 0,
+        'valid': False,
+        'reason': 'Insufficient capital'
+    })
+    
     def __init__(self, config: Dict[str, Any], portfolio: PortfolioState,
                  logger=None):
         """Initialize risk manager.
@@ -32,17 +91,31 @@ class RiskManager:
         
         # Track daily metrics
         self.today_start_capital = portfolio.total_capital
-        self.today_trades = {}  # symbol -> count
+        # Trades per symbol today: symbol -> fixed id (kept across days) -> count
+        self._trade_ids: Dict[str, int] = {}
+        self._trades_today = np.zeros(256, dtype=np.int16)
         self.last_reset_date = datetime.now().date()
+        self._next_reset_at = self._next_midnight()  # epoch secs of the next day roll
         self.trading_halted = False
     
+    @staticmethod
+    def _next_midnight() -> float:
+        """Epoch timestamp of the coming local midnight."""
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+    
     def reset_daily_counters(self):
         """Reset daily counters at start of new day."""
+        # Fast path (every tick/signal): one float compare until midnight passes
+        if time.time() < self._next_reset_at:
+            return
+        
         current_date = datetime.now().date()
+        self._next_reset_at = self._next_midnight()
         
         if current_date != self.last_reset_date:
             self.today_start_capital = self.portfolio.total_capital
-            self.today_trades = {}
+            self._trades_today.fill(0)
             self.last_reset_date = current_date
             self.trading_halted = False
             
@@ -55,7 +128,10 @@ class RiskManager:
             True if trading allowed, False if halted
         """
         self.reset_daily_counters()
-        
+        return self._check_daily_loss_limit()
+    
+    def _check_daily_loss_limit(self) -> bool:
+        """check_daily_loss_limit without the day roll (caller already did it)."""
         current_pnl = self.portfolio.total_capital - self.today_start_capital
         daily_loss_pct = (current_pnl / self.today_start_capital) * 100
         
@@ -77,7 +153,7 @@ class RiskManager:
         Returns:
             True if can open new position, False otherwise
         """
-        if len(self.portfolio.positions) >= self.max_open_positions:
+        if len(self.portfolio) >= self.max_open_positions:
             if self.logger:
                 self.logger.warning(
                     f"Max open positions ({self.max_open_positions}) reached"
@@ -95,8 +171,12 @@ class RiskManager:
             True if can trade, False otherwise
         """
         self.reset_daily_counters()
-        
-        trades_today = self.today_trades.get(symbol, 0)
+        return self._check_stock_trade_frequency(symbol)
+    
+    def _check_stock_trade_frequency(self, symbol: str) -> bool:
+        """check_stock_trade_frequency without the day roll (caller already did it)."""
+        idx = self._trade_ids.get(symbol)
+        trades_today = 0 if idx is None else int(self._trades_today[idx])
         if trades_today >= self.max_trades_per_stock_per_day:
             if self.logger:
                 self.logger.warning(
@@ -107,7 +187,7 @@ class RiskManager:
         return True
     
     def calculate_position_size(self, entry_price: float, stop_loss: float,
-                               signal_confidence: float) -> Dict[str, Any]:
+                               signal_confidence: float) -> Mapping[str, Any]:
         """Calculate optimal position size based on ATR and risk rules.
         
         Args:
@@ -116,53 +196,27 @@ class RiskManager:
             signal_confidence: Signal confidence (0-100)
             
         Returns:
-            Dictionary with position sizing details
+            Dictionary with position sizing details (read-only shared
+            mapping when the sizing is rejected)
         """
-        # Risk amount (per trade)
         total_capital = self.portfolio.total_capital
-        risk_amount = total_capital * (self.risk_per_trade_pct / 100)
-        
-        # Adjust risk based on confidence (higher confidence = more risk)
-        confidence_multiplier = 0.5 + (signal_confidence / 100) * 0.5  # 0.5 to 1.0
-        adjusted_risk = risk_amount * confidence_multiplier
-        
-        # Calculate position size based on stop-loss distance
-        risk_per_share = abs(entry_price - stop_loss)
-        
-        if risk_per_share == 0:
-            return {
-                'quantity': 0,
-                'investment': 0,
-                'risk_amount': 0,
-                'valid': False,
-                'reason': 'Invalid stop-loss distance'
-            }
         
-        quantity = int(adjusted_risk / risk_per_share)
+        # Integer inputs: paise, confidence in hundredths, percentages in bp
+        # (also makes the memo key exact)
+        sized = _size_core(
+            round(total_capital * 100), round(self.portfolio.available_capital * 100),
+            round(entry_price * 100), round(stop_loss * 100), round(signal_confidence * 100),
+            round(self.risk_per_trade_pct * 100), round(self.max_capital_per_trade_pct * 100)
+        )
         
-        # Apply max capital per trade limit
-        max_investment = total_capital * (self.max_capital_per_trade_pct / 100)
-        required_investment = quantity * entry_price
+        if sized is None:
+            return self._INVALID_SL
         
-        if required_investment > max_investment:
-            # Scale down quantity
-            quantity = int(max_investment / entry_price)
-            required_investment = quantity * entry_price
-        
-        # Check available capital
-        if required_investment > self.portfolio.available_capital:
-            quantity = int(self.portfolio.available_capital / entry_price)
-            required_investment = quantity * entry_price
+        quantity, required_investment, risk_per_share = sized
         
         # Validate quantity
         if quantity <= 0:
-            return {
-                'quantity': 0,
-                'investment': 0,
-                'risk_amount': 0,
-                'valid': False,
-                'reason': 'Insufficient capital'
-            }
+            return self._INSUFFICIENT
         
         actual_risk = quantity * risk_per_share
         risk_pct_of_capital = (actual_risk / total_capital) * 100
@@ -190,8 +244,11 @@ class RiskManager:
         Returns:
             Dictionary with validation result
         """
+        # Day roll once per validation; the sub-checks skip it
+        self.reset_daily_counters()
+        
         # Check daily loss limit
-        if not self.check_daily_loss_limit():
+        if not self._check_daily_loss_limit():
             return {
                 'allowed': False,
                 'reason': 'Daily loss limit breached - trading halted',
@@ -215,7 +272,7 @@ class RiskManager:
             }
         
         # Check trade frequency for this stock
-        if not self.check_stock_trade_frequency(symbol):
+        if not self._check_stock_trade_frequency(symbol):
             return {
                 'allowed': False,
                 'reason': f'Max trades per day for {symbol} reached',
@@ -245,4 +302,16 @@ class RiskManager:
             symbol: Stock symbol
         """
         self.reset_daily_counters()
-        self.today_trades[symbol] = self.today_trades.get(symbol, 0) + 1
+        # One hash lookup; a new symbol takes the next id
+        idx = self._trade_ids.setdefault(symbol, len(self._trade_ids))
+        if idx == self._trades_today.shape[0]:
+            grown = np.zeros(2 * idx, dtype=np.int16)
+            grown[:idx] = self._trades_today
+            self._trades_today = grown
+        self._trades_today[idx] += 1
+    
+    @property
+    def today_trades(self) -> Dict[str, int]:
+        """Symbol -> trades recorded today (for display/debugging)."""
+        counts = self._trades_today
+        return {symbol: int(counts[idx]) for symbol, idx in self._trade_ids.items() if counts[idx]}
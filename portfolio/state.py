@@ -1,11 +1,149 @@
 """Portfolio state management and tracking."""
 
-import pandas as pd
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+import numpy as np
+from collections.abc import Mapping, MutableMapping
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 
 from core.enums import PositionType, TradeStatus
 from core.database import TradingDatabase
+from indicators._kernels import NUMBA, trailing_stop
+
+
+# Position fields kept in PortfolioState's parallel arrays (name -> attribute)
+_ARRAY_FIELDS = {
+    'quantity': '_qty',
+    'entry_price': '_entry',
+    'current_price': '_price',
+    'stop_loss': '_sl',
+    'target': '_tgt',
+    'unrealized_pnl': '_pnl',
+}
+
+
+def _elapsed(entry_time_ns: int) -> timedelta:
+    """Time since a monotonic_ns() stamp."""
+    return timedelta(microseconds=(time.monotonic_ns() - entry_time_ns) // 1000)
+
+
+def _array_field(key: str) -> property:
+    """Property reading/writing one position field in the portfolio arrays."""
+    attr = _ARRAY_FIELDS[key]
+    
+    def fget(self):
+        value = getattr(self._portfolio, attr)[self._slot]
+        if key == 'quantity':
+            return int(value)
+        if key in ('stop_loss', 'target') and np.isnan(value):
+            return None
+        return float(value)
+    
+    def fset(self, value):
+        portfolio = self._portfolio
+        getattr(portfolio, attr)[self._slot] = np.nan if value is None else value
+        if key == 'quantity':
+            portfolio._sqty[self._slot] = portfolio._dir[self._slot] * value
+        portfolio._totals_dirty = True
+    
+    return property(fget, fset)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class _PositionView(MutableMapping):
+    """Slotted position record whose numeric fields live in the portfolio arrays.
+    
+    Fixed fields are plain slots (pos.trade_id); the numeric ones are
+    properties over the slot in PortfolioState's arrays, so the vectorized
+    price update never has to copy values back. Dict-style access
+    (pos['stop_loss']) still works for existing callers.
+    """
+    
+    _portfolio: 'PortfolioState'
+    _slot: int
+    trade_id: Optional[int]
+    symbol: str
+    position_type: PositionType
+    investment: float
+    entry_time_ns: int
+    _entry_time: Optional[datetime] = None
+    
+    quantity = _array_field('quantity')
+    entry_price = _array_field('entry_price')
+    current_price = _array_field('current_price')
+    stop_loss = _array_field('stop_loss')
+    target = _array_field('target')
+    unrealized_pnl = _array_field('unrealized_pnl')
+    
+    @property
+    def entry_time(self) -> datetime:
+        # Wall-clock entry time is only built when someone asks for it
+        if self._entry_time is None:
+            self._entry_time = datetime.now() - _elapsed(self.entry_time_ns)
+        return self._entry_time
+    
+    @entry_time.setter
+    def entry_time(self, value: datetime):
+        self._entry_time = value
+    
+    def __getitem__(self, key):
+        if key not in _POSITION_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key, value):
+        if key not in _POSITION_KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __delitem__(self, key):
+        raise KeyError(f"{key} is a required position field")
+    
+    def __iter__(self):
+        return iter(_POSITION_KEYS)
+    
+    def __len__(self):
+        return len(_POSITION_KEYS)
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
+# Keys served by _PositionView's mapping interface
+_POSITION_KEYS = ('trade_id', 'symbol', 'position_type', 'investment', 'entry_time_ns',
+                  'entry_time', *_ARRAY_FIELDS)
+
+
+class _PositionsView(Mapping):
+    """Read-only symbol -> _PositionView mapping over the portfolio slots.
+    
+    Iterates in insertion order of _sym_idx; nothing is copied, so the
+    arrays stay the only store of position numbers.
+    """
+    
+    __slots__ = ('_portfolio',)
+    
+    def __init__(self, portfolio: 'PortfolioState'):
+        self._portfolio = portfolio
+    
+    def __getitem__(self, symbol):
+        portfolio = self._portfolio
+        return portfolio._views[portfolio._sym_idx[symbol]]
+    
+    def __contains__(self, symbol):
+        return symbol in self._portfolio._sym_idx
+    
+    def __iter__(self):
+        return iter(self._portfolio._sym_idx)
+    
+    def __len__(self):
+        return self._portfolio._n_open
+    
+    def __repr__(self):
+        return repr(dict(self))
 
 
 class PortfolioState:
@@ -27,39 +165,58 @@ class PortfolioState:
         self.unrealized_pnl = 0.0
         self.realized_pnl = 0.0
         
-        self.positions = {}  # symbol -> position dict
         self.db = database
+        
+        # Structure-of-arrays position storage, one slot per open position
+        self._n = 0  # slots ever handed out (high-water mark)
+        self._n_open = 0  # open positions (== len(_sym_idx))
+        self._universe_version = 0  # bumped whenever a position opens/closes
+        self._feed_perm = None  # (feed map, version, slots, feed rows) for *_vec
+        self._sym_idx: Dict[str, int] = {}  # symbol -> slot
+        self._slot_symbol: List[Optional[str]] = []  # slot -> symbol
+        self._views: List[Optional[_PositionView]] = []  # slot -> view
+        self._free: List[int] = []  # slots released by close_position
+        self._allocate(16)
+        
+        # Set whenever capital or P&L may have changed; calculate_totals
+        # skips its work while this is False
+        self._totals_dirty = True
         self.logger = logger
         
         # Track peak capital for drawdown
         self.peak_capital = initial_capital
+        self._peak_inv = 1.0 / initial_capital if initial_capital > 0 else 0.0  # cached 1/peak
         self.current_drawdown = 0.0
         self.max_drawdown = 0.0
         
         self._load_from_db()
 
+    @property
+    def positions(self) -> Mapping:
+        """Open positions as symbol -> dict-style view (insertion ordered)."""
+        return _PositionsView(self)
+    
+    def __len__(self):
+        """Number of open positions."""
+        return self._n_open
+    
     def _load_from_db(self):
         """Load open positions from database."""
         try:
-            open_trades = self.db.get_open_trades()
-            if not open_trades.empty:
-                for _, trade in open_trades.iterrows():
-                    symbol = trade['symbol']
-                    self.positions[symbol] = {
-                        'trade_id': trade['id'],
-                        'symbol': symbol,
-                        'position_type': PositionType(trade['position_type']),
-                        'quantity': trade['quantity'],
-                        'entry_price': trade['entry_price'],
-                        'current_price': trade['entry_price'],
-                        'stop_loss': trade['stop_loss'],
-                        'target': trade['target'],
-                        'investment': trade['entry_price'] * trade['quantity'],
-                        'unrealized_pnl': 0.0,
-                        'entry_time': pd.to_datetime(trade['entry_timestamp'])
-                    }
-                    self.invested_capital += (trade['entry_price'] * trade['quantity'])
-                    self.available_capital -= (trade['entry_price'] * trade['quantity'])
+            # Anchor DB wall-clock entries onto the monotonic clock once
+            now, now_ns = datetime.now(), time.monotonic_ns()
+            for trade in self.db.get_open_trades_raw():
+                symbol = trade['symbol']
+                entry_time = datetime.fromisoformat(trade['entry_timestamp'])
+                self._open_slot(
+                    symbol, PositionType(trade['position_type']), trade['quantity'],
+                    trade['entry_price'], trade['stop_loss'], trade['target'],
+                    trade_id=trade['id'],
+                    entry_time_ns=now_ns - (now - entry_time) // timedelta(microseconds=1) * 1000,
+                    entry_time=entry_time
+                )
+                self.invested_capital += (trade['entry_price'] * trade['quantity'])
+                self.available_capital -= (trade['entry_price'] * trade['quantity'])
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Failed to load positions from DB: {e}")
@@ -80,7 +237,7 @@ class PortfolioState:
         Returns:
             True if position added successfully
         """
-        if symbol in self.positions:
+        if symbol in self._sym_idx:
             if self.logger:
                 self.logger.warning(f"Position already exists for {symbol}")
             return False
@@ -93,38 +250,36 @@ class PortfolioState:
                 self.logger.error(f"Insufficient capital for {symbol} position")
             return False
         
-        # Persist to DB first
+        # Persist to DB first (batched by the DB writer; we only wait for the id)
+        future = self.db.insert_trade_async(
+            signal_id=None,
+            symbol=symbol,
+            position_type=position_type.value,
+            quantity=quantity,
+            entry_price=entry_price,
+            stop_loss=stop_loss,
+            target=target
+        )
         try:
-            trade_id = self.db.insert_trade(
-                signal_id=None,
-                symbol=symbol,
-                position_type=position_type.value,
-                quantity=quantity,
-                entry_price=entry_price,
-                stop_loss=stop_loss,
-                target=target
-            )
+            trade_id = future.result(timeout=5.0)
+        except FutureTimeout:
+            # The position is abandoned, so the insert must not leave an OPEN
+            # row behind (it would load as a phantom position on restart):
+            # drop it if still queued, else cancel the row once it commits
+            if not future.cancel():
+                future.add_done_callback(
+                    lambda f: self._cancel_orphan_trade(f, entry_price))
+            if self.logger:
+                self.logger.error(f"DB Error adding position: insert for {symbol} timed out")
+            return False
         except Exception as e:
             if self.logger:
                 self.logger.error(f"DB Error adding position: {e}")
             return False
 
         # Create position
-        position = {
-            'trade_id': trade_id,
-            'symbol': symbol,
-            'position_type': position_type,
-            'quantity': quantity,
-            'entry_price': entry_price,
-            'current_price': entry_price,
-            'stop_loss': stop_loss,
-            'target': target,
-            'investment': investment,
-            'unrealized_pnl': 0.0,
-            'entry_time': datetime.now()
-        }
-        
-        self.positions[symbol] = position
+        self._open_slot(symbol, position_type, quantity, entry_price, stop_loss, target,
+                        trade_id=trade_id, entry_time_ns=time.monotonic_ns())
         
         # Update capital
         self.available_capital -= investment
@@ -135,6 +290,103 @@ class PortfolioState:
         
         return True
     
+    def _allocate(self, capacity: int):
+        """(Re)allocate the position arrays, keeping existing slots."""
+        n = self._n
+        for attr, dtype in (('_entry', np.float64), ('_qty', np.int64), ('_sl', np.float64),
+                            ('_tgt', np.float64), ('_dir', np.float64), ('_sqty', np.float64),
+                            ('_price', np.float64), ('_pnl', np.float64)):
+            col = np.zeros(capacity, dtype=dtype)
+            if n:
+                col[:n] = getattr(self, attr)[:n]
+            setattr(self, attr, col)
+    
+    def _open_slot(self, symbol: str, position_type: PositionType, quantity: int,
+                   entry_price: float, stop_loss: Optional[float], target: Optional[float],
+                   trade_id, entry_time_ns: int, entry_time: Optional[datetime] = None):
+        """Claim an array slot for a new position and register its view.
+        
+        entry_time_ns is a time.monotonic_ns() stamp used for holding-period
+        math; entry_time (wall clock) is filled in lazily when left None.
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._n
+            if slot == self._entry.shape[0]:
+                self._allocate(2 * slot)  # amortized doubling
+            self._n += 1
+            self._slot_symbol.append(None)
+            self._views.append(None)
+        
+        self._entry[slot] = entry_price
+        self._qty[slot] = quantity
+        self._price[slot] = entry_price
+        self._pnl[slot] = 0.0
+        self._dir[slot] = 1.0 if position_type == PositionType.LONG else -1.0
+        self._sqty[slot] = self._dir[slot] * quantity  # P&L = (price - entry) * signed qty
+        # None/0 stop or target -> NaN, which every vectorized rule skips
+        self._sl[slot] = stop_loss if stop_loss else np.nan
+        self._tgt[slot] = target if target else np.nan
+        
+        self._sym_idx[symbol] = slot
+        self._slot_symbol[slot] = symbol
+        self._n_open += 1
+        self._universe_version += 1
+        self._totals_dirty = True
+        self._views[slot] = _PositionView(self, slot, trade_id, symbol, position_type,
+                                          entry_price * quantity, entry_time_ns, entry_time)
+    
+    def _apply_prices(self, slots: np.ndarray, prices: np.ndarray):
+        """P&L and trailing-stop update for the given slots."""
+        if NUMBA:
+            # Fused compiled loop straight over the slot arrays
+            moved = np.empty(slots.shape[0], dtype=np.bool_)
+            if trailing_stop(slots, prices, self._entry, self._sqty, self._dir,
+                             self._sl, self._tgt, self._pnl, moved):
+                self._totals_dirty = True
+            self._price[slots] = prices
+        else:
+            moved = self._apply_prices_numpy(slots, prices)
+        
+        if self.logger and moved.any():
+            for slot in slots[moved]:
+                symbol = self._slot_symbol[slot]
+                self.logger.info(f"TSL: Moved SL to Breakeven for {symbol} @ {self._entry[slot]}")
+    
+    def _apply_prices_numpy(self, slots: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Vectorized fallback for _apply_prices; returns the break-even mask."""
+        direction = self._dir[slots]
+        entry = self._entry[slots]
+        sl = self._sl[slots]
+        target = self._tgt[slots]
+        
+        self._price[slots] = prices
+        # Unrealized P&L: +1 LONG / -1 SHORT
+        pnl = (prices - entry) * self._sqty[slots]
+        if not self._totals_dirty and not np.array_equal(pnl, self._pnl[slots]):
+            self._totals_dirty = True
+        self._pnl[slots] = pnl
+        
+        # --- TRAILING STOP LOSS LOGIC ---
+        # Branchless: "better" SL is higher for LONG, lower for SHORT, so in
+        # direction-signed space every rule is just a max. Rules that don't
+        # fire propose -inf (signed); a NaN SL (none set) stays NaN.
+        no_move = -np.inf
+        
+        # 1. Break-Even: once price reaches Target 1, propose the entry price
+        reached = direction * (prices - target) >= 0
+        breakeven = np.where(reached, direction * entry, no_move)
+        
+        # 2. Dynamic Trailing: once 2% in profit, propose price -/+ 1.5%
+        pct_gain = direction * (prices - entry) / entry * 100
+        trail_sl = np.round(prices * (1.0 - 0.015 * direction), 2)
+        trailing = np.where(pct_gain > 2.0, direction * trail_sl, no_move)
+        
+        signed_sl = direction * sl
+        self._sl[slots] = direction * np.maximum(signed_sl, np.maximum(breakeven, trailing))
+        return breakeven > signed_sl
+    
     def update_position_price(self, symbol: str, current_price: float):
         """Update current price, P&L, and manage Trailing Stop Loss.
         
@@ -142,55 +394,12 @@ class PortfolioState:
             symbol: Stock symbol
             current_price: Current market price
         """
-        if symbol not in self.positions:
+        slot = self._sym_idx.get(symbol)
+        if slot is None:
             return
         
-        position = self.positions[symbol]
-        position['current_price'] = current_price
-        
-        # Calculate unrealized P&L
-        if position['position_type'] == PositionType.LONG:
-            pnl = (current_price - position['entry_price']) * position['quantity']
-        else:  # SHORT
-            pnl = (position['entry_price'] - current_price) * position['quantity']
-        
-        position['unrealized_pnl'] = pnl
-        
-        # --- TRAILING STOP LOSS LOGIC ---
-        sl = position.get('stop_loss')
-        target1 = position.get('target') # Assuming target is Target 1
-        
-        if sl:
-            if position['position_type'] == PositionType.LONG:
-                # 1. Break-Even: If price hits Target 1, move SL to Entry Price
-                if target1 and current_price >= target1 and sl < position['entry_price']:
-                    position['stop_loss'] = position['entry_price']
-                    if self.logger:
-                        self.logger.info(f"TSL: Moved SL to Breakeven for {symbol} @ {position['entry_price']}")
-                
-                # 2. Dynamic Trailing: If price moves up 1%, move SL up by 0.5% (to lock profit)
-                # Keep SL at a fixed distance if price moves significantly in favor
-                # Logic: If current price > entry + 2%, Trail SL to (Current Price - 1.5%)
-                pct_gain = (current_price - position['entry_price']) / position['entry_price'] * 100
-                if pct_gain > 2.0:
-                    new_sl = current_price * 0.985 # 1.5% below current price
-                    if new_sl > sl:
-                        position['stop_loss'] = round(new_sl, 2)
-                        # Optional: Log TSL update (reduce verbosity in real-time)
-                        
-            else: # SHORT
-                # 1. Break-Even
-                if target1 and current_price <= target1 and sl > position['entry_price']:
-                    position['stop_loss'] = position['entry_price']
-                    if self.logger:
-                        self.logger.info(f"TSL: Moved SL to Breakeven for {symbol} @ {position['entry_price']}")
-                
-                # 2. Dynamic Trailing
-                pct_gain = (position['entry_price'] - current_price) / position['entry_price'] * 100
-                if pct_gain > 2.0:
-                    new_sl = current_price * 1.015 # 1.5% above current price
-                    if new_sl < sl:
-                        position['stop_loss'] = round(new_sl, 2)
+        self._apply_prices(np.array([slot], dtype=np.intp),
+                           np.array([current_price], dtype=np.float64))
     
     def close_position(self, symbol: str, exit_price: float, 
                       reason: str = "Manual") -> Optional[Dict[str, Any]]:
@@ -204,94 +413,157 @@ class PortfolioState:
         Returns:
             Dictionary with trade results or None
         """
-        if symbol not in self.positions:
+        if symbol not in self._sym_idx:
             if self.logger:
                 self.logger.warning(f"No position found for {symbol}")
             return None
         
-        position = self.positions[symbol]
+        slot = self._sym_idx.pop(symbol)
+        position = self._views[slot]
         
-        # Update DB
-        if 'trade_id' in position:
-            try:
-                self.db.update_trade_exit(
-                    trade_id=position['trade_id'],
-                    exit_price=exit_price,
-                    status=TradeStatus.CLOSED
-                )
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"DB Error closing position: {e}")
+        # Update DB (fire-and-forget; the writer commits exits in batches)
+        if position.trade_id is not None:
+            future = self.db.update_trade_exit_async(
+                trade_id=position.trade_id,
+                exit_price=exit_price,
+                status=TradeStatus.CLOSED
+            )
+            future.add_done_callback(partial(self._log_db_error, "closing position"))
         
         # Calculate final P&L
-        if position['position_type'] == PositionType.LONG:
-            pnl = (exit_price - position['entry_price']) * position['quantity']
-        else:  # SHORT
-            pnl = (position['entry_price'] - exit_price) * position['quantity']
+        pnl = float((exit_price - self._entry[slot]) * self._sqty[slot])
         
-        pnl_percent = (pnl / position['investment']) * 100
+        pnl_percent = (pnl / position.investment) * 100
         
         # Update capital
-        proceeds = position['investment'] + pnl
+        proceeds = position.investment + pnl
         self.available_capital += proceeds
-        self.invested_capital -= position['investment']
+        self.invested_capital -= position.investment
         self.realized_pnl += pnl
         
         # Log trade
         trade_result = {
             'symbol': symbol,
-            'position_type': position['position_type'],
-            'quantity': position['quantity'],
-            'entry_price': position['entry_price'],
+            'position_type': position.position_type,
+            'quantity': position.quantity,
+            'entry_price': position.entry_price,
             'exit_price': exit_price,
             'pnl': pnl,
             'pnl_percent': pnl_percent,
-            'holding_period': datetime.now() - position['entry_time'],
+            'holding_period': _elapsed(position.entry_time_ns),
             'reason': reason
         }
         
-        # Remove position
-        del self.positions[symbol]
+        # Remove position and recycle its slot
+        self._slot_symbol[slot] = None
+        self._views[slot] = None
+        self._sl[slot] = self._tgt[slot] = np.nan
+        self._qty[slot] = 0
+        self._sqty[slot] = 0.0
+        self._pnl[slot] = 0.0
+        self._free.append(slot)
+        self._n_open -= 1
+        self._universe_version += 1
+        self._totals_dirty = True
         
         if self.logger:
             self.logger.log_trade(
-                symbol, "CLOSE", position['quantity'], exit_price,
+                symbol, "CLOSE", trade_result['quantity'], exit_price,
                 f"P&L: ₹{pnl:,.2f} ({pnl_percent:+.2f}%) - {reason}"
             )
         
         return trade_result
     
+    def _cancel_orphan_trade(self, future, entry_price: float):
+        """Done-callback: mark a trade row whose add_position timed out as CANCELLED."""
+        if future.exception() is not None:
+            return  # never committed, nothing to undo
+        self.db.update_trade_exit_async(
+            future.result(), entry_price, TradeStatus.CANCELLED
+        ).add_done_callback(partial(self._log_db_error, "cancelling orphaned trade"))
+    
+    def _log_db_error(self, operation: str, future):
+        """Done-callback for background DB writes, bound to an operation name."""
+        error = future.exception()
+        if error is not None and self.logger:
+            self.logger.error(f"DB Error {operation}: {error}")
+    
     def update_all_positions(self, price_data: Dict[str, float]):
         """Update all positions with current prices.
         
         Args:
             price_data: Dictionary mapping symbol -> current price
         """
-        for symbol in list(self.positions.keys()):
-            if symbol in price_data:
-                self.update_position_price(symbol, price_data[symbol])
+        live = [(slot, price_data[symbol]) for symbol, slot in self._sym_idx.items()
+                if symbol in price_data]
+        if not live:
+            return
+        
+        slots = np.fromiter((slot for slot, _ in live), dtype=np.intp, count=len(live))
+        prices = np.fromiter((price for _, price in live), dtype=np.float64, count=len(live))
+        self._apply_prices(slots, prices)
+    
+    def update_all_positions_vec(self, prices: np.ndarray,
+                                 symbol_to_idx: Optional[Dict[str, int]] = None):
+        """Update all positions from a price vector instead of a dict.
+        
+        The feed -> slot mapping is cached until a position opens/closes or a
+        different symbol_to_idx object is passed, so a steady tick is one
+        gather plus the TSL update. Mutating symbol_to_idx in place is not
+        detected - pass a new dict when the feed universe changes.
+        
+        Args:
+            prices: Prices indexed by the feed's own symbol order
+            symbol_to_idx: Feed symbol -> row in `prices`; None means `prices`
+                is already indexed by portfolio slot
+        """
+        cached = self._feed_perm
+        if (cached is None or cached[0] is not symbol_to_idx
+                or cached[1] != self._universe_version):
+            if symbol_to_idx is None:
+                slots = np.fromiter(self._sym_idx.values(), dtype=np.intp, count=self._n_open)
+                rows = slots
+            else:
+                live = [(slot, symbol_to_idx[symbol]) for symbol, slot in self._sym_idx.items()
+                        if symbol in symbol_to_idx]
+                slots = np.array([slot for slot, _ in live], dtype=np.intp)
+                rows = np.array([row for _, row in live], dtype=np.intp)
+            cached = self._feed_perm = (symbol_to_idx, self._universe_version, slots, rows)
+        
+        slots, rows = cached[2], cached[3]
+        if slots.shape[0]:
+            self._apply_prices(slots, np.asarray(prices, dtype=np.float64)[rows])
     
     def calculate_totals(self):
         """Calculate total P&L and portfolio value."""
-        # Calculate total unrealized P&L
-        self.unrealized_pnl = sum(
-            pos['unrealized_pnl'] for pos in self.positions.values()
-        )
+        if not self._totals_dirty:
+            return
+        
+        # Calculate total unrealized P&L: one dot product over the slots
+        # (closed/free slots have quantity 0 and drop out)
+        n = self._n
+        self.unrealized_pnl = float(np.vdot(self._sqty[:n], self._price[:n] - self._entry[:n]))
         
         # Total portfolio value
         self.total_capital = self.available_capital + self.invested_capital + self.unrealized_pnl
         
-        # Update drawdown
-        if self.total_capital > self.peak_capital:
-            self.peak_capital = self.total_capital
+        self._totals_dirty = False
+        
+        # Update drawdown (at or above the peak there is none - common case)
+        if self.total_capital >= self.peak_capital:
+            if self.total_capital != self.peak_capital:
+                self.peak_capital = self.total_capital
+                self._peak_inv = 1.0 / self.total_capital if self.total_capital > 0 else 0.0
+            self.current_drawdown = 0.0
+            return
         
-        if self.peak_capital > 0:
-            self.current_drawdown = ((self.peak_capital - self.total_capital) / 
-                                    self.peak_capital * 100)
-            self.max_drawdown = max(self.max_drawdown, self.current_drawdown)
+        if self._peak_inv:
+            self.current_drawdown = (self.peak_capital - self.total_capital) * self._peak_inv * 100.0
+            if self.current_drawdown > self.max_drawdown:
+                self.max_drawdown = self.current_drawdown
     
-    def get_portfolio_summary(self) -> Dict[str, Any]:
-        """Get current portfolio summary.
+    def get_portfolio_totals(self) -> Dict[str, Any]:
+        """Get top-line portfolio numbers (no per-position data).
         
         Returns:
             Dictionary with portfolio metrics
@@ -312,10 +584,24 @@ class PortfolioState:
             'total_return_pct': total_return_pct,
             'current_drawdown': self.current_drawdown,
             'max_drawdown': self.max_drawdown,
-            'open_positions': len(self.positions),
-            'positions': list(self.positions.values())
+            'open_positions': self._n_open
         }
     
+    def get_portfolio_summary(self, include_positions: bool = False) -> Dict[str, Any]:
+        """Get current portfolio summary.
+        
+        Args:
+            include_positions: Also return the open position views under
+                'positions' (skipped by default to avoid the copy per poll)
+        
+        Returns:
+            Dictionary with portfolio metrics
+        """
+        summary = self.get_portfolio_totals()
+        if include_positions:
+            summary['positions'] = list(self.positions.values())
+        return summary
+    
     def save_snapshot(self):
         """Save current portfolio state to database."""
         self.calculate_totals()
@@ -328,5 +614,5 @@ class PortfolioState:
             realized_pnl=self.realized_pnl,
             total_pnl=self.realized_pnl + self.unrealized_pnl,
             drawdown=self.current_drawdown,
-            open_positions=len(self.positions)
+            open_positions=self._n_open
         )
@@ -4,16 +4,32 @@ Run with: streamlit run web_app.py
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import plotly
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import yfinance as yf
 from datetime import datetime
+import hashlib
 import json
 import os
-from dataclasses import asdict
+from dataclasses import asdict, fields
 
 from core.scanner import AsyncScanner, ScanResult
+from data.http_session import get_yf_session
+from indicators import _kernels as kernels
+
+# Parquet (pyarrow) is optional; the scan cache falls back to JSON
+try:
+    import pyarrow  # noqa: F401
+    PARQUET = True
+except ImportError:
+    PARQUET = False
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -140,33 +156,131 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- STATE MANAGEMENT ---
-CACHE_FILE = "scan_cache.json"
+CACHE_FILE = "scan_cache.parquet" if PARQUET else "scan_cache.json"
+SCAN_COLUMNS = [f.name for f in fields(ScanResult)]
+SIGNAL_ORDER = ["STRONG BUY", "BUY", "STRONG SELL", "SELL", "NEUTRAL"]
+ALL_SIGNALS = frozenset(SIGNAL_ORDER)
 
 def save_cache(results):
-    """Save results to local JSON file."""
+    """Save results to the local cache file (one columnar Parquet write)."""
     try:
-        data = [asdict(r) for r in results]
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(data, f)
+        if PARQUET:
+            df = pd.DataFrame([vars(r) for r in results], columns=SCAN_COLUMNS)
+            df.to_parquet(CACHE_FILE, compression="zstd", index=False)
+        else:
+            data = [asdict(r) for r in results]
+            with open(CACHE_FILE, 'w') as f:
+                json.dump(data, f)
     except Exception:
         pass
 
+class _CacheWriter:
+    """Single background thread that persists scan results.
+    
+    Callers return immediately; while a write is running, newer results
+    replace the queued ones, so an auto-refresh burst costs one write for
+    the latest snapshot rather than one per refresh.
+    """
+    
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan-cache")
+        self._lock = threading.Lock()
+        self._pending = None
+    
+    def submit(self, results):
+        with self._lock:
+            queued = self._pending is not None
+            self._pending = results
+        if not queued:
+            self._pool.submit(self._drain)
+    
+    def _drain(self):
+        with self._lock:
+            results, self._pending = self._pending, None
+        save_cache(results)
+
+@st.cache_resource
+def get_cache_writer() -> _CacheWriter:
+    # cache_resource: the script re-executes on every rerun, this must not
+    return _CacheWriter()
+
 def load_cache():
-    """Load results from local JSON file."""
+    """Load results from the local cache file."""
     if os.path.exists(CACHE_FILE):
         try:
-            with open(CACHE_FILE, 'r') as f:
-                data = json.load(f)
-                return [ScanResult(**d) for d in data]
+            if PARQUET:
+                records = pd.read_parquet(CACHE_FILE).to_dict(orient="records")
+            else:
+                with open(CACHE_FILE, 'r') as f:
+                    records = json.load(f)
+            return [ScanResult(**d) for d in records]
         except Exception:
             return []
     return []
 
-if 'scanner' not in st.session_state:
-    st.session_state.scanner = AsyncScanner()
+def set_results(results):
+    """Store scan results plus their DataFrame (built once per update, not per rerun)."""
+    st.session_state.results = results
+    df = pd.DataFrame([vars(r) for r in results], columns=SCAN_COLUMNS)
+    # Fix dtypes once here: cached/JSON rows can come back as ints or
+    # objects, and float32 halves the Arrow payload sent to the browser
+    df = df.astype({'ltp': 'float32', 'change_pct': 'float32', 'confidence': 'float32',
+                    'stop_loss': 'float32', 'target1': 'float32', 'target2': 'float32',
+                    'signal': 'category'})
+    st.session_state.results_df = df
+
+@st.cache_resource
+def get_scanner() -> AsyncScanner:
+    """One scanner (and NSE connection pool) shared by every session."""
+    return AsyncScanner()
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide loop the shared scanner lives on.
+    
+    The scanner's aiohttp session is bound to this loop, so it runs forever
+    on its own thread and sessions submit coroutines to it.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="scanner-loop", daemon=True).start()
+    return loop
+
+@st.cache_resource
+def get_scan_lock() -> threading.Lock:
+    """Held while a full-market scan is running in any session."""
+    return threading.Lock()
+
+def run_async(coro, on_wait=None):
+    """Run a coroutine on the shared loop and block this script run until done.
+    
+    on_wait is called from the script thread while waiting (Streamlit
+    elements can only be updated from there).
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    while True:
+        try:
+            return future.result(timeout=0.1)
+        except FutureTimeout:
+            if on_wait:
+                on_wait()
+
+@st.cache_resource
+def warm_kernels() -> threading.Thread:
+    """Compile the numba kernels once per process, in the background.
+    
+    cache=True only saves compiles across restarts; a fresh process (or a
+    changed numba/NumPy) still compiles on first call, which would stall
+    the first chart render by a second or more.
+    """
+    thread = threading.Thread(target=kernels.warmup, name="numba-warmup", daemon=True)
+    if kernels.NUMBA:
+        thread.start()
+    return thread
+
+warm_kernels()
 
 if 'results' not in st.session_state:
-    st.session_state.results = load_cache()
+    set_results(load_cache())
 
 if 'watchlist' not in st.session_state:
     st.session_state.watchlist = ["RELIANCE.NS", "TCS.NS", "NIFTY_50.NS", "INFY.NS", "HDFCBANK.NS"]
@@ -174,49 +288,470 @@ if 'watchlist' not in st.session_state:
 if 'selected_symbol' not in st.session_state:
     st.session_state.selected_symbol = "RELIANCE.NS"
 
+if 'last_prices' not in st.session_state:
+    st.session_state.last_prices = {}  # symbol -> last chart close, for the trade panel
+
 # --- HELPER FUNCTIONS ---
 
+# How long chart history stays fresh, per interval (seconds)
+HISTORY_TTL = {"1m": 30, "5m": 30, "15m": 60, "1h": 300, "1d": 3600, "1wk": 86400, "1mo": 86400}
+HISTORY_TIMEOUT = 15  # seconds a cache-miss fetch may hold up the script run
+CHART_PERIODS = {"1m": "1d", "5m": "5d", "15m": "5d", "1h": "1mo", "1d": "1y"}  # interval -> period
+PREFETCH_TOP_N = 50
+# Daily bars survive restarts here; older bars never change, so only the
+# last few days are refetched once the file is stale
+HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nsa", "history")
+DISK_INTERVALS = {"1d"}
+DISK_REFRESH_PERIOD = "5d"
+
+@st.cache_resource
+def get_history_pool() -> ThreadPoolExecutor:
+    """Shared by all sessions; yfinance is sync, so misses run here with a bound."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="yf-history")
+
+@st.cache_resource(max_entries=512)
+def get_ticker(symbol: str) -> yf.Ticker:
+    """One Ticker per symbol for the process, not one per chart fetch."""
+    return yf.Ticker(symbol, session=get_yf_session())
+
+def _history_path(symbol: str, interval: str) -> str:
+    key = hashlib.md5(f"{symbol}|{interval}".encode()).hexdigest()
+    return os.path.join(HISTORY_DIR, key + (".parquet" if PARQUET else ".pkl"))
+
+def _read_history(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path) if PARQUET else pd.read_pickle(path)
+
+def _write_history(path: str, hist: pd.DataFrame):
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    # Unique temp file + rename: the chart and prefetch pools may race on a symbol
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    if PARQUET:
+        hist.to_parquet(tmp, compression="zstd")
+    else:
+        hist.to_pickle(tmp)
+    os.replace(tmp, path)
+
+def _download_history(symbol: str, period: str, interval: str) -> pd.DataFrame:
+    """yfinance history, backed by the disk cache for DISK_INTERVALS.
+    
+    A file younger than the interval TTL is returned as is. An older one
+    only needs its tail: the last DISK_REFRESH_PERIOD is fetched and
+    replaces the overlapping rows (today's bar included); when that tail
+    doesn't reach back to the stored data, the full period is refetched
+    instead. If Yahoo fails,
+    the stale file is still better than no chart.
+    """
+    ticker = get_ticker(symbol)
+    if interval not in DISK_INTERVALS:
+        return ticker.history(period=period, interval=interval)
+    
+    path = _history_path(symbol, interval)
+    stored = None
+    try:
+        stored = _read_history(path)
+        if time.time() - os.path.getmtime(path) < HISTORY_TTL.get(interval, 60) and not stored.empty:
+            return stored
+    except Exception:
+        stored = None
+    
+    try:
+        if stored is None or stored.empty:
+            hist = ticker.history(period=period, interval=interval)
+        else:
+            recent = ticker.history(period=DISK_REFRESH_PERIOD, interval=interval)
+            if recent.empty:
+                hist = stored
+            elif stored.index[-1] < recent.index[0]:
+                # Offline longer than the refresh window: splicing would
+                # leave a silent hole, so refetch the whole period
+                hist = ticker.history(period=period, interval=interval)
+            else:
+                hist = pd.concat([stored[stored.index < recent.index[0]], recent])
+                # Keep the same one-year-ish window a full fetch would return
+                hist = hist[hist.index > hist.index[-1] - pd.Timedelta(days=366)]
+    except Exception:
+        if stored is not None and not stored.empty:
+            return stored
+        raise
+    
+    if not hist.empty:
+        try:
+            _write_history(path, hist)
+        except Exception:
+            pass
+    return hist
+
+@st.cache_data(ttl=86400, max_entries=256, show_spinner=False)
+def _fetch_history(symbol: str, period: str, interval: str, time_bucket: int) -> pd.DataFrame:
+    """Cached yfinance history; time_bucket only rolls the key over."""
+    future = get_history_pool().submit(_download_history, symbol, period, interval)
+    # A hung Yahoo request fails the chart instead of pinning the rerun;
+    # exceptions aren't cached, so the next rerun retries
+    return future.result(timeout=HISTORY_TIMEOUT)
+
+def get_history(symbol: str, period: str, interval: str) -> pd.DataFrame:
+    """History for the chart, refetched at most once per interval TTL.
+    
+    st.cache_data has one TTL per function, so the per-interval TTL is a
+    time bucket in the cache key (process-wide, shared across sessions).
+    """
+    ttl = HISTORY_TTL.get(interval, 60)
+    return _fetch_history(symbol, period, interval, int(time.time() // ttl))
+
+@st.cache_resource
+def get_prefetch_pool() -> ThreadPoolExecutor:
+    # Separate from the history pool: prefetch jobs wait on that pool
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="yf-prefetch")
+
+def prefetch_history(results, interval: str = "1d"):
+    """Warm the chart cache for the biggest movers in the background.
+    
+    Fire-and-forget: the scan returns immediately and a later chart pick
+    for one of these symbols is a cache hit. Failures are simply misses.
+    """
+    movers = sorted(results, key=lambda r: abs(r.change_pct), reverse=True)[:PREFETCH_TOP_N]
+    pool = get_prefetch_pool()
+    for r in movers:
+        pool.submit(get_history, r.symbol, CHART_PERIODS[interval], interval)
+
+WATCHLIST_QUOTE_TTL = 30
+
+# Chart signal code -> (banner text, color)
+SIGNAL_STYLES = {
+    3: ("STRONG BUY (Dip)", "#1f883d"),
+    2: ("BUY (Momentum)", "#1f883d"),
+    -3: ("STRONG SELL (Top)", "#d73a49"),
+    -2: ("SELL (Momentum)", "#d73a49"),
+    0: ("N/A", "#656d76"),
+}
+
+@st.cache_data(ttl=WATCHLIST_QUOTE_TTL, max_entries=32, show_spinner=False)
+def watchlist_quotes(symbols: tuple) -> dict:
+    """Last price and % change for symbols the scan didn't cover.
+    
+    One batched yf.download for the lot instead of a request per symbol.
+    
+    Returns:
+        symbol -> (price, change_pct), only for symbols Yahoo returned
+    """
+    def download():
+        return yf.download(list(symbols), period="5d", interval="1d", threads=True,
+                           progress=False, session=get_yf_session())
+    
+    close = get_history_pool().submit(download).result(timeout=HISTORY_TIMEOUT)['Close']
+    if isinstance(close, pd.Series):  # single ticker on older yfinance
+        close = close.to_frame(symbols[0])
+    
+    quotes = {}
+    for sym in symbols:
+        if sym not in close:
+            continue
+        col = close[sym].dropna().to_numpy()
+        if col.shape[0]:
+            change = (col[-1] / col[-2] - 1) * 100 if col.shape[0] > 1 and col[-2] else 0.0
+            quotes[sym] = (float(col[-1]), float(change))
+    return quotes
+
+def _history_key(hist: pd.DataFrame):
+    # Length + last bar identify a (symbol, interval) history: a new bar
+    # grows it, a live update changes the last close. O(1) instead of
+    # Streamlit hashing every cell on each rerun.
+    if hist.empty:
+        return (0,)
+    return (len(hist), hist.index[-1], float(hist['Close'].iloc[-1]))
+
+@st.cache_data(max_entries=64, show_spinner=False, hash_funcs={pd.DataFrame: _history_key})
+def compute_indicators(hist: pd.DataFrame, symbol: str, interval: str) -> pd.DataFrame:
+    """Chart indicator columns, cached per (symbol, interval) and last bar."""
+    hist = hist.copy()
+    # ffill: the kernel recursions assume no gaps (yfinance rarely has them)
+    close = hist['Close'].ffill().to_numpy(dtype=np.float64)
+    ema50, ema200, rsi, sma20, std20 = (np.empty_like(close) for _ in range(5))
+    
+    # EMA 50/200 + Wilder RSI(14) in one compiled pass, then Bollinger (20, 2)
+    # (without numba, SciPy's lfilter runs the recursions instead of Python)
+    series = kernels.chart_series_iir if not kernels.NUMBA and kernels.lfilter is not None else kernels.chart_series
+    series(close, 50, 200, 14, 20, ema50, ema200, rsi, sma20, std20)
+    
+    hist['EMA50'] = ema50
+    hist['EMA200'] = ema200
+    hist['RSI'] = rsi
+    hist['SMA20'] = sma20
+    hist['STD20'] = std20
+    hist['BB_Upper'] = sma20 + std20 * 2
+    hist['BB_Lower'] = sma20 - std20 * 2
+    
+    # Signal code for every bar (SIGNAL_STYLES keys); the banner only
+    # reads the last one, but the series is there for batch use
+    prev = np.concatenate((close[:1], close[:-1]))
+    above, below = close > ema50, close < ema50
+    hist['Signal'] = np.select(
+        [above & (rsi < 35), above & (close > prev * 1.005),
+         below & (rsi > 65), below & (close < prev * 0.995)],
+        [3, 2, -3, -2], 0).astype(np.int8)
+    return hist
+
+@st.cache_data(max_entries=64, show_spinner=False, hash_funcs={pd.DataFrame: _history_key})
+def chart_signal(hist: pd.DataFrame, symbol: str, interval: str) -> dict:
+    """Signal box for the chart, cached per (symbol, interval) and last bar.
+    
+    Args:
+        hist: History with the compute_indicators columns (incl. Signal)
+        
+    Returns:
+        Dict of text, color, last_close, rsi and levels ((sl, t1, t2), or
+        None when there is no BUY/SELL call)
+    """
+    code = int(hist['Signal'].to_numpy()[-1])
+    signal_text, signal_color = SIGNAL_STYLES[code]
+    last_close = float(hist['Close'].to_numpy()[-1])
+    rsi_val = float(hist['RSI'].to_numpy()[-1])
+    
+    levels = None
+    if code:
+        volatility = float(hist['High'].to_numpy()[-5:].max() - hist['Low'].to_numpy()[-5:].min())
+        if volatility == 0: volatility = last_close * 0.01
+        
+        # Direction: targets above entry for a buy, below for a sell
+        d = 1.0 if code > 0 else -1.0
+        levels = (last_close - d * volatility * 0.5,
+                  last_close + d * volatility,
+                  last_close + d * volatility * 2)
+    
+    return {'text': signal_text, 'color': signal_color, 'last_close': last_close,
+            'rsi': rsi_val, 'levels': levels}
+
 def run_scan():
     """Run full async market scan."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # Process-wide guard: a double click, a second session or a rerun that
+    # abandoned a scan mid-way must not start another one on top of it
+    scan_lock = get_scan_lock()
+    if not scan_lock.acquire(blocking=False):
+        st.warning("Scan already running")
+        return
+    
+    scanner, concurrency = get_scanner(), st.session_state.concurrency
     
+    async def guarded_scan():
+        # Released by the loop when the scan really ends, even if this
+        # script run was stopped while waiting on it
+        try:
+            return await scanner.scan_market(on_progress, concurrency=concurrency)
+        finally:
+            scan_lock.release()
+    
+    st.session_state.is_scanning = True
     progress_bar = st.progress(0)
     status_text = st.empty()
+    progress = [0, 1]  # written on the loop thread, drawn on this one
     
     def on_progress(completed, total):
-        pct = min(completed / total, 1.0)
-        progress_bar.progress(pct)
+        progress[:] = completed, total
+    
+    def draw_progress():
+        completed, total = progress
+        progress_bar.progress(min(completed / total, 1.0))
         status_text.text(f"Scanning... {completed}/{total}")
         
     try:
-        results = loop.run_until_complete(st.session_state.scanner.scan_market(on_progress))
-        st.session_state.results = results
-        save_cache(results)
+        results = run_async(guarded_scan(), on_wait=draw_progress)
+        set_results(results)
+        get_cache_writer().submit(results)
+        if st.session_state.get('prefetch_charts'):
+            prefetch_history(results)
         st.success(f"Scan Complete! Found {len(results)} opportunities.")
     except Exception as e:
         st.error(f"Scan Failed: {e}")
     finally:
-        loop.close()
+        st.session_state.is_scanning = False
         progress_bar.empty()
         status_text.empty()
 
 def fast_refresh_quotes():
     """Optimized batch refresh for existing results."""
     if not st.session_state.results: return
-    
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    if get_scan_lock().locked(): return  # a full scan is refreshing everything anyway
     
     symbols = [r.symbol for r in st.session_state.results]
     
-    try:
-        updated = loop.run_until_complete(st.session_state.scanner.refresh_batch(symbols))
-        updated.sort(key=lambda x: (x.signal != "NEUTRAL", abs(x.change_pct)), reverse=True)
-        st.session_state.results = updated
-        save_cache(updated)
-    finally:
-        loop.close()
+    updated = run_async(get_scanner().refresh_batch(symbols, concurrency=st.session_state.concurrency))
+    updated.sort(key=lambda x: (x.signal != "NEUTRAL", abs(x.change_pct)), reverse=True)
+    set_results(updated)
+    get_cache_writer().submit(updated)
+
+QUOTE_REFRESH_SECS = 5
+
+@st.fragment(run_every=QUOTE_REFRESH_SECS)
+def auto_refresh_quotes():
+    """Refresh quotes on a client-side timer instead of sleeping the script.
+    
+    The fragment also runs inline on every full rerun, so it only refreshes
+    (and reruns the app to redraw the tables) once the interval has passed.
+    """
+    last = st.session_state.get('last_quote_refresh', 0.0)
+    if time.time() - last < QUOTE_REFRESH_SECS:
+        return
+    fast_refresh_quotes()
+    st.session_state.last_quote_refresh = time.time()
+    st.rerun()
+
+MAX_CHART_POINTS = 800
+
+def downsample_ohlc(hist: pd.DataFrame, max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    """Merge bars into at most max_points buckets for plotting.
+    
+    Candles are re-aggregated (first open, max high, min low, last close),
+    so wicks and extremes survive - point-picking schemes like LTTB would
+    drop them. Other columns (indicators) take each bucket's last value;
+    they must already be computed on the full series.
+    """
+    n = len(hist)
+    if n <= max_points:
+        return hist
+    
+    starts = np.linspace(0, n, max_points, endpoint=False).astype(np.intp)
+    ends = np.append(starts[1:], n) - 1
+    
+    out = hist.iloc[ends].copy()
+    out.index = hist.index[starts]
+    out['Open'] = hist['Open'].to_numpy()[starts]
+    out['High'] = np.maximum.reduceat(hist['High'].to_numpy(), starts)
+    out['Low'] = np.minimum.reduceat(hist['Low'].to_numpy(), starts)
+    return out
+
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+# Plotly >= 6 ships numeric arrays as typed binary, where float32 halves the
+# bytes; older versions write JSON text, where float32 would print as long
+# float64 reprs, so there the values are only rounded to paise
+_PLOTLY_BINARY = int(plotly.__version__.split('.')[0]) >= 6
+
+def compact_for_plot(plot_df: pd.DataFrame, intraday: bool):
+    """Shrink the chart payload: 2-decimal prices and short date strings.
+    
+    Returns:
+        (x values, compacted frame)
+    """
+    plot_df = plot_df.round(2)
+    if _PLOTLY_BINARY:
+        plot_df = plot_df.astype(np.float32)
+    # Naive minute/day strings instead of full tz-aware ISO timestamps
+    x = plot_df.index.strftime('%Y-%m-%d %H:%M' if intraday else '%Y-%m-%d')
+    return x, plot_df
+
+@st.cache_resource(max_entries=32, hash_funcs={pd.DataFrame: _history_key})
+def chart_figures(hist: pd.DataFrame, symbol: str, interval: str,
+                  show_ema: bool, show_bb: bool, show_rsi: bool):
+    """Chart figure (price, plus an RSI row), built once per history and overlay choice.
+    
+    cache_resource hands back the same figure object without copying;
+    st.plotly_chart only serializes it, so a rerun that changes nothing
+    skips trace construction and validation entirely. The RSI row shares
+    the x axis, so zooming one pans the other, and it all ships as one
+    payload.
+    """
+    sig = chart_signal(hist, symbol, interval)
+    
+    # Long intraday histories are bucketed down before they go to the
+    # browser (indicators were computed on every bar). Only the columns
+    # of visible traces get bucketed and compacted.
+    plot_cols = list(OHLC_COLUMNS)
+    if show_ema:
+        plot_cols += ['EMA50', 'EMA200']
+    if show_bb:
+        plot_cols += ['BB_Upper', 'BB_Lower']
+    if show_rsi:
+        plot_cols.append('RSI')
+    plot_df = downsample_ohlc(hist[plot_cols])
+    x, plot_df = compact_for_plot(plot_df, intraday=interval != "1d")
+    # Plain arrays, converted once; Plotly would otherwise
+    # validate and copy each Series per trace
+    x = x.to_numpy()
+    cols = {col: plot_df[col].to_numpy() for col in plot_cols}
+    
+    # Collect every trace and add them in one call (one
+    # validation pass instead of one per add_trace)
+    
+    # 1. Candlestick
+    traces = [go.Candlestick(x=x,
+                             open=cols['Open'], high=cols['High'],
+                             low=cols['Low'], close=cols['Close'],
+                             name='Price')]
+    
+    # 2. Overlays
+    if show_ema:
+        traces.append(go.Scatter(x=x, y=cols['EMA50'], line=dict(color='#cf222e', width=1), name='EMA 50'))
+        traces.append(go.Scatter(x=x, y=cols['EMA200'], line=dict(color='#24292f', width=1), name='EMA 200'))
+        
+    if show_bb:
+        traces.append(go.Scatter(x=x, y=cols['BB_Upper'], line=dict(color='rgba(9, 105, 218, 0.4)'), showlegend=False))
+        traces.append(go.Scatter(x=x, y=cols['BB_Lower'], line=dict(color='rgba(9, 105, 218, 0.4)'), fill='tonexty', fillcolor='rgba(9, 105, 218, 0.1)', name='BB'))
+    
+    if show_rsi:
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                            row_heights=[0.8, 0.2], vertical_spacing=0.02)
+        fig.add_traces(traces, rows=1, cols=1)
+        fig.add_trace(go.Scatter(x=x, y=cols['RSI'], line=dict(color='#8250df'), name='RSI',
+                                 showlegend=False), row=2, col=1)
+        fig.add_hline(y=70, line_dash="dot", line_color="#d73a49", row=2, col=1)
+        fig.add_hline(y=30, line_dash="dot", line_color="#1f883d", row=2, col=1)
+        fig.update_yaxes(range=[0, 100], row=2, col=1)
+        price_row = dict(row=1, col=1)
+    else:
+        fig = go.Figure()
+        fig.add_traces(traces)
+        price_row = {}
+    
+    # 3. SIGNAL VISUALIZATION
+    if sig['levels'] is not None:
+        signal_text, line_col = sig['text'], sig['color']
+        last_close, rsi_val = sig['last_close'], sig['rsi']
+        sl, t1, t2 = sig['levels']
+        
+        # Big Text Annotation
+        fig.add_annotation(
+            xref="paper", yref="paper",
+            x=0.02, y=0.98,
+            text=f"<b>{signal_text}</b><br><span style='font-size:12px;color:#24292f'>LTP: {last_close:.2f} | RSI: {rsi_val:.1f}</span>",
+            showarrow=False,
+            font=dict(size=24, color=line_col),
+            align="left",
+            bgcolor="rgba(255,255,255,0.8)",
+            bordercolor=line_col,
+            borderwidth=1,
+            borderpad=10
+        )
+            
+        # Dotted Levels
+        fig.add_hline(y=t1, line_dash="dash", line_color=line_col, annotation_text=f"T1: {t1:.2f}", annotation_position="top right", annotation_font_color=line_col, **price_row)
+        fig.add_hline(y=t2, line_dash="dash", line_color=line_col, annotation_text=f"T2: {t2:.2f}", annotation_position="top right", annotation_font_color=line_col, **price_row)
+        fig.add_hline(y=sl, line_dash="dash", line_color="#d73a49", annotation_text=f"SL: {sl:.2f}", annotation_position="bottom right", annotation_font_color="#d73a49", **price_row)
+
+    fig.update_layout(
+        height=700 if show_rsi else 550, 
+        template="plotly_white", # Light theme
+        # Same symbol/timeframe keeps the user's zoom and pan across reruns
+        uirevision=f"{symbol}-{interval}",
+        xaxis_rangeslider_visible=False,
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation="h", y=1.02, x=0.8, bgcolor='rgba(255,255,255,0.7)'),
+        font=dict(color="#24292f")
+    )
+
+    return fig
+
+@st.cache_resource
+def demo_portfolio() -> pd.DataFrame:
+    """Static demo holdings; built once per process (the script itself
+    re-executes on every rerun, so a module-level frame would not be)."""
+    return pd.DataFrame({
+        "Symbol": ["INFY.NS", "TCS.NS"],
+        "Qty": [10, 5],
+        "Avg Price": [1400.0, 3200.0],
+        "LTP": [1420.0, 3180.0],
+        "P&L": [200.0, -100.0]
+    })
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -224,7 +759,12 @@ with st.sidebar:
     st.markdown("---")
     
     st.markdown("### 📡 Scanner Control")
-    if st.button("START FULL MARKET SCAN", type="primary"):
+    st.slider("Concurrency", 4, 64, AsyncScanner.DEFAULT_CONCURRENCY, key="concurrency",
+              help="Max NSE requests in flight; too high triggers rate limiting")
+    st.toggle("Prefetch charts", value=False, key="prefetch_charts",
+              help=f"After a scan, fetch daily charts for the top {PREFETCH_TOP_N} movers in the background")
+    if st.button("START FULL MARKET SCAN", type="primary",
+                 disabled=st.session_state.get('is_scanning', False)):
         with st.spinner("Scanning 2000+ stocks..."):
             run_scan()
             
@@ -232,10 +772,7 @@ with st.sidebar:
     auto_refresh = st.toggle("Auto-Refresh (Fast)", value=False)
     
     if auto_refresh:
-        fast_refresh_quotes()
-        import time
-        time.sleep(5) 
-        st.rerun()
+        auto_refresh_quotes()
 
     st.markdown("---")
     st.caption("System Ready | v2.4 Light Pro")
@@ -248,14 +785,15 @@ tab_scanner, tab_dashboard, tab_portfolio = st.tabs(["🚀 Live Scanner", "📊
 # ==========================================
 with tab_scanner:
     if st.session_state.results:
-        df = pd.DataFrame([vars(r) for r in st.session_state.results])
+        df = st.session_state.results_df
         
         m1, m2, m3, m4 = st.columns(4)
+        change = df['change_pct'].to_numpy()
         m1.metric("Active Stocks", len(df))
-        m2.metric("Buy Signals", len(df[df['signal'].str.contains("BUY")]), delta_color="normal")
-        m3.metric("Sell Signals", len(df[df['signal'].str.contains("SELL")]), delta_color="inverse")
-        adv = len(df[df['change_pct'] > 0])
-        dec = len(df[df['change_pct'] < 0])
+        m2.metric("Buy Signals", int(df['signal'].isin(["STRONG BUY", "BUY"]).sum()), delta_color="normal")
+        m3.metric("Sell Signals", int(df['signal'].isin(["STRONG SELL", "SELL"]).sum()), delta_color="inverse")
+        adv = int((change > 0).sum())
+        dec = int((change < 0).sum())
         m4.metric("A/D Ratio", f"{adv}/{dec}")
         
         st.divider()
@@ -263,10 +801,11 @@ with tab_scanner:
         col_f1, col_f2 = st.columns([3, 1])
         with col_f1:
             filter_sigs = st.multiselect("Filter Signals", 
-                                       ["STRONG BUY", "BUY", "STRONG SELL", "SELL", "NEUTRAL"],
+                                       SIGNAL_ORDER,
                                        default=["STRONG BUY", "BUY", "STRONG SELL", "SELL"])
         
-        if filter_sigs:
+        # Everything selected keeps every row; skip the mask and copy
+        if filter_sigs and frozenset(filter_sigs) != ALL_SIGNALS:
             df = df[df['signal'].isin(filter_sigs)]
             
         st.dataframe(
@@ -304,18 +843,32 @@ with tab_dashboard:
                 st.session_state.watchlist.append(s)
                 st.rerun()
         
-        wl_data = []
-        if st.session_state.watchlist:
-            scan_map = {r.symbol: r for r in st.session_state.results} if st.session_state.results else {}
-            
-            for sym in st.session_state.watchlist:
-                if sym in scan_map:
-                    r = scan_map[sym]
-                    wl_data.append({"Symbol": sym, "Price": r.ltp, "Change": r.change_pct})
-                else:
-                    wl_data.append({"Symbol": sym, "Price": 0.0, "Change": 0.0})
-                    
-        wl_df = pd.DataFrame(wl_data)
+        # Parallel columns, one DataFrame constructor (no per-row dicts)
+        syms = list(st.session_state.watchlist)
+        prices = [0.0] * len(syms)
+        changes = [0.0] * len(syms)
+        scan_map = {r.symbol: r for r in st.session_state.results} if st.session_state.results else {}
+        missing = []
+        for i, sym in enumerate(syms):
+            r = scan_map.get(sym)
+            if r is not None:
+                prices[i], changes[i] = r.ltp, r.change_pct
+            else:
+                missing.append(sym)
+        
+        # Symbols outside the scan: one batched download, not N requests
+        if missing:
+            try:
+                quotes = watchlist_quotes(tuple(missing))
+            except Exception:
+                quotes = {}
+            for i, sym in enumerate(syms):
+                if sym in quotes:
+                    prices[i], changes[i] = quotes[sym]
+        
+        wl_df = pd.DataFrame({"Symbol": syms,
+                              "Price": np.array(prices, dtype=np.float64),
+                              "Change": np.array(changes, dtype=np.float64)})
         
         event = st.dataframe(
             wl_df,
@@ -329,12 +882,12 @@ with tab_dashboard:
             }
         )
         
-        try:
-            if len(event.selection.rows) > 0:
-                selected_row_idx = event.selection.rows[0]
-                st.session_state.selected_symbol = wl_df.iloc[selected_row_idx]['Symbol']
-        except:
-            pass
+        # Older Streamlit returns no selection object; an empty/None one is
+        # simply "nothing picked", not an error to swallow
+        sel = getattr(event, 'selection', None)
+        rows = getattr(sel, 'rows', None) if sel else None
+        if rows and rows[0] < len(wl_df):
+            st.session_state.selected_symbol = wl_df.iat[rows[0], 0]
             
     # --- MIDDLE: CHART (Light Theme) ---
     with col_chart:
@@ -352,133 +905,19 @@ with tab_dashboard:
         
         if st.session_state.selected_symbol:
             try:
-                tf_map = {"1m": "1d", "5m": "5d", "15m": "5d", "1h": "1mo", "1d": "1y"}
-                period = tf_map.get(tf, "1y")
+                period = CHART_PERIODS.get(tf, "1y")
                 
-                df_chart = yf.Ticker(st.session_state.selected_symbol).history(period=period, interval=tf)
+                df_chart = get_history(st.session_state.selected_symbol, period, tf)
                 
                 if not df_chart.empty:
                     # --- INDICATOR CALCULATIONS ---
-                    df_chart['EMA50'] = df_chart['Close'].ewm(span=50).mean()
-                    df_chart['EMA200'] = df_chart['Close'].ewm(span=200).mean()
-                    
-                    # RSI
-                    delta = df_chart['Close'].diff()
-                    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-                    rs = gain / loss
-                    df_chart['RSI'] = 100 - (100 / (1 + rs))
-                    
-                    last_close = df_chart['Close'].iloc[-1]
-                    prev_close = df_chart['Close'].iloc[-2]
-                    ema50_val = df_chart['EMA50'].iloc[-1]
-                    rsi_val = df_chart['RSI'].iloc[-1]
+                    df_chart = compute_indicators(df_chart, st.session_state.selected_symbol, tf)
+                    st.session_state.last_prices[st.session_state.selected_symbol] = float(
+                        df_chart['Close'].to_numpy()[-1])
                     
-                    # --- SIGNAL LOGIC ---
-                    signal_text = "N/A"
-                    signal_color = "#656d76" # Neutral Grey
-                    
-                    # Logic
-                    if last_close > ema50_val:
-                        if rsi_val < 35: 
-                            signal_text = "STRONG BUY (Dip)"
-                            signal_color = "#1f883d" # Green
-                        elif last_close > prev_close * 1.005: 
-                            signal_text = "BUY (Momentum)"
-                            signal_color = "#1f883d"
-                    elif last_close < ema50_val:
-                        if rsi_val > 65:
-                            signal_text = "STRONG SELL (Top)"
-                            signal_color = "#d73a49" # Red
-                        elif last_close < prev_close * 0.995:
-                            signal_text = "SELL (Momentum)"
-                            signal_color = "#d73a49"
-
-                    # --- PLOTTING ---
-                    fig = go.Figure()
-                    
-                    # 1. Candlestick
-                    fig.add_trace(go.Candlestick(x=df_chart.index,
-                                    open=df_chart['Open'], high=df_chart['High'],
-                                    low=df_chart['Low'], close=df_chart['Close'],
-                                    name='Price'))
-                    
-                    # 2. Overlays
-                    if show_ema:
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['EMA50'], line=dict(color='#cf222e', width=1), name='EMA 50'))
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['EMA200'], line=dict(color='#24292f', width=1), name='EMA 200'))
-                        
-                    if show_bb:
-                        sma20 = df_chart['Close'].rolling(20).mean()
-                        std20 = df_chart['Close'].rolling(20).std()
-                        upper = sma20 + (std20 * 2)
-                        lower = sma20 - (std20 * 2)
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=upper, line=dict(color='rgba(9, 105, 218, 0.4)'), showlegend=False))
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=lower, line=dict(color='rgba(9, 105, 218, 0.4)'), fill='tonexty', fillcolor='rgba(9, 105, 218, 0.1)', name='BB'))
-                    
-                    # 3. SIGNAL VISUALIZATION
-                    if "BUY" in signal_text or "SELL" in signal_text:
-                        volatility = df_chart['High'].iloc[-5:].max() - df_chart['Low'].iloc[-5:].min()
-                        if volatility == 0: volatility = last_close * 0.01
-                        
-                        if "BUY" in signal_text:
-                            sl = last_close - (volatility * 0.5)
-                            t1 = last_close + volatility
-                            t2 = last_close + (volatility * 2)
-                            line_col = "#1f883d"
-                        else:
-                            sl = last_close + (volatility * 0.5)
-                            t1 = last_close - volatility
-                            t2 = last_close - (volatility * 2)
-                            line_col = "#d73a49"
-                        
-                        # Big Text Annotation
-                        fig.add_annotation(
-                            xref="paper", yref="paper",
-                            x=0.02, y=0.98,
-                            text=f"<b>{signal_text}</b><br><span style='font-size:12px;color:#24292f'>LTP: {last_close:.2f} | RSI: {rsi_val:.1f}</span>",
-                            showarrow=False,
-                            font=dict(size=24, color=line_col),
-                            align="left",
-                            bgcolor="rgba(255,255,255,0.8)",
-                            bordercolor=line_col,
-                            borderwidth=1,
-                            borderpad=10
-                        )
-                            
-                        # Dotted Levels
-                        fig.add_hline(y=t1, line_dash="dash", line_color=line_col, annotation_text=f"T1: {t1:.2f}", annotation_position="top right", annotation_font_color=line_col)
-                        fig.add_hline(y=t2, line_dash="dash", line_color=line_col, annotation_text=f"T2: {t2:.2f}", annotation_position="top right", annotation_font_color=line_col)
-                        fig.add_hline(y=sl, line_dash="dash", line_color="#d73a49", annotation_text=f"SL: {sl:.2f}", annotation_position="bottom right", annotation_font_color="#d73a49")
-
-                    fig.update_layout(
-                        height=550, 
-                        template="plotly_white", # Light theme
-                        xaxis_rangeslider_visible=False,
-                        margin=dict(l=0, r=0, t=0, b=0),
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        legend=dict(orientation="h", y=1.02, x=0.8, bgcolor='rgba(255,255,255,0.7)'),
-                        font=dict(color="#24292f")
-                    )
+                    fig = chart_figures(df_chart, st.session_state.selected_symbol, tf,
+                                        show_ema, show_bb, show_rsi)
                     st.plotly_chart(fig, use_container_width=True)
-                    
-                    # RSI Subplot
-                    if show_rsi:
-                        fig_rsi = go.Figure()
-                        fig_rsi.add_trace(go.Scatter(x=df_chart.index, y=df_chart['RSI'], line=dict(color='#8250df')))
-                        fig_rsi.add_hline(y=70, line_dash="dot", line_color="#d73a49")
-                        fig_rsi.add_hline(y=30, line_dash="dot", line_color="#1f883d")
-                        fig_rsi.update_layout(
-                            height=150, 
-                            template="plotly_white", 
-                            margin=dict(l=0,r=0,t=0,b=0), 
-                            yaxis=dict(range=[0,100]),
-                            paper_bgcolor='rgba(0,0,0,0)',
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            font=dict(color="#24292f")
-                        )
-                        st.plotly_chart(fig_rsi, use_container_width=True)
                         
             except Exception as e:
                 st.error(f"Chart Error: {e}")
@@ -487,10 +926,9 @@ with tab_dashboard:
     with col_action:
         st.markdown("### ⚡ Quick Trade")
         
-        current_price = 0.0
-        if not df_chart.empty:
-            current_price = df_chart['Close'].iloc[-1]
-            
+        # Set by the chart block; a failed fetch leaves the last good price
+        current_price = st.session_state.last_prices.get(st.session_state.selected_symbol, 0.0)
+        
         st.metric("LTP", f"₹{current_price:.2f}")
         
         st.markdown("**Order Details**")
@@ -515,11 +953,4 @@ with tab_dashboard:
 # ==========================================
 with tab_portfolio:
     st.markdown("### My Portfolio")
-    data = {
-        "Symbol": ["INFY.NS", "TCS.NS"],
-        "Qty": [10, 5],
-        "Avg Price": [1400.0, 3200.0],
-        "LTP": [1420.0, 3180.0],
-        "P&L": [200.0, -100.0]
-    }
-    st.dataframe(pd.DataFrame(data), use_container_width=True)
+    st.dataframe(demo_portfolio(), use_container_width=True)